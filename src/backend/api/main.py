@@ -1,15 +1,17 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import json
 import os
-import requests
-from datetime import datetime, timedelta
-import subprocess
 import sys
 import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
 
 # Import from our organized structure
 import sys
@@ -17,9 +19,33 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import *
-from services.youtube_music_api import YouTubeMusicAPIClient
-from ytmusicapi import YTMusic
-from contextlib import asynccontextmanager
+from services.spotify_client import (
+    fetch_playlist, fetch_playlist_details, iter_playlist_track_pages, iter_saved_track_pages, snapshot_cache_key
+)
+from services.track_resolver import CachedSearch, resolve_candidates, resolve_track_cached, sanitize_playlist_name, track_key
+from services.playlist_sync import sync_playlist, tracks_state
+from services.import_engine import BulkPlaylistSink, BulkProgress, ImportEngine, ImportSink, JSONSink, SSESink, list_source
+from services.import_results import ResultLog
+from services.match_index import RELOAD_INTERVAL as MATCH_INDEX_RELOAD_INTERVAL, open_index
+from services.fuzzy_index import FuzzyIndex, open_fuzzy_index
+from services.album_resolver import AlbumCatalog
+from services.cache import Cache, create_backend
+from services.session_store import SessionStore
+from services.credentials import CredentialCache
+from services.scheduler import FairScheduler, priority_weight
+from services.youtube_music_client import add_playlist_items_checked
+from utils.sse import sse_event
+from utils.compression import CompressionMiddleware
+from utils.pipeline import iterate_in_thread
+from utils.ndjson import ndjson_track_pages
+from utils.tracing import Trace
+from contextlib import aclosing, asynccontextmanager
+
+# Heavy dependencies (ytmusicapi, requests, SQLAlchemy) are imported on first use so a
+# replica starts serving /health without paying for them; see benchmarks/bench_startup.py
+if TYPE_CHECKING:
+    from models.models import ImportResultStore, MatchStore, PlaylistSyncStore
+    from ytmusicapi import YTMusic
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,14 +58,62 @@ async def lifespan(app: FastAPI):
     else:
         print(f"Spotify API configured with Client ID: {SPOTIFY_CLIENT_ID[:8]}...")
     
-    print("YouTube Music API ready for authentication")
+    # YTMusic requests made from worker threads run on this loop over one pooled connection
+    global ytmusic_warmup, app_loop
+    app_loop = asyncio.get_running_loop()
+    
+    # The client is built in the background so /health answers while it is verified
+    if YTMUSIC_WARMUP:
+        ytmusic_warmup = asyncio.create_task(warm_up_ytmusic())
+    else:
+        print("YouTube Music API ready for authentication")
     
     yield
     
     # Shutdown
+    if ytmusic_warmup is not None:
+        ytmusic_warmup.cancel()
+    if ytmusic_transport is not None:
+        await ytmusic_transport.aclose()
     print("Shutting down Playlist Importer API...")
 
-app = FastAPI(title="Playlist Importer API", version="1.0.0", lifespan=lifespan)
+def refresh_worker_auth():
+    """Rebuild this worker's YTMusic client when another worker published new credentials
+
+    Runs before every request; the shared store is consulted at most every AUTH_SYNC_INTERVAL.
+    """
+    global ytmusic_api, ytmusic_auth_version, ytmusic_auth_checked_at
+    now = time.monotonic()
+    if now - ytmusic_auth_checked_at < AUTH_SYNC_INTERVAL:
+        return
+    ytmusic_auth_checked_at = now
+    
+    # An edited credential file replaces the client once the new one is verified
+    if ytmusic_credentials.refresh():
+        use_file_credentials()
+    
+    # Versions and file mtimes are both nanosecond timestamps: the newest credentials win
+    auth = get_session_store().current_auth()
+    if not auth or (ytmusic_auth_version is not None and auth['version'] <= ytmusic_auth_version):
+        return
+    try:
+        from ytmusicapi import YTMusic
+        ytmusic_api = YTMusic(auth['headers'], requests_session=ytmusic_session())
+        ytmusic_auth_version = auth['version']
+        print(f"🔧 Loaded YouTube Music credentials published by another worker ({auth['method']})")
+    except Exception as e:
+        print(f"⚠️ Could not load shared YouTube Music credentials: {e}")
+
+app = FastAPI(
+    title="Playlist Importer API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(refresh_worker_auth)]
+)
+
+# Compress large JSON responses (track lists, import results); SSE streams pass through untouched
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
 
 # Configure CORS
 app.add_middleware(
@@ -63,6 +137,8 @@ class Track(BaseModel):
 class ImportRequest(BaseModel):
     playlistName: str
     tracks: List[Track]
+    spotifyPlaylistId: Optional[str] = None  # remembered for incremental sync
+    priority: str = "normal"  # low, normal or high share of upstream capacity
     
     class Config:
         # Allow extra fields to be ignored
@@ -73,6 +149,8 @@ class ImportResponse(BaseModel):
     addedTracks: List[str] = []
     failedTracks: List[str] = []
     message: str
+    jobId: Optional[str] = None  # per-track outcomes are paged from /jobs/{jobId}/results
+    stats: Optional[Dict] = None
 
 class SpotifyCallbackRequest(BaseModel):
     code: str
@@ -86,8 +164,282 @@ class SpotifyTracksRequest(BaseModel):
 class YouTubeMusicSetupRequest(BaseModel):
     credentials: str
 
-# Global YouTube Music clients
+class BulkImportRequest(BaseModel):
+    access_token: str
+    playlistIds: List[str]
+    priority: str = "normal"
+
+class SpotifyPlaylistImportRequest(BaseModel):
+    access_token: str
+    playlistId: str
+    playlistName: Optional[str] = None
+    priority: str = "normal"
+
+class LikedSongsImportRequest(BaseModel):
+    access_token: str
+    playlistName: str = "Liked Songs"
+    priority: str = "normal"
+
+class PreviewCommitRequest(BaseModel):
+    playlistName: Optional[str] = None
+    selections: Dict[int, Optional[str]] = {}  # preview track index -> chosen videoId (None skips it)
+
+class SyncPlaylistRequest(BaseModel):
+    access_token: str
+    playlistId: str
+    playlistName: Optional[str] = None
+    removeMissing: bool = False
+    force: bool = False
+
+# This worker's YouTube Music client, built from the credentials in the shared session store
 ytmusic_api = None
+ytmusic_auth_version = None
+ytmusic_auth_checked_at = 0.0
+ytmusic_warmup: Optional[asyncio.Task] = None
+app_loop: Optional[asyncio.AbstractEventLoop] = None
+# Pooled HTTP/2 transport shared by every YTMusic client this worker builds
+ytmusic_transport = None
+
+def ytmusic_session():
+    """requests session for a new YTMusic client, sending through the worker's pooled transport"""
+    global ytmusic_transport
+    from services.youtube_music_transport import AsyncYouTubeMusicTransport, TransportSession
+    if ytmusic_transport is None:
+        ytmusic_transport = AsyncYouTubeMusicTransport(http2=YTMUSIC_HTTP2, max_connections=YTMUSIC_MAX_CONNECTIONS)
+    if app_loop is not None:
+        ytmusic_transport.bind(app_loop)
+    return TransportSession(ytmusic_transport)
+
+def ytmusic_oauth_file() -> str:
+    """Credential file in the backend directory, or the working directory when only that one exists"""
+    path = os.path.join(os.path.dirname(__file__), '..', YOUTUBE_MUSIC_OAUTH_FILE)
+    if not os.path.exists(path) and os.path.exists(YOUTUBE_MUSIC_OAUTH_FILE):
+        return YOUTUBE_MUSIC_OAUTH_FILE
+    return path
+
+def build_ytmusic(headers: str) -> "YTMusic":
+    from ytmusicapi import YTMusic
+    return YTMusic(headers, requests_session=ytmusic_session())
+
+def verify_ytmusic(client: "YTMusic"):
+    """Test search; raises when the credentials are rejected"""
+    client.search("test", filter="songs", limit=1)
+
+# Client built from ytmusic_oauth.json, reused until the file changes
+ytmusic_credentials = CredentialCache(ytmusic_oauth_file(), build_ytmusic, validate=verify_ytmusic)
+
+def use_file_credentials():
+    """Make the client built from the credential file this worker's active client"""
+    global ytmusic_api, ytmusic_auth_version
+    ytmusic_api = ytmusic_credentials.client
+    ytmusic_auth_version = ytmusic_credentials.mtime_ns
+
+async def warm_up_ytmusic():
+    """Load and verify the credential file at startup so the first import does not pay for it"""
+    if not os.path.exists(ytmusic_credentials.path):
+        print("YouTube Music API ready for authentication")
+        return
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(ytmusic_credentials.load)
+    except Exception as e:
+        print(f"⚠️ YouTube Music credentials could not be verified at startup: {e}")
+        return
+    # Credentials published by another worker or the headers flow may be newer
+    if ytmusic_api is None:
+        use_file_credentials()
+    print(f"✅ YouTube Music client ready ({time.perf_counter() - started:.2f}s)")
+
+# Spotify -> YouTube Music playlist mappings for incremental sync
+sync_store = None
+
+def get_sync_store() -> "PlaylistSyncStore":
+    """Open the playlist sync store on first use"""
+    global sync_store
+    if sync_store is None:
+        from models.models import PlaylistSyncStore
+        sync_store = PlaylistSyncStore(DATABASE_URL)
+    return sync_store
+
+# Persistent track key -> videoId matches (also warmed offline by preresolve.py)
+match_store = None
+
+def get_match_store() -> "MatchStore":
+    """Open the match store on first use"""
+    global match_store
+    if match_store is None:
+        from models.models import MatchStore
+        match_store = MatchStore(DATABASE_URL)
+    return match_store
+
+# Trigram index of resolved tracks, answering close spellings without a search
+fuzzy_index = None
+fuzzy_index_lock = threading.Lock()
+
+def get_fuzzy_index() -> Optional[FuzzyIndex]:
+    """Open the fuzzy index on first use, seeding it from the match store (None when disabled)"""
+    global fuzzy_index
+    if not FUZZY_INDEX_PATH:
+        return None
+    with fuzzy_index_lock:
+        if fuzzy_index is None:
+            try:
+                seed = get_match_store().iter_named_matches()
+            except Exception as e:
+                print(f"⚠️ Match store unavailable for seeding the fuzzy index: {e}")
+                seed = None
+            fuzzy_index = open_fuzzy_index(FUZZY_INDEX_PATH, FUZZY_MATCH_THRESHOLD, seed)
+    return fuzzy_index
+
+# Per-track import outcomes, paged by /jobs/{job_id}/results
+result_store = None
+
+def get_result_store() -> "ImportResultStore":
+    """Open the import result store on first use"""
+    global result_store
+    if result_store is None:
+        from models.models import ImportResultStore
+        result_store = ImportResultStore(DATABASE_URL)
+    return result_store
+
+def create_result_log(job_id: str) -> ResultLog:
+    """Result log that spills a job's per-track outcomes to the result store"""
+    return ResultLog(get_result_store(), job_id, batch_size=IMPORT_RESULT_BATCH_SIZE)
+
+def prune_import_results():
+    """Drop results of jobs older than JOB_STATE_TTL, like the job records themselves"""
+    try:
+        get_result_store().prune(datetime.utcnow() - timedelta(seconds=JOB_STATE_TTL))
+    except Exception as e:
+        print(f"⚠️ Could not prune import results: {e}")
+
+# Read-only mmap index shared through the page cache by every worker process
+match_index = None
+match_index_checked_at = None
+
+def get_match_index():
+    """The published match index (None until one has been built)
+
+    Until an index exists its path is re-checked every RELOAD_INTERVAL, so an index that
+    build_match_index.py publishes later is picked up; an open index reloads new files itself.
+    """
+    global match_index, match_index_checked_at
+    if match_index is None:
+        now = time.monotonic()
+        if match_index_checked_at is None or now - match_index_checked_at >= MATCH_INDEX_RELOAD_INTERVAL:
+            match_index_checked_at = now
+            match_index = open_index(MATCH_INDEX_PATH)
+    return match_index
+
+# Cache backend shared with other replicas when CACHE_URL points at SQLite or Redis
+cache_backend = None
+
+def get_cache(namespace: str, ttl: float) -> Cache:
+    """Namespaced view of the shared cache backend, connected on first use"""
+    global cache_backend
+    if cache_backend is None:
+        cache_backend = create_backend(CACHE_URL)
+    return Cache(cache_backend, namespace, ttl, CACHE_SERIALIZER)
+
+def search_client() -> CachedSearch:
+    """The YouTube Music client with searches served from the shared cache"""
+    return CachedSearch(ytmusic_api, get_cache("search", CACHE_SEARCH_TTL))
+
+# Album track listings, fetched once per album and shared by every import
+album_catalog = None
+
+def get_album_catalog() -> AlbumCatalog:
+    global album_catalog
+    if album_catalog is None:
+        album_catalog = AlbumCatalog(get_cache("album", CACHE_ALBUM_TTL))
+    return album_catalog
+
+def snapshot_cache() -> Cache:
+    """Spotify playlist tracks keyed by playlist id and snapshot_id"""
+    return get_cache("spotify_snapshot", CACHE_SNAPSHOT_TTL)
+
+def probe_ytmusic_auth():
+    """Verify the YouTube Music credentials with a test search, trusting a recent success"""
+    probes = get_cache("auth_probe", CACHE_AUTH_PROBE_TTL)
+    probe_key = f"ytmusic:{ytmusic_auth_version}"
+    if probes.get(probe_key):
+        return
+    ytmusic_api.search("test", filter="songs", limit=1)
+    probes.set(probe_key, True)
+
+# Shared YouTube Music session and import job state
+session_store = None
+
+def get_session_store() -> SessionStore:
+    """Open the shared session store on first use"""
+    global session_store
+    if session_store is None:
+        session_store = SessionStore(get_cache("session", None), get_cache("jobs", JOB_STATE_TTL))
+    return session_store
+
+def publish_ytmusic_auth(method: str, headers: str):
+    """Share credentials this worker just verified so every other worker switches to them"""
+    global ytmusic_auth_version
+    ytmusic_auth_version = get_session_store().publish_auth(method, headers)
+    get_cache("auth_probe", CACHE_AUTH_PROBE_TTL).set(f"ytmusic:{ytmusic_auth_version}", True)
+
+def resolve_import_track(track: dict):
+    """Resolver used by the import paths: mmap index, shared cache, match store and fuzzy index,
+    then the album listing for tracks of album-heavy imports, then search"""
+    index = get_match_index()
+    if index is not None:
+        video_id = index.lookup(track_key(track['name'], track['artist']))
+        if video_id:
+            return video_id
+    return resolve_track_cached(
+        search_client(),
+        get_match_store(),
+        track['name'],
+        track['artist'],
+        match_cache=get_cache("match", CACHE_MATCH_TTL),
+        fuzzy_index=get_fuzzy_index(),
+        # About two calls per album instead of a search per track
+        album_catalog=get_album_catalog() if 0 < ALBUM_MIN_GROUP <= track.get('album_tracks', 0) else None,
+        album=track.get('album')
+    )
+
+def known_match(track: dict) -> Optional[str]:
+    """A videoId from earlier imports (mmap index, shared cache, match store), without searching"""
+    key = track_key(track['name'], track['artist'])
+    index = get_match_index()
+    if index is not None:
+        video_id = index.lookup(key)
+        if video_id:
+            return video_id
+    video_id = get_cache("match", CACHE_MATCH_TTL).get(key)
+    if video_id:
+        return video_id
+    try:
+        match = get_match_store().get(key)
+    except Exception as e:
+        print(f"⚠️ Match store lookup failed: {e}")
+        return None
+    return match['video_id'] if match else None
+
+def save_confirmed_matches(matches: list):
+    """Store (key, name, artist, video_id) matches a user confirmed so later imports reuse them"""
+    match_cache = get_cache("match", CACHE_MATCH_TTL)
+    for key, _, _, video_id in matches:
+        match_cache.set(key, video_id)
+    try:
+        get_match_store().save_many(matches)
+    except Exception as e:
+        print(f"⚠️ Match store write failed: {e}")
+    index = get_fuzzy_index()
+    if index is not None:
+        index.add_many(matches)
+
+def remember_import(spotify_playlist_id: str, youtube_playlist_id: str, tracks: list, video_ids: dict, snapshot_id: str = None):
+    """Record an import so later syncs only process changed tracks"""
+    try:
+        get_sync_store().save(spotify_playlist_id, youtube_playlist_id, snapshot_id, tracks_state(tracks, video_ids))
+    except Exception as e:
+        print(f"⚠️ Could not record sync state for {spotify_playlist_id}: {e}")
 
 @app.get("/")
 async def root():
@@ -106,14 +458,14 @@ async def health_check():
 async def spotify_auth_redirect():
     """Redirect to Spotify OAuth"""
     from fastapi.responses import RedirectResponse
-    scope = "playlist-read-private playlist-read-collaborative"
+    scope = "playlist-read-private playlist-read-collaborative user-library-read"
     auth_url = f"https://accounts.spotify.com/authorize?client_id={SPOTIFY_CLIENT_ID}&response_type=code&redirect_uri={SPOTIFY_REDIRECT_URI}&scope={scope}"
     return RedirectResponse(url=auth_url)
 
 @app.get("/spotify/auth-url")
 async def get_spotify_auth_url():
     """Get Spotify OAuth URL"""
-    scope = "playlist-read-private playlist-read-collaborative"
+    scope = "playlist-read-private playlist-read-collaborative user-library-read"
     auth_url = f"https://accounts.spotify.com/authorize?client_id={SPOTIFY_CLIENT_ID}&response_type=code&redirect_uri={SPOTIFY_REDIRECT_URI}&scope={scope}"
     return {"auth_url": auth_url}
 
@@ -131,6 +483,7 @@ async def spotify_callback(request: SpotifyCallbackRequest):
             "client_secret": SPOTIFY_CLIENT_SECRET
         }
         
+        import requests
         response = requests.post(token_url, data=data)
         
         if response.status_code == 400:
@@ -154,6 +507,7 @@ async def get_spotify_playlists(request: SpotifyPlaylistsRequest):
     try:
         print(f"Fetching playlists with token: {request.access_token[:20]}...")
         headers = {"Authorization": f"Bearer {request.access_token}"}
+        import requests
         response = requests.get("https://api.spotify.com/v1/me/playlists", headers=headers)
         
         print(f"Spotify API response status: {response.status_code}")
@@ -192,32 +546,12 @@ async def get_spotify_playlists(request: SpotifyPlaylistsRequest):
 async def get_spotify_playlist_tracks(playlist_id: str, request: SpotifyTracksRequest):
     """Get tracks from a specific Spotify playlist with pagination support"""
     try:
-        headers = {"Authorization": f"Bearer {request.access_token}"}
-        all_tracks = []
-        url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
-        
-        # Handle pagination to get ALL tracks
-        while url:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            tracks_data = response.json()
-            
-            # Process tracks from this page
-            for item in tracks_data.get("items", []):
-                track = item["track"]
-                if track:  # Some items might be null
-                    all_tracks.append({
-                        "name": track["name"],
-                        "artist": track["artists"][0]["name"] if track["artists"] else "Unknown Artist",
-                        "album": track["album"]["name"] if track["album"] else None
-                    })
-            
-            # Get next page URL (None if this is the last page)
-            url = tracks_data.get("next")
+        playlist = fetch_playlist(request.access_token, playlist_id, snapshot_cache=snapshot_cache())
+        all_tracks = playlist["tracks"]
         
         print(f"Fetched {len(all_tracks)} tracks total for playlist {playlist_id}")
-        return {"tracks": all_tracks}
+        # Return the response directly so large track lists skip jsonable_encoder
+        return ORJSONResponse({"tracks": all_tracks})
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to fetch playlist tracks: {str(e)}")
 
@@ -264,7 +598,7 @@ async def get_youtube_auth_status():
     if ytmusic_api:
         try:
             # Test with a simple search to verify the connection
-            search_results = ytmusic_api.search("test", filter="songs", limit=1)
+            probe_ytmusic_auth()
             return {
                 "authenticated": True,
                 "method": "ytmusicapi_oauth",
@@ -396,11 +730,15 @@ async def submit_youtube_headers(request: dict):
                 json.dump(ytmusic_headers, f, indent=2)
             
             # Initialize YTMusic
-            ytmusic_api = YTMusic(headers_file)
+            headers_json = json.dumps(ytmusic_headers)
+            ytmusic_api = YTMusic(headers_json, requests_session=ytmusic_session())
             
             # Test the connection
             test_search = ytmusic_api.search("test", filter="songs", limit=1)
             
+            # Make the session available to every worker
+            publish_ytmusic_auth("headers", headers_json)
+            
             return {
                 "success": True,
                 "message": "🎵 YouTube Music authentication successful!",
@@ -425,29 +763,22 @@ async def submit_youtube_headers(request: dict):
 @app.post("/youtube-music/authenticate")
 async def authenticate_youtube_music():
     """Authenticate with YouTube Music using ytmusicapi OAuth"""
-    global ytmusic_api
-    
     try:
-        import json
-        import os
-        
         print("🔧 Loading YouTube Music OAuth credentials...")
         
-        # Load ytmusic_oauth.json
-        oauth_file = os.path.join(os.path.dirname(__file__), '..', 'ytmusic_oauth.json')
-        if not os.path.exists(oauth_file):
-            oauth_file = 'ytmusic_oauth.json'
-        
-        print(f"✅ Using ytmusicapi OAuth file: {oauth_file}")
+        # Wait for the startup warm-up rather than building a second client
+        if ytmusic_warmup is not None and not ytmusic_warmup.done():
+            await asyncio.shield(ytmusic_warmup)
         
-        # Initialize YTMusicAPI client directly
-        from ytmusicapi import YTMusic
-        ytmusic_api = YTMusic(oauth_file)
+        print(f"✅ Using ytmusicapi OAuth file: {ytmusic_credentials.path}")
         
-        # Test the connection with a simple search
+        # The cached client is reused; the file is only read (and the client verified) again after it changed
         try:
-            search_results = ytmusic_api.search("test", filter="songs", limit=1)
-            print(f"✅ YTMusicAPI authentication test successful! Found {len(search_results)} results")
+            if ytmusic_credentials.client is None or ytmusic_credentials.changed():
+                await asyncio.to_thread(ytmusic_credentials.load)
+            use_file_credentials()
+            publish_ytmusic_auth("ytmusicapi_oauth", ytmusic_credentials.content)
+            print("✅ YTMusicAPI authentication test successful!")
             
             return {
                 "success": True,
@@ -480,7 +811,7 @@ async def get_youtube_music_auth_status():
     if ytmusic_api:
         try:
             # Test with a simple search to verify the connection
-            search_results = ytmusic_api.search("test", filter="songs", limit=1)
+            probe_ytmusic_auth()
             return {
                 "authenticated": True,
                 "method": "ytmusicapi_oauth",
@@ -554,310 +885,735 @@ async def test_youtube_music_search():
     except Exception as e:
         return {"success": False, "message": f"Search test failed: {str(e)}"}
 
+async def ensure_ytmusic_authenticated() -> bool:
+    """Authenticate YouTube Music on first use (or wait for the startup warm-up to finish)"""
+    if ytmusic_warmup is not None and not ytmusic_warmup.done():
+        await asyncio.shield(ytmusic_warmup)
+    if ytmusic_api:
+        return True
+    try:
+        ytmusic_result = await authenticate_youtube_music()
+        return bool(ytmusic_result.get("success"))
+    except Exception:
+        return False
+
+# Searches and adds of every import in this worker share UPSTREAM_CONCURRENCY slots fairly
+upstream_scheduler = FairScheduler(UPSTREAM_CONCURRENCY)
+
+def user_flow(access_token: str) -> str:
+    """Scheduler flow for the user behind a Spotify token (the token itself is not kept)"""
+    return "user-" + hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+
+# Span timelines of imports running in this worker, by job id; finished ones are in the shared cache
+active_traces: Dict[str, Trace] = {}
+
+def start_trace(job_id: str) -> Optional[Trace]:
+    """Begin recording an import's timeline (None when tracing is disabled)"""
+    if IMPORT_TRACE_MAX_SPANS <= 0:
+        return None
+    trace = Trace(job_id, max_spans=IMPORT_TRACE_MAX_SPANS)
+    active_traces[job_id] = trace
+    return trace
+
+def finish_trace(trace: Optional[Trace]):
+    """Move a finished import's timeline to the shared cache so any worker can serve it"""
+    if trace is None:
+        return
+    get_cache("trace", JOB_STATE_TTL).set(trace.job_id, trace.to_dict())
+    active_traces.pop(trace.job_id, None)
+
+def create_import_engine(playlist_name: str, source, sink: ImportSink, record_matches: bool = False,
+                         flow_id: str = None, priority: str = None, job_id: str = None,
+                         resolver=None) -> ImportEngine:
+    """Build an import engine with the configured stage sizes"""
+    return ImportEngine(
+        ytmusic_api,
+        playlist_name,
+        source,
+        sink,
+        resolver=resolver or resolve_import_track,
+        resolve_concurrency=IMPORT_RESOLVE_CONCURRENCY,
+        queue_size=IMPORT_QUEUE_SIZE,
+        add_batch_size=IMPORT_ADD_BATCH_SIZE,
+        add_flush_interval=IMPORT_ADD_FLUSH_INTERVAL,
+        record_matches=record_matches,
+        scheduler=upstream_scheduler,
+        flow_id=flow_id,
+        weight=priority_weight(priority),
+        results=create_result_log(job_id) if job_id else None,
+        trace=start_trace(job_id) if job_id else None,
+        dedup_memory=IMPORT_DEDUP_MEMORY,
+        album_groups=IMPORT_ALBUM_GROUPS
+    )
+
+def create_sse_sink() -> SSESink:
+    """SSE sink using the configured coalescing intervals"""
+    return SSESink(SSE_PROGRESS_INTERVAL, SSE_PROGRESS_STEP, SSE_TRACK_BATCH_SIZE)
+
+class BodyReadingStreamingResponse(StreamingResponse):
+    """Streaming response for endpoints that are still reading the request body
+
+    StreamingResponse watches `receive` for a disconnect from the start, which would swallow
+    body chunks the endpoint has not read yet. Here watching starts once `body_read` is set;
+    a disconnect during the upload reaches the body reader as ClientDisconnect instead.
+    """
+
+    def __init__(self, *args, body_read: asyncio.Event, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.body_read = body_read
+
+    async def listen_for_disconnect(self, receive):
+        await self.body_read.wait()
+        await super().listen_for_disconnect(receive)
+
+async def read_body(request: Request, body_read: asyncio.Event):
+    """The request body's chunks; `body_read` is set once the endpoint stops reading them"""
+    try:
+        async for chunk in request.stream():
+            yield chunk
+    finally:
+        body_read.set()
+
+def event_stream(frames, response_class=StreamingResponse, **options) -> StreamingResponse:
+    """Wrap SSE frames in a streaming response the App.js reader understands"""
+    return response_class(
+        frames,
+        media_type="text/plain",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Content-Type": "text/event-stream",
+        },
+        **options
+    )
+
+# Import tasks running in this worker, by job id
+active_imports: Dict[str, asyncio.Task] = {}
+
+async def watch_cancel_requests(job_id: str, task: asyncio.Task):
+    """Cancel a local import when /jobs/{id}/cancel was handled by another worker"""
+    jobs = get_session_store()
+    while not task.done():
+        await asyncio.sleep(IMPORT_CANCEL_POLL_INTERVAL)
+        job = await asyncio.to_thread(jobs.get_job, job_id)
+        if job and job.get('cancelRequested'):
+            task.cancel()
+            return
+
+async def stream_job(job_id: str, task: asyncio.Task, sink: SSESink):
+    """Yield a running job's SSE frames until its task has finished
+
+    The task is registered for /jobs/{id}/cancel. Starlette cancels this generator when the
+    client disconnects; the task is then cancelled too, and searches already running in
+    threads stop before their next call.
+    """
+    active_imports[job_id] = task
+    watcher = asyncio.create_task(watch_cancel_requests(job_id, task))
+    try:
+        async for frame in sink.stream(task):
+            yield frame
+        if task.cancelled():
+            yield sse_event({'type': 'cancelled', 'jobId': job_id, 'message': 'Import cancelled'})
+    finally:
+        watcher.cancel()
+        active_imports.pop(job_id, None)
+        if not task.done():
+            # The response closed before the job finished: nobody is watching any more
+            print(f"⚠️ Client disconnected, cancelling import {job_id}")
+            get_session_store().update_job(job_id, cancelReason="client disconnected")
+            task.cancel()
+
+async def stream_import(playlist_name: str, source, sink: SSESink, on_complete=None, record_matches: bool = False,
+                        flow_id: str = None, priority: str = None):
+    """Run an import engine as a cancellable job and yield its SSE frames"""
+    if not await ensure_ytmusic_authenticated():
+        yield sse_event({'type': 'error', 'message': 'YouTube Music authentication failed'})
+        return
+    
+    # Job state lives in the shared store so any worker can report on it
+    jobs = get_session_store()
+    job_id = jobs.create_job("import", playlistName=playlist_name)
+    yield sse_event({'type': 'job', 'jobId': job_id})
+    await asyncio.to_thread(prune_import_results)
+    
+    # Imports without a known user are scheduled as their own flow
+    engine = create_import_engine(
+        playlist_name, source, sink,
+        record_matches=record_matches,
+        flow_id=flow_id or job_id,
+        priority=priority,
+        job_id=job_id
+    )
+    
+    async def run():
+        try:
+            summary = await engine.run()
+        except asyncio.CancelledError:
+            jobs.update_job(job_id, status="cancelled", finishedAt=time.time())
+            raise
+        finally:
+            finish_trace(engine.trace)
+        if summary:
+            jobs.update_job(
+                job_id,
+                status="complete",
+                playlistUrl=summary['playlistUrl'],
+                stats=summary['stats'],
+                finishedAt=time.time()
+            )
+            if on_complete:
+                on_complete(engine, summary)
+        else:
+            jobs.update_job(job_id, status="failed", finishedAt=time.time())
+    
+    async with aclosing(stream_job(job_id, asyncio.create_task(run()), sink)) as frames:
+        async for frame in frames:
+            yield frame
+
 @app.post("/import-playlist", response_model=ImportResponse)
 async def import_playlist_youtube_music(request: ImportRequest):
-    """Import a playlist using YouTube Music API"""
-    global ytmusic_api
+    """Import a playlist using YouTube Music API
+
+    The response carries summary statistics; per-track outcomes are paged from
+    /jobs/{jobId}/results so the response size does not grow with the playlist.
+    """
+    print(f"Received import request: {request.playlistName} ({len(request.tracks)} tracks)")
     
-    try:
-        # Debug: Print the received request
-        print(f"Received import request:")
-        print(f"  Playlist name: {request.playlistName}")
-        print(f"  Number of tracks: {len(request.tracks)}")
-        for i, track in enumerate(request.tracks):
-            print(f"  Track {i+1}: {track.name} - {track.artist}")
-        
-        # Validate that we have tracks to import
-        if not request.tracks or len(request.tracks) == 0:
-            raise HTTPException(status_code=400, detail="No tracks provided for import")
-            
-    except Exception as validation_error:
-        print(f"Request validation error: {validation_error}")
-        print(f"Request type: {type(request)}")
-        raise HTTPException(status_code=400, detail=f"Invalid request format: {str(validation_error)}")
+    # Validate that we have tracks to import
+    if not request.tracks:
+        raise HTTPException(status_code=400, detail="No tracks provided for import")
     
     # Check if YouTube Music authentication is available
-    if not ytmusic_api:
-        # Try to authenticate
-        try:
-            ytmusic_result = await authenticate_youtube_music()
-            if not ytmusic_result.get("success"):
-                raise HTTPException(
-                    status_code=401, 
-                    detail="YouTube Music authentication failed. Please run 'python setup_ytmusic_oauth.py' or refresh your YouTube Music session."
-                )
-        except:
-            raise HTTPException(
-                status_code=401, 
-                detail="YouTube Music authentication failed. Please run 'python setup_ytmusic_oauth.py' or refresh your YouTube Music session."
+    if not await ensure_ytmusic_authenticated():
+        raise HTTPException(
+            status_code=401, 
+            detail="YouTube Music authentication failed. Please run 'python setup_ytmusic_oauth.py' or refresh your YouTube Music session."
+        )
+    
+    jobs = get_session_store()
+    job_id = jobs.create_job("import", playlistName=request.playlistName)
+    await asyncio.to_thread(prune_import_results)
+    
+    sink = JSONSink()
+    engine = create_import_engine(
+        request.playlistName,
+        list_source(request.tracks),
+        sink,
+        priority=request.priority,
+        job_id=job_id
+    )
+    try:
+        summary = await engine.run()
+    finally:
+        finish_trace(engine.trace)
+    if not summary:
+        print(f"Import failed: {sink.error_message}")
+        jobs.update_job(job_id, status="failed", finishedAt=time.time())
+        raise HTTPException(status_code=500, detail=sink.error_message or "Failed to import playlist")
+    
+    jobs.update_job(
+        job_id,
+        status="complete",
+        playlistUrl=summary['playlistUrl'],
+        stats=summary['stats'],
+        finishedAt=time.time()
+    )
+    stats = summary['stats']
+    return ImportResponse(
+        playlistUrl=summary['playlistUrl'],
+        message=f"Import completed successfully! {stats['successful']} tracks added, {stats['failed']} failed.",
+        jobId=job_id,
+        stats=stats
+    )
+
+@app.post("/import-playlist-stream")
+async def import_playlist_with_progress(request: ImportRequest):
+    """Import a playlist with real-time progress updates via Server-Sent Events"""
+    if not request.tracks:
+        return event_stream(iter([sse_event({'type': 'error', 'message': 'No tracks provided for import'})]))
+    
+    def on_complete(engine: ImportEngine, summary: dict):
+        if request.spotifyPlaylistId:
+            remember_import(
+                request.spotifyPlaylistId,
+                engine.playlist_id,
+                [{'name': track.name, 'artist': track.artist} for track in request.tracks],
+                engine.matches
             )
     
+    return event_stream(stream_import(
+        request.playlistName,
+        list_source(request.tracks),
+        create_sse_sink(),
+        on_complete=on_complete,
+        record_matches=bool(request.spotifyPlaylistId),
+        priority=request.priority
+    ))
+
+@app.post("/import-preview")
+async def preview_import(request: ImportRequest):
+    """Resolve matches without creating a playlist, returning candidates with confidence scores
+
+    The resolved set is held server-side under the returned previewToken for PREVIEW_TTL
+    seconds, so /import-preview/{token}/commit only creates the playlist and adds songs.
+    """
+    if not request.tracks:
+        raise HTTPException(status_code=400, detail="No tracks provided for preview")
+    if not await ensure_ytmusic_authenticated():
+        raise HTTPException(status_code=401, detail="YouTube Music authentication failed")
+    
+    # Resolve each distinct song once
+    tracks = []
+    keys = set()
+    for track in request.tracks:
+        key = track_key(track.name, track.artist)
+        if key not in keys:
+            keys.add(key)
+            tracks.append({'name': track.name, 'artist': track.artist, 'album': track.album, 'key': key})
+    
+    token = secrets.token_urlsafe(16)
+    flow = f"preview-{token}"
+    weight = priority_weight(request.priority)
+    client = search_client()
+    results = [None] * len(tracks)
+    pending = iter(range(len(tracks)))
+    # Opening the index the first time imports SQLAlchemy and seeds it from the match store
+    fuzzy = await asyncio.to_thread(get_fuzzy_index)
+    
+    async def resolve_worker():
+        for index in pending:
+            track = tracks[index]
+            video_id = await asyncio.to_thread(known_match, track)
+            if video_id:
+                # Matched by an earlier import: no search needed
+                results[index] = {'videoId': video_id, 'confidence': 1.0, 'source': 'history', 'candidates': []}
+                continue
+            hit = await asyncio.to_thread(fuzzy.lookup, track['name'], track['artist']) if fuzzy is not None else None
+            if hit is not None:
+                # A close spelling of a track resolved before
+                results[index] = {'videoId': hit[0], 'confidence': hit[1], 'source': 'fuzzy', 'candidates': []}
+                continue
+            async with upstream_scheduler.slot(flow, weight):
+                candidates = await asyncio.to_thread(
+                    resolve_candidates, client, track['name'], track['artist'], PREVIEW_CANDIDATES
+                )
+            best = candidates[0] if candidates else None
+            results[index] = {
+                'videoId': best['videoId'] if best else None,
+                'confidence': best['confidence'] if best else 0.0,
+                'source': 'search',
+                'candidates': candidates
+            }
+    
+    await asyncio.gather(*(resolve_worker() for _ in range(IMPORT_RESOLVE_CONCURRENCY)))
+    
+    preview_tracks = [
+        {'index': index, 'name': track['name'], 'artist': track['artist'], 'album': track['album'], **result}
+        for index, (track, result) in enumerate(zip(tracks, results))
+    ]
+    
+    # Only what the commit needs is stored: the match and the candidate videoIds a selection
+    # may choose from (confirmed matches are shared with every user, so nothing else is accepted)
+    await asyncio.to_thread(get_cache("preview", PREVIEW_TTL).set, token, {
+        'playlistName': request.playlistName,
+        'spotifyPlaylistId': request.spotifyPlaylistId,
+        'tracks': [
+            {
+                'name': track['name'],
+                'artist': track['artist'],
+                'key': track['key'],
+                'videoId': result['videoId'],
+                'candidates': [candidate['videoId'] for candidate in result['candidates']]
+            }
+            for track, result in zip(tracks, results)
+        ]
+    })
+    
+    matched = sum(1 for result in results if result['videoId'])
+    return ORJSONResponse({
+        'previewToken': token,
+        'expiresIn': PREVIEW_TTL,
+        'playlistName': request.playlistName,
+        'tracks': preview_tracks,
+        'stats': {
+            'total': len(request.tracks),
+            'unique': len(tracks),
+            'matched': matched,
+            'unmatched': len(tracks) - matched,
+            'skipped': len(request.tracks) - len(tracks)
+        }
+    })
+
+@app.post("/import-preview/{token}/commit", response_model=ImportResponse)
+async def commit_preview(token: str, request: PreviewCommitRequest):
+    """Create the playlist from a preview's matches (plus any user selections) without searching"""
+    previews = get_cache("preview", PREVIEW_TTL)
+    preview = await asyncio.to_thread(previews.get, token)
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Preview not found or expired")
+    for index, video_id in request.selections.items():
+        if not 0 <= index < len(preview['tracks']):
+            raise HTTPException(status_code=400, detail=f"No track {index} in this preview")
+        track = preview['tracks'][index]
+        if video_id is not None and video_id != track['videoId'] and video_id not in track.get('candidates', []):
+            raise HTTPException(status_code=400, detail=f"Selection for track {index} is not one of its preview candidates")
+    if not await ensure_ytmusic_authenticated():
+        raise HTTPException(status_code=401, detail="YouTube Music authentication failed")
+    
+    # Claim the preview so a double-submitted commit cannot create two playlists
+    await asyncio.to_thread(previews.delete, token)
+    
+    video_ids = []
+    labels = {}
+    confirmed = []
+    failed_tracks = []
+    for index, track in enumerate(preview['tracks']):
+        video_id = request.selections.get(index, track['videoId'])
+        if not video_id:
+            failed_tracks.append(f"{track['name']} - {track['artist']}")
+            continue
+        confirmed.append((track['key'], track['name'], track['artist'], video_id))
+        if video_id not in labels:
+            video_ids.append(video_id)
+            labels[video_id] = f"{track['name']} - {track['artist']}"
+    
+    playlist_name = sanitize_playlist_name(request.playlistName or preview['playlistName'])
+    added_tracks = []
     try:
-        # Sanitize playlist name and create a fallback if needed
-        import re
-        from datetime import datetime
-        
-        # Remove emojis and special characters, keep alphanumeric, spaces, hyphens, underscores
-        sanitized_playlist_name = re.sub(r'[^\w\s\-_]', '', request.playlistName).strip()
-        
-        # If the name is empty or too short after sanitization, create a unique fallback
-        if not sanitized_playlist_name or len(sanitized_playlist_name) < 3:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            sanitized_playlist_name = f"Imported_Playlist_{timestamp}"
-            print(f"🔧 Original name not usable, using fallback: {sanitized_playlist_name}")
-        else:
-            print(f"🔧 Using sanitized name: {sanitized_playlist_name}")
+        playlist_id = await asyncio.to_thread(ytmusic_api.create_playlist, playlist_name, "", "PRIVATE")
+        if not playlist_id:
+            raise Exception("No playlist ID returned")
+        for start in range(0, len(video_ids), IMPORT_ADD_BATCH_SIZE):
+            batch = video_ids[start:start + IMPORT_ADD_BATCH_SIZE]
+            added, rejected = await asyncio.to_thread(add_playlist_items_checked, ytmusic_api, playlist_id, batch)
+            added_tracks.extend(added)
+            failed_tracks.extend(labels[video_id] for video_id in rejected)
+    except Exception as e:
+        if not added_tracks:
+            # Nothing was created that the user would have to clean up: allow a retry
+            await asyncio.to_thread(previews.set, token, preview)
+        print(f"Preview commit failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create playlist: {str(e)}")
+    
+    await asyncio.to_thread(save_confirmed_matches, confirmed)
+    if preview.get('spotifyPlaylistId'):
+        remember_import(
+            preview['spotifyPlaylistId'],
+            playlist_id,
+            preview['tracks'],
+            {key: video_id for key, _, _, video_id in confirmed}
+        )
+    
+    return ImportResponse(
+        playlistUrl=f"https://music.youtube.com/playlist?list={playlist_id}",
+        addedTracks=added_tracks,
+        failedTracks=failed_tracks,
+        message=f"Import completed successfully! {len(added_tracks)} tracks added, {len(failed_tracks)} failed."
+    )
+
+@app.post("/import-spotify-playlist-stream")
+async def import_spotify_playlist(request: SpotifyPlaylistImportRequest):
+    """Import a Spotify playlist by ID with real-time progress updates via Server-Sent Events
+
+    The backend pages through Spotify itself while earlier pages are already being resolved,
+    so the client never downloads and re-uploads the track list.
+    """
+    try:
+        details = await asyncio.to_thread(fetch_playlist_details, request.access_token, request.playlistId)
+    except Exception as e:
+        return event_stream(iter([sse_event({'type': 'error', 'message': f'Failed to fetch playlist: {str(e)}'})]))
+    
+    snapshot_id = details.get('snapshot_id')
+    cache = snapshot_cache()
+    cached_tracks = cache.get(snapshot_cache_key(request.playlistId, snapshot_id)) if snapshot_id else None
+    imported_tracks = []
+    
+    async def pages():
+        if cached_tracks is not None:
+            imported_tracks.extend(cached_tracks)
+            yield cached_tracks, len(cached_tracks)
+            return
+        async for tracks, total in iterate_in_thread(
+            iter_playlist_track_pages(request.access_token, request.playlistId),
+            prefetch=LIBRARY_PAGE_PREFETCH
+        ):
+            imported_tracks.extend(tracks)
+            yield tracks, total
+        if snapshot_id:
+            cache.set(snapshot_cache_key(request.playlistId, snapshot_id), imported_tracks)
+    
+    def on_complete(engine: ImportEngine, summary: dict):
+        remember_import(request.playlistId, engine.playlist_id, imported_tracks, engine.matches, snapshot_id)
+    
+    return event_stream(stream_import(
+        request.playlistName or details.get('name') or request.playlistId,
+        pages(),
+        create_sse_sink(),
+        on_complete=on_complete,
+        record_matches=True,
+        flow_id=user_flow(request.access_token),
+        priority=request.priority
+    ))
+
+@app.post("/import-playlist-ndjson-stream")
+async def import_playlist_ndjson(request: Request, playlistName: str, total: int = 0, priority: str = "normal"):
+    """Import tracks uploaded as NDJSON with real-time progress updates via Server-Sent Events
+
+    The body holds one {"name", "artist", "album"} object per line and may be sent chunked.
+    Lines are validated and resolved while the upload is still arriving; `total` is the
+    optional track count used for progress percentages.
+    """
+    body_read = asyncio.Event()
+    return event_stream(stream_import(
+        playlistName,
+        ndjson_track_pages(read_body(request, body_read), total=total),
+        create_sse_sink(),
+        priority=priority
+    ), response_class=BodyReadingStreamingResponse, body_read=body_read)
+
+@app.post("/import-playlists-bulk-stream")
+async def import_playlists_bulk(request: BulkImportRequest):
+    """Import many Spotify playlists in one job, searching each distinct song only once
+
+    Each playlist runs through the import engine as its own job, so its per-track outcomes
+    are paged from /jobs/{jobId}/results and its timeline from /jobs/{jobId}/trace. The bulk
+    job groups them and is cancelled as a whole.
+    """
+    playlist_ids = list(dict.fromkeys(request.playlistIds))
+    if not playlist_ids:
+        return event_stream(iter([sse_event({'type': 'error', 'message': 'No playlists provided for import'})]))
+    
+    flow = user_flow(request.access_token)
+    sink = create_sse_sink()
+    
+    async def import_playlist(bulk_job_id: str, playlist: dict, batch: BulkProgress) -> dict:
+        jobs = get_session_store()
+        job_id = jobs.create_job("import", playlistName=playlist['name'], bulkJobId=bulk_job_id)
+        engine = create_import_engine(
+            playlist['name'],
+            list_source(playlist['tracks']),
+            BulkPlaylistSink(sink.queue, playlist['id'], batch),
+            record_matches=True,
+            flow_id=flow,
+            priority=request.priority,
+            job_id=job_id,
+            resolver=batch.resolve
+        )
+        try:
+            summary = await engine.run()
+        except asyncio.CancelledError:
+            jobs.update_job(job_id, status="cancelled", finishedAt=time.time())
+            raise
+        finally:
+            finish_trace(engine.trace)
+        if not summary:
+            jobs.update_job(job_id, status="failed", finishedAt=time.time())
+            return {'spotifyId': playlist['id'], 'jobId': job_id, 'error': 'Import failed'}
         
-        # Create playlist using ytmusicapi
-        print(f"Creating playlist: {sanitized_playlist_name}")
+        jobs.update_job(job_id, status="complete", playlistUrl=summary['playlistUrl'],
+                        stats=summary['stats'], finishedAt=time.time())
+        remember_import(playlist['id'], engine.playlist_id, playlist['tracks'], engine.matches, playlist.get('snapshot_id'))
+        return {
+            'spotifyId': playlist['id'],
+            'jobId': job_id,
+            'playlistUrl': summary['playlistUrl'],
+            'stats': summary['stats']
+        }
+    
+    async def run(job_id: str):
+        def put(event: dict):
+            sink.queue.put_nowait(sse_event(event))
         
-        playlist_id = None
-        try:
-            print("� Creating playlist with ytmusicapi...")
-            playlist_id = ytmusic_api.create_playlist(sanitized_playlist_name, "", "PRIVATE")
-            if playlist_id:
-                print(f"✅ YTMusicAPI playlist created successfully with ID: {playlist_id}")
+        put({'type': 'status', 'message': f'Fetching {len(playlist_ids)} playlists from Spotify...'})
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(fetch_playlist, request.access_token, playlist_id, snapshot_cache=snapshot_cache()) for playlist_id in playlist_ids),
+            return_exceptions=True
+        )
+        
+        playlists = []
+        playlist_results = []
+        for playlist_id, playlist in zip(playlist_ids, fetched):
+            if isinstance(playlist, Exception):
+                playlist_results.append({'spotifyId': playlist_id, 'error': f'Failed to fetch playlist: {str(playlist)}'})
+                put({'type': 'playlist_error', 'spotifyId': playlist_id, 'message': str(playlist)})
             else:
-                print("⚠️ YTMusicAPI playlist creation returned no ID")
-        except Exception as ytmusic_error:
-            print(f"⚠️ YTMusicAPI playlist creation failed: {ytmusic_error}")
-            raise HTTPException(status_code=500, detail=f"Failed to create playlist: {str(ytmusic_error)}")
+                playlists.append(playlist)
         
-        if not playlist_id:
-            raise HTTPException(status_code=500, detail="Failed to create playlist")
-            raise HTTPException(status_code=500, detail="Failed to create playlist")
+        # Songs shared by several playlists are resolved for the first one and reused afterwards,
+        # so batch progress runs over the distinct songs
+        total_tracks = sum(len(playlist['tracks']) for playlist in playlists)
+        distinct_tracks = len({
+            track_key(track['name'], track['artist']) for playlist in playlists for track in playlist['tracks']
+        })
+        batch = BulkProgress(distinct_tracks, resolve_import_track, SSE_PROGRESS_INTERVAL, SSE_PROGRESS_STEP, SSE_TRACK_BATCH_SIZE)
+        put({
+            'type': 'start',
+            'total': distinct_tracks,
+            'playlists': len(playlists),
+            'totalTracks': total_tracks,
+            'playlistName': f'{len(playlists)} playlists'
+        })
         
-        print(f"Playlist created successfully with ID: {playlist_id}")
+        # One playlist at a time; each one's searches and adds overlap inside its engine
+        for playlist in playlists:
+            playlist_results.append(await import_playlist(job_id, playlist, batch))
         
-        # Process each track
-        added_tracks = []
-        failed_tracks = []
-        video_ids = []
+        # Counts come from the engines' checked add results; per-track outcomes are paged per playlist
+        stats = {'total': 0, 'successful': 0, 'failed': 0, 'skipped': 0}
+        for result in playlist_results:
+            for field, count in result.get('stats', {}).items():
+                stats[field] += count
+        stats['unique'] = len(batch.resolved)
+        created = sum(1 for result in playlist_results if 'error' not in result)
+        found = sum(1 for video_id in batch.resolved.values() if video_id)
+        put({
+            'type': 'complete',
+            'progress': 100,
+            'jobId': job_id,
+            'playlists': playlist_results,
+            'stats': stats,
+            'message': f"Bulk import completed! {created}/{len(playlist_ids)} playlists created, {found}/{len(batch.resolved)} distinct songs found."
+        })
+        return stats
+    
+    async def frames():
+        if not await ensure_ytmusic_authenticated():
+            yield sse_event({'type': 'error', 'message': 'YouTube Music authentication failed'})
+            return
         
-        for track in request.tracks:
-            try:
-                # Try different search strategies
-                search_queries = [
-                    f"{track.name} {track.artist}",
-                    track.name,
-                    f"{track.artist} {track.name}"
-                ]
-                
-                video_id = None
-                for search_query in search_queries:
-                    try:
-                        print(f"Searching for: {search_query}")
-                        search_results = ytmusic_api.search(search_query, filter="songs", limit=3)
-                        
-                        if search_results and len(search_results) > 0:
-                            # Use the first result
-                            video_id = search_results[0].get('videoId')
-                            if video_id:
-                                break
-                    except Exception as search_error:
-                        print(f"Search error for '{search_query}': {search_error}")
-                        continue
-                
-                if video_id:
-                    video_ids.append(video_id)
-                    print(f"Found video for: {track.name} - {track.artist} (video_id: {video_id})")
-                else:
-                    print(f"Failed to find: {track.name} - {track.artist}")
-                    failed_tracks.append(f"{track.name} - {track.artist}")
-                    
-            except Exception as track_error:
-                print(f"Error processing track {track.name}: {track_error}")
-                failed_tracks.append(f"{track.name} - {track.artist}")
-        
-        # Now attempt to add the found videos to the playlist
-        if video_ids:
-            try:
-                print(f"🎵 SEARCH SUCCESS: Found {len(video_ids)} real YouTube Music videos!")
-                for i, video_id in enumerate(video_ids):
-                    track_name = f"{request.tracks[i].name} - {request.tracks[i].artist}" if i < len(request.tracks) else "Unknown"
-                    print(f"   ✅ {track_name} → Video ID: {video_id}")
-                
-                # Add songs to the playlist using ytmusicapi
-                print("🔧 Adding songs to playlist with ytmusicapi...")
-                for video_id in video_ids:
-                    try:
-                        result = ytmusic_api.add_playlist_items(playlist_id, [video_id])
-                        if result:
-                            added_tracks.append(video_id)
-                            print(f"   ✅ Added video {video_id} to playlist")
-                        else:
-                            failed_tracks.append(video_id)
-                            print(f"   ❌ Failed to add video {video_id}")
-                    except Exception as add_error:
-                        print(f"   ❌ Error adding video {video_id}: {add_error}")
-                        failed_tracks.append(video_id)
-            except Exception as playlist_add_error:
-                print(f"⚠️ Error adding songs to playlist: {playlist_add_error}")
-                failed_tracks.extend([f"{track.name} - {track.artist}" for track in request.tracks])
-        
-        # Create YouTube Music playlist URL
-        playlist_url = f"https://music.youtube.com/playlist?list={playlist_id}" if playlist_id else None
-        
-        return ImportResponse(
-            playlistUrl=playlist_url,
-            addedTracks=added_tracks,
-            failedTracks=failed_tracks,
-            message=f"Import completed successfully! {len(added_tracks)} tracks added, {len(failed_tracks)} failed."
-        )
+        # Registered as a job so /jobs/{id}/cancel and a client disconnect both stop it
+        jobs = get_session_store()
+        job_id = jobs.create_job("bulk", playlistCount=len(playlist_ids))
+        yield sse_event({'type': 'job', 'jobId': job_id})
+        await asyncio.to_thread(prune_import_results)
         
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        print(f"Import failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to import playlist: {str(e)}")
-
-@app.post("/import-playlist-stream")
-async def import_playlist_with_progress(request: ImportRequest):
-    """Import a playlist with real-time progress updates via Server-Sent Events"""
-    global ytmusic_api
-    
-    async def generate_progress():
-        try:
-            # Validate request
-            if not request.tracks or len(request.tracks) == 0:
-                yield f"data: {json.dumps({'type': 'error', 'message': 'No tracks provided for import'})}\n\n"
-                return
-            
-            # Check YouTube Music authentication
-            if not ytmusic_api:
-                try:
-                    ytmusic_result = await authenticate_youtube_music()
-                    if not ytmusic_result.get("success"):
-                        yield f"data: {json.dumps({'type': 'error', 'message': 'YouTube Music authentication failed'})}\n\n"
-                        return
-                except:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'YouTube Music authentication failed'})}\n\n"
-                    return
-            
-            total_tracks = len(request.tracks)
-            yield f"data: {json.dumps({'type': 'start', 'total': total_tracks, 'playlistName': request.playlistName})}\n\n"
-            
-            # Sanitize playlist name
-            import re
-            sanitized_playlist_name = re.sub(r'[^\w\s\-_]', '', request.playlistName).strip()
-            if not sanitized_playlist_name or len(sanitized_playlist_name) < 3:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                sanitized_playlist_name = f"Imported_Playlist_{timestamp}"
-            
-            yield f"data: {json.dumps({'type': 'status', 'message': f'Creating playlist: {sanitized_playlist_name}'})}\n\n"
-            
-            # Create playlist
+        async def run_job():
             try:
-                playlist_id = ytmusic_api.create_playlist(sanitized_playlist_name, "", "PRIVATE")
-                if not playlist_id:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to create playlist'})}\n\n"
-                    return
-                    
-                yield f"data: {json.dumps({'type': 'status', 'message': f'Playlist created successfully!'})}\n\n"
+                stats = await run(job_id)
+            except asyncio.CancelledError:
+                jobs.update_job(job_id, status="cancelled", finishedAt=time.time())
+                raise
             except Exception as e:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to create playlist: {str(e)}'})}\n\n"
+                sink.error(f'Bulk import failed: {str(e)}')
+                jobs.update_job(job_id, status="failed", finishedAt=time.time())
                 return
-            
-            # Process tracks with progress updates
-            added_tracks = []
-            failed_tracks = []
-            video_ids = []
-            
-            for i, track in enumerate(request.tracks):
-                progress = int((i / total_tracks) * 100)
-                yield f"data: {json.dumps({'type': 'progress', 'progress': progress, 'current': i + 1, 'total': total_tracks, 'track': f'{track.name} - {track.artist}'})}\n\n"
-                
-                try:
-                    # Search for the track
-                    search_queries = [
-                        f"{track.name} {track.artist}",
-                        track.name,
-                        f"{track.artist} {track.name}"
-                    ]
-                    
-                    video_id = None
-                    for search_query in search_queries:
-                        try:
-                            search_results = ytmusic_api.search(search_query, filter="songs", limit=3)
-                            if search_results and len(search_results) > 0:
-                                video_id = search_results[0].get('videoId')
-                                if video_id and video_id not in video_ids:
-                                    break
-                        except Exception as search_error:
-                            continue
-                    
-                    if video_id:
-                        yield f"data: {json.dumps({'type': 'track_found', 'track': f'{track.name} - {track.artist}', 'videoId': video_id})}\n\n"
-                        video_ids.append(video_id)
-                        added_tracks.append({
-                            "name": track.name,
-                            "artist": track.artist,
-                            "video_id": video_id
-                        })
-                    else:
-                        yield f"data: {json.dumps({'type': 'track_not_found', 'track': f'{track.name} - {track.artist}'})}\n\n"
-                        failed_tracks.append({
-                            "name": track.name,
-                            "artist": track.artist,
-                            "reason": "Not found on YouTube Music"
-                        })
-                        
-                except Exception as track_error:
-                    yield f"data: {json.dumps({'type': 'track_error', 'track': f'{track.name} - {track.artist}', 'error': str(track_error)})}\n\n"
-                    failed_tracks.append({
-                        "name": track.name,
-                        "artist": track.artist,
-                        "reason": str(track_error)
-                    })
-                
-                # Small delay to prevent rate limiting
-                await asyncio.sleep(0.1)
-            
-            # Add all found tracks to playlist
-            if video_ids:
-                yield f"data: {json.dumps({'type': 'status', 'message': f'Adding {len(video_ids)} songs to playlist...'})}\n\n"
-                
-                try:
-                    ytmusic_api.add_playlist_items(playlist_id, video_ids)
-                    yield f"data: {json.dumps({'type': 'status', 'message': f'Successfully added {len(video_ids)} songs to playlist!'})}\n\n"
-                except Exception as add_error:
-                    yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to add songs to playlist: {str(add_error)}'})}\n\n"
-                    return
-            
-            # Generate playlist URL
-            playlist_url = f"https://music.youtube.com/playlist?list={playlist_id}"
-            
-            # Send final result
-            result = {
-                'type': 'complete',
-                'progress': 100,
-                'playlistUrl': playlist_url,
-                'stats': {
-                    'total': total_tracks,
-                    'successful': len(added_tracks),
-                    'failed': len(failed_tracks),
-                    'skipped': 0
-                },
-                'addedTracks': added_tracks,
-                'failedTracks': failed_tracks,
-                'message': f"Import completed! {len(added_tracks)} tracks added, {len(failed_tracks)} failed."
-            }
-            
-            yield f"data: {json.dumps(result)}\n\n"
-            
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': f'Import failed: {str(e)}'})}\n\n"
+            jobs.update_job(job_id, status="complete", stats=stats, finishedAt=time.time())
+        
+        async with aclosing(stream_job(job_id, asyncio.create_task(run_job()), sink)) as job_frames:
+            async for frame in job_frames:
+                yield frame
     
-    return StreamingResponse(
-        generate_progress(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-        }
-    )
+    return event_stream(frames())
+
+@app.post("/import-liked-songs-stream")
+async def import_liked_songs(request: LikedSongsImportRequest):
+    """Import the user's Spotify Liked Songs as a streaming pipeline with flat memory use"""
+    # Spotify pages are pulled lazily; at most LIBRARY_PAGE_PREFETCH pages wait ahead of resolution
+    pages = iterate_in_thread(iter_saved_track_pages(request.access_token), prefetch=LIBRARY_PAGE_PREFETCH)
+    
+    # Per-track outcomes go to the result store and seen tracks to a spillable digest set,
+    # so memory is bounded by the settings rather than by the size of the library
+    return event_stream(stream_import(
+        request.playlistName,
+        pages,
+        create_sse_sink(),
+        flow_id=user_flow(request.access_token),
+        priority=request.priority
+    ))
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of an import job, answered by whichever worker receives the request"""
+    job = await asyncio.to_thread(get_session_store().get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(job_id: str, status: str = "all", offset: int = 0, limit: int = 100):
+    """Page through an import's per-track outcomes (status: all or failed)"""
+    if status not in ("all", "failed"):
+        raise HTTPException(status_code=400, detail="status must be 'all' or 'failed'")
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), IMPORT_RESULT_PAGE_LIMIT)
+    
+    total, results = await asyncio.to_thread(get_result_store().page, job_id, status == "failed", offset, limit)
+    if total == 0 and await asyncio.to_thread(get_session_store().get_job, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    next_offset = offset + len(results)
+    return {
+        "jobId": job_id,
+        "total": total,
+        "offset": offset,
+        "results": results,
+        "nextOffset": next_offset if next_offset < total else None
+    }
+
+@app.get("/jobs/{job_id}/trace")
+async def get_job_trace(job_id: str, format: str = "chrome"):
+    """Span timeline of an import: Chrome trace JSON (format=chrome, opens in chrome://tracing
+    or Perfetto) or a plain list of spans (format=timeline)
+
+    A running import's timeline is served by the worker running it; once finished, by any worker.
+    """
+    if format not in ("chrome", "timeline"):
+        raise HTTPException(status_code=400, detail="format must be 'chrome' or 'timeline'")
+    trace = active_traces.get(job_id)
+    if trace is None:
+        data = await asyncio.to_thread(get_cache("trace", JOB_STATE_TTL).get, job_id)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Trace not found")
+        trace = Trace.from_dict(data)
+    return trace.chrome_trace() if format == "chrome" else trace.timeline()
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a running import, whichever worker is running it"""
+    jobs = get_session_store()
+    job = await asyncio.to_thread(jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get('status') != 'running':
+        return {"jobId": job_id, "status": job.get('status'), "message": "Job is not running"}
+    
+    # Workers not running the job pick the flag up within IMPORT_CANCEL_POLL_INTERVAL
+    await asyncio.to_thread(jobs.update_job, job_id, cancelRequested=True, cancelReason="cancel requested")
+    task = active_imports.get(job_id)
+    if task is not None:
+        task.cancel()
+    return {"jobId": job_id, "status": "cancelling", "message": "Import is being cancelled"}
+
+@app.post("/sync-playlist")
+async def sync_spotify_playlist(request: SyncPlaylistRequest):
+    """Incrementally sync a previously imported Spotify playlist to YouTube Music"""
+    if not ytmusic_api:
+        ytmusic_result = await authenticate_youtube_music()
+        if not ytmusic_result.get("success"):
+            raise HTTPException(status_code=401, detail="YouTube Music authentication failed")
+    
+    try:
+        result = await asyncio.to_thread(
+            sync_playlist,
+            search_client(),
+            get_sync_store(),
+            request.access_token,
+            request.playlistId,
+            request.removeMissing,
+            request.force,
+            request.playlistName,
+            snapshot_cache(),
+            IMPORT_ADD_BATCH_SIZE
+        )
+    except Exception as e:
+        print(f"Sync failed for {request.playlistId}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to sync playlist: {str(e)}")
+    
+    return {
+        **result,
+        "playlistUrl": f"https://music.youtube.com/playlist?list={result['youtubePlaylistId']}",
+        "message": f"Sync {result['status']}: {len(result['added'])} added, {len(result['removed'])} removed, {len(result['failed'])} not found."
+    }
 
 if __name__ == "__main__":
     import uvicorn
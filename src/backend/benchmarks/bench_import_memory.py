@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of the import engine as the number of tracks grows
+Runs a full import against an in-process YouTube Music stand-in (every track is found and
+added) and reports the tracemalloc peak. The normalization LRU tables fill up at
+CACHE_SIZE distinct strings and the dedupe sets spill to disk past `dedup_memory` tracks;
+beyond both, the peak should stop growing with the track count.
+
+Usage: python benchmarks/bench_import_memory.py [track_count ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.import_engine import ImportEngine, ImportSink
+from utils.normalization import clean_title, fold_text, normalized_key
+
+PAGE_SIZE = 50
+DEDUP_MEMORY = 50000
+
+
+class StandInYTMusic:
+    """Accepts every add, like a healthy YouTube Music session"""
+
+    def create_playlist(self, title, description, privacy_status="PRIVATE"):
+        return "PLbench"
+
+    def add_playlist_items(self, playlist_id, video_ids):
+        return {'status': 'STATUS_SUCCEEDED', 'playlistEditResults': [{'videoId': video_id} for video_id in video_ids]}
+
+
+async def pages(count: int):
+    """Spotify-sized pages of distinct tracks spread over many albums"""
+    for start in range(0, count, PAGE_SIZE):
+        yield [
+            {'name': f"Song {i}", 'artist': f"Artist {i // 200}", 'album': f"Album {i // 12}"}
+            for i in range(start, min(start + PAGE_SIZE, count))
+        ], count
+
+
+def measure(count: int):
+    # Start every run with empty memo tables so earlier runs do not hide their cost
+    for memoized in (fold_text, clean_title, normalized_key):
+        memoized.cache_clear()
+    engine = ImportEngine(
+        StandInYTMusic(), "Bench", pages(count), ImportSink(),
+        resolver=lambda track: f"vid-{track['index']}",
+        search_delay=0, dedup_memory=DEDUP_MEMORY
+    )
+    tracemalloc.start()
+    started = time.perf_counter()
+    summary = asyncio.run(engine.run())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert summary['stats']['successful'] == count
+    return peak, elapsed
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [20000, 100000, 200000]
+    print(f"{'tracks':>8} {'peak MB':>9} {'seconds':>8}")
+    for count in counts:
+        peak, elapsed = measure(count)
+        print(f"{count:>8} {peak / 1e6:>9.1f} {elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
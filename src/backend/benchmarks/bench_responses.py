@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and bytes on the wire for large track lists
+Compares the stdlib encoder used by JSONResponse with orjson, uncompressed and compressed
+
+Usage: python benchmarks/bench_responses.py [track_count ...]
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.compression import brotli, compress_body
+
+
+def make_tracks(count: int):
+    """Build a synthetic /spotify/playlist/{id}/tracks payload with realistic repetition"""
+    rng = random.Random(42)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))).title() for _ in range(2000)]
+    artists = [" ".join(rng.choices(vocabulary, k=2)) for _ in range(max(count // 20, 1))]
+    albums = [" ".join(rng.choices(vocabulary, k=3)) for _ in range(max(count // 10, 1))]
+
+    return {"tracks": [
+        {
+            "name": " ".join(rng.choices(vocabulary, k=rng.randint(1, 4))),
+            "artist": rng.choice(artists),
+            "album": rng.choice(albums)
+        }
+        for _ in range(count)
+    ]}
+
+
+def stdlib_render(payload) -> bytes:
+    """Same settings as starlette's JSONResponse.render"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_render(payload) -> bytes:
+    import orjson
+    return orjson.dumps(payload)
+
+
+def timed(func, *args, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 30000]
+
+    for count in counts:
+        payload = make_tracks(count)
+        print(f"\n{count} tracks")
+
+        stdlib_time, body = timed(stdlib_render, payload)
+        print(f"  json.dumps   {stdlib_time * 1000:8.2f} ms  {len(body):>10} bytes")
+
+        try:
+            orjson_time, body = timed(orjson_render, payload)
+            print(f"  orjson       {orjson_time * 1000:8.2f} ms  {len(body):>10} bytes  ({stdlib_time / orjson_time:.1f}x faster)")
+        except ImportError:
+            print("  orjson       not installed")
+
+        gzip_time, gzipped = timed(compress_body, body, "gzip")
+        print(f"  + gzip       {gzip_time * 1000:8.2f} ms  {len(gzipped):>10} bytes  ({len(body) / len(gzipped):.1f}x smaller)")
+
+        if brotli is not None:
+            br_time, compressed = timed(compress_body, body, "br")
+            print(f"  + brotli     {br_time * 1000:8.2f} ms  {len(compressed):>10} bytes  ({len(body) / len(compressed):.1f}x smaller)")
+        else:
+            print("  + brotli     not installed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold start: import time of api.main and time to the first /health response
+Each run uses a fresh interpreter so nothing is warm in sys.modules.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only load when an endpoint needs them
+HEAVY_MODULES = ["ytmusicapi", "requests", "sqlalchemy", "httpx", "subprocess"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+sys.path.insert(0, {BACKEND_DIR!r})
+started = time.perf_counter()
+import api.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    """Import api.main in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn until /health answers"""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("/health did not respond")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    imports = [measure_import() for _ in range(runs)]
+    import_times = [result["seconds"] * 1000 for result in imports]
+    print(f"import api.main      median {statistics.median(import_times):7.1f} ms  (min {min(import_times):.1f}, {runs} runs)")
+    print(f"heavy modules loaded: {', '.join(imports[-1]['loaded']) or 'none'}")
+
+    health_times = [measure_first_health() * 1000 for _ in range(runs)]
+    print(f"first /health        median {statistics.median(health_times):7.1f} ms  (min {min(health_times):.1f}, {runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
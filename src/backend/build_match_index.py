@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Compile the persistent match store into the memory-mapped match index
+The new index is published atomically; running API workers pick it up on their next check.
+
+Usage: python build_match_index.py [--output match_index.idx]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import DATABASE_URL, MATCH_INDEX_PATH
+from models.models import MatchStore
+from services.match_index import build_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped match index from the match store")
+    parser.add_argument("--database-url", default=DATABASE_URL, help="Match store database URL")
+    parser.add_argument("--output", default=MATCH_INDEX_PATH, help="Index file to publish")
+    args = parser.parse_args()
+
+    started = time.time()
+    count = build_index(MatchStore(args.database_url).iter_matches(), args.output)
+    print(f"✅ Published {count} matches to {args.output} in {time.time() - started:.1f}s")
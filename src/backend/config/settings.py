@@ -22,17 +22,66 @@ SPOTIFY_REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI", "http://127.0.0.1:3000/
 
 # YouTube Music configuration (using ytmusicapi - no quota limits)
 YOUTUBE_MUSIC_OAUTH_FILE = "ytmusic_oauth.json"
+YTMUSIC_WARMUP = os.getenv("YTMUSIC_WARMUP", "True").lower() == "true"  # build and verify the client at startup
+YTMUSIC_HTTP2 = os.getenv("YTMUSIC_HTTP2", "True").lower() == "true"  # transport protocol for YouTube Music requests
+YTMUSIC_MAX_CONNECTIONS = int(os.getenv("YTMUSIC_MAX_CONNECTIONS", 10))  # pooled YouTube Music connections per worker
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///playlist_importer.db")
 
+# Memory-mapped match index compiled from the match store by build_match_index.py
+MATCH_INDEX_PATH = os.getenv("MATCH_INDEX_PATH", "match_index.idx")
+FUZZY_INDEX_PATH = os.getenv("FUZZY_INDEX_PATH", "fuzzy_index.jsonl")  # empty disables fuzzy matching
+FUZZY_MATCH_THRESHOLD = float(os.getenv("FUZZY_MATCH_THRESHOLD", 0.9))  # confidence needed to skip the search
+
+# Shared cache (memory://, sqlite:///path/to/cache.db or redis://host:6379/0)
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "json")  # json or pickle
+CACHE_SEARCH_TTL = float(os.getenv("CACHE_SEARCH_TTL", 86400))  # seconds a search result is reused
+CACHE_MATCH_TTL = float(os.getenv("CACHE_MATCH_TTL", 2592000))  # seconds a resolved match is reused
+CACHE_SNAPSHOT_TTL = float(os.getenv("CACHE_SNAPSHOT_TTL", 86400))  # seconds a Spotify snapshot's tracks are kept
+CACHE_AUTH_PROBE_TTL = float(os.getenv("CACHE_AUTH_PROBE_TTL", 60))  # seconds a successful auth check is trusted
+CACHE_ALBUM_TTL = float(os.getenv("CACHE_ALBUM_TTL", 604800))  # seconds an album's track listing is reused
+
 # API configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", 8000))
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+WORKERS = int(os.getenv("WORKERS", 1))  # uvicorn worker processes (ignored with DEBUG reload)
+AUTH_SYNC_INTERVAL = float(os.getenv("AUTH_SYNC_INTERVAL", 1.0))  # seconds between shared credential checks
+JOB_STATE_TTL = float(os.getenv("JOB_STATE_TTL", 86400))  # seconds import job records are kept
 
 # CORS configuration
 ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://127.0.0.1:3000"
-]
\ No newline at end of file
+]
+
+# Streaming import (SSE) configuration
+SSE_PROGRESS_INTERVAL = float(os.getenv("SSE_PROGRESS_INTERVAL", 0.25))  # seconds between progress events
+SSE_PROGRESS_STEP = int(os.getenv("SSE_PROGRESS_STEP", 1))  # percentage points between progress events
+SSE_TRACK_BATCH_SIZE = int(os.getenv("SSE_TRACK_BATCH_SIZE", 50))  # per-track events per batch
+
+# Response compression configuration
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))  # bytes
+
+# Import engine configuration
+IMPORT_RESOLVE_CONCURRENCY = int(os.getenv("IMPORT_RESOLVE_CONCURRENCY", 1))  # parallel search workers
+IMPORT_QUEUE_SIZE = int(os.getenv("IMPORT_QUEUE_SIZE", 100))  # bounded queue between stages
+IMPORT_ADD_BATCH_SIZE = int(os.getenv("IMPORT_ADD_BATCH_SIZE", 100))  # videos added per request
+IMPORT_ADD_FLUSH_INTERVAL = float(os.getenv("IMPORT_ADD_FLUSH_INTERVAL", 5.0))  # seconds before a partial batch is added
+UPSTREAM_CONCURRENCY = int(os.getenv("UPSTREAM_CONCURRENCY", 4))  # concurrent YouTube Music calls per worker, shared fairly
+IMPORT_CANCEL_POLL_INTERVAL = float(os.getenv("IMPORT_CANCEL_POLL_INTERVAL", 1.0))  # seconds between cross-worker cancel checks
+IMPORT_RESULT_BATCH_SIZE = int(os.getenv("IMPORT_RESULT_BATCH_SIZE", 500))  # per-track results buffered before they are written
+IMPORT_RESULT_PAGE_LIMIT = int(os.getenv("IMPORT_RESULT_PAGE_LIMIT", 500))  # largest page served by /jobs/{id}/results
+ALBUM_MIN_GROUP = int(os.getenv("ALBUM_MIN_GROUP", 2))  # tracks from one album before its listing is fetched (0 disables)
+IMPORT_TRACE_MAX_SPANS = int(os.getenv("IMPORT_TRACE_MAX_SPANS", 50000))  # spans kept per import timeline (0 disables tracing)
+IMPORT_DEDUP_MEMORY = int(os.getenv("IMPORT_DEDUP_MEMORY", 50000))  # seen tracks kept in memory before spilling to a temp file
+IMPORT_ALBUM_GROUPS = int(os.getenv("IMPORT_ALBUM_GROUPS", 10000))  # albums whose track counts are kept per import
+
+# Match preview configuration
+PREVIEW_TTL = float(os.getenv("PREVIEW_TTL", 3600))  # seconds a preview can be committed
+PREVIEW_CANDIDATES = int(os.getenv("PREVIEW_CANDIDATES", 3))  # candidates returned per track
+
+# Large library (Liked Songs) import configuration
+LIBRARY_PAGE_PREFETCH = int(os.getenv("LIBRARY_PAGE_PREFETCH", 2))  # Spotify pages buffered ahead
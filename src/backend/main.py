@@ -3,6 +3,7 @@
 Main entry point for the Playlist Importer Backend API
 """
 
+import argparse
 import uvicorn
 import sys
 import os
@@ -11,13 +12,27 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from api.main import app
-from config.settings import API_HOST, API_PORT, DEBUG
+from config.settings import API_HOST, API_PORT, CACHE_URL, DEBUG, WORKERS
+
+# Shared state file used when several workers are started without a shared cache configured
+MULTI_WORKER_CACHE_URL = "sqlite:///shared_state.db"
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Playlist Importer API")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Worker processes (default: WORKERS)")
+    args = parser.parse_args()
+
+    workers = 1 if DEBUG else max(1, args.workers)
+    if workers > 1 and CACHE_URL.startswith("memory://"):
+        # Workers must share authentication and job state; an in-process cache would split it
+        print(f"🔧 {workers} workers with an in-memory cache, using {MULTI_WORKER_CACHE_URL} for shared state")
+        os.environ["CACHE_URL"] = MULTI_WORKER_CACHE_URL
+
     uvicorn.run(
         "api.main:app",
         host=API_HOST,
         port=API_PORT,
         reload=DEBUG,
+        workers=workers,
         log_level="debug" if DEBUG else "info"
-    )
\ No newline at end of file
+    )
@@ -2,7 +2,7 @@
 Database models for multi-user support
 """
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -25,6 +25,43 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class PlaylistSync(Base):
+    """Spotify playlist -> YouTube Music playlist mapping used by incremental sync"""
+    __tablename__ = "playlist_syncs"
+    
+    spotify_playlist_id = Column(String(64), primary_key=True)
+    youtube_playlist_id = Column(String(64), nullable=False)
+    snapshot_id = Column(String(128), nullable=True)
+    tracks = Column(Text, nullable=False, default="{}")  # JSON: track key -> {name, artist, videoId}
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class TrackMatch(Base):
+    """Resolved YouTube Music match for a normalized track key"""
+    __tablename__ = "track_matches"
+    
+    key = Column(String(512), primary_key=True)
+    name = Column(Text, nullable=False)
+    artist = Column(Text, nullable=False)
+    video_id = Column(String(32), nullable=True)  # None: searched but not found
+    resolved_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ImportResult(Base):
+    """Outcome of one distinct track in an import job"""
+    __tablename__ = "import_results"
+    
+    job_id = Column(String(32), primary_key=True)
+    position = Column(Integer, primary_key=True)  # order of the track among the job's distinct tracks
+    name = Column(Text, nullable=False)
+    artist = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False)  # found, not_found, error or add_failed
+    video_id = Column(String(32), nullable=True)
+    reason = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+# Statuses counted as failures by ImportResultStore.page(failed_only=True)
+FAILED_RESULT_STATUSES = ("not_found", "error", "add_failed")
+
 class DatabaseManager:
     """Database manager for user sessions"""
     
@@ -83,4 +120,154 @@ class DatabaseManager:
     def is_youtube_authenticated(self, user_id: str) -> bool:
         """Check if user has valid YouTube tokens"""
         tokens = self.get_youtube_tokens(user_id)
-        return tokens is not None 
\ No newline at end of file
+        return tokens is not None
+
+
+class PlaylistSyncStore:
+    """Persistent store of imported playlists for incremental sync"""
+    
+    def __init__(self, database_url="sqlite:///playlist_importer.db"):
+        self.engine = create_engine(database_url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+    
+    def get(self, spotify_playlist_id: str) -> dict:
+        """Get the stored sync state for a Spotify playlist"""
+        with self.Session() as session:
+            sync = session.get(PlaylistSync, spotify_playlist_id)
+            if not sync:
+                return None
+            return {
+                "spotify_playlist_id": sync.spotify_playlist_id,
+                "youtube_playlist_id": sync.youtube_playlist_id,
+                "snapshot_id": sync.snapshot_id,
+                "tracks": json.loads(sync.tracks or "{}"),
+                "updated_at": sync.updated_at
+            }
+    
+    def save(self, spotify_playlist_id: str, youtube_playlist_id: str, snapshot_id: str, tracks: dict):
+        """Create or replace the sync state for a Spotify playlist"""
+        with self.Session() as session:
+            sync = session.get(PlaylistSync, spotify_playlist_id)
+            if not sync:
+                sync = PlaylistSync(spotify_playlist_id=spotify_playlist_id)
+                session.add(sync)
+            sync.youtube_playlist_id = youtube_playlist_id
+            sync.snapshot_id = snapshot_id
+            sync.tracks = json.dumps(tracks)
+            session.commit()
+    
+    def delete(self, spotify_playlist_id: str):
+        """Forget a Spotify playlist's sync state"""
+        with self.Session() as session:
+            sync = session.get(PlaylistSync, spotify_playlist_id)
+            if sync:
+                session.delete(sync)
+                session.commit()
+
+
+class MatchStore:
+    """Persistent track key -> videoId match store shared by the API and the pre-resolution CLI"""
+    
+    def __init__(self, database_url="sqlite:///playlist_importer.db"):
+        self.engine = create_engine(database_url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+    
+    def get(self, key: str) -> dict:
+        """Get the stored match for a track key"""
+        with self.Session() as session:
+            match = session.get(TrackMatch, key)
+            if not match:
+                return None
+            return {"key": match.key, "name": match.name, "artist": match.artist, "video_id": match.video_id}
+    
+    def save(self, key: str, name: str, artist: str, video_id: str):
+        """Store a single match"""
+        self.save_many([(key, name, artist, video_id)])
+    
+    def save_many(self, matches: list):
+        """Store (key, name, artist, video_id) tuples in one transaction"""
+        with self.Session() as session:
+            for key, name, artist, video_id in matches:
+                session.merge(TrackMatch(key=key, name=name, artist=artist, video_id=video_id, resolved_at=datetime.utcnow()))
+            session.commit()
+    
+    def existing_keys(self, include_missing: bool = True) -> set:
+        """Keys already resolved (optionally excluding searches that found nothing)"""
+        with self.Session() as session:
+            query = session.query(TrackMatch.key)
+            if not include_missing:
+                query = query.filter(TrackMatch.video_id.isnot(None))
+            return {row[0] for row in query}
+    
+    def iter_named_matches(self, batch_size: int = 10000):
+        """Yield (key, name, artist, video_id) for every found match"""
+        with self.Session() as session:
+            query = session.query(TrackMatch.key, TrackMatch.name, TrackMatch.artist, TrackMatch.video_id).filter(
+                TrackMatch.video_id.isnot(None)
+            )
+            for row in query.yield_per(batch_size):
+                yield tuple(row)
+    
+    def iter_matches(self, batch_size: int = 10000):
+        """Yield (key, video_id) for every found match"""
+        with self.Session() as session:
+            query = session.query(TrackMatch.key, TrackMatch.video_id).filter(TrackMatch.video_id.isnot(None))
+            for key, video_id in query.yield_per(batch_size):
+                yield key, video_id
+
+
+class ImportResultStore:
+    """Per-track import outcomes, written in batches so a running import does not hold them in memory"""
+    
+    def __init__(self, database_url="sqlite:///playlist_importer.db"):
+        self.engine = create_engine(database_url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+    
+    def save_many(self, job_id: str, rows: list):
+        """Store (position, name, artist, status, video_id, reason) tuples in one transaction"""
+        with self.Session() as session:
+            session.add_all([
+                ImportResult(job_id=job_id, position=position, name=name, artist=artist,
+                             status=status, video_id=video_id, reason=reason)
+                for position, name, artist, status, video_id, reason in rows
+            ])
+            session.commit()
+    
+    def mark_add_failed(self, job_id: str, video_ids: list, reason: str):
+        """Record that YouTube Music rejected songs that had been found"""
+        with self.Session() as session:
+            session.query(ImportResult).filter(
+                ImportResult.job_id == job_id,
+                ImportResult.video_id.in_(video_ids)
+            ).update({"status": "add_failed", "reason": reason}, synchronize_session=False)
+            session.commit()
+    
+    def page(self, job_id: str, failed_only: bool = False, offset: int = 0, limit: int = 100) -> tuple:
+        """Return (matching count, results) for one page of a job's outcomes in track order"""
+        with self.Session() as session:
+            query = session.query(ImportResult).filter(ImportResult.job_id == job_id)
+            if failed_only:
+                query = query.filter(ImportResult.status.in_(FAILED_RESULT_STATUSES))
+            total = query.count()
+            results = query.order_by(ImportResult.position).offset(offset).limit(limit).all()
+            return total, [
+                {
+                    "position": result.position,
+                    "name": result.name,
+                    "artist": result.artist,
+                    "status": result.status,
+                    "videoId": result.video_id,
+                    "reason": result.reason
+                }
+                for result in results
+            ]
+    
+    def prune(self, before: datetime) -> int:
+        """Delete results of jobs recorded before `before`"""
+        with self.Session() as session:
+            deleted = session.query(ImportResult).filter(ImportResult.created_at < before).delete(synchronize_session=False)
+            session.commit()
+            return deleted
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Offline bulk pre-resolution of tracks into the persistent match store
+
+Reads a track list (JSON lines, a JSON import request or CSV with name/artist columns),
+resolves it across a process pool with the same search code as the API, and writes the
+results into the match store. Tracks already in the store are skipped, so an interrupted
+run resumes where it stopped.
+
+Usage: python preresolve.py tracks.jsonl --workers 4 --rate 5
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.track_resolver import resolve_track, track_key
+
+# Per-process state set up by the pool initializer
+_worker_ytmusic = None
+
+
+class GlobalRateLimiter:
+    """Spaces calls evenly across every process sharing it"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = multiprocessing.Value('d', 0.0)
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.next_slot.get_lock():
+            now = time.time()
+            slot = max(now, self.next_slot.value)
+            self.next_slot.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimitedYTMusic:
+    """YTMusic proxy whose searches respect the global rate limit"""
+
+    def __init__(self, ytmusic, limiter: GlobalRateLimiter):
+        self.ytmusic = ytmusic
+        self.limiter = limiter
+
+    def search(self, *args, **kwargs):
+        self.limiter.wait()
+        return self.ytmusic.search(*args, **kwargs)
+
+
+def init_worker(oauth_file: str, limiter: GlobalRateLimiter):
+    """Create one authenticated YTMusic client per worker process"""
+    global _worker_ytmusic
+    from ytmusicapi import YTMusic
+    _worker_ytmusic = RateLimitedYTMusic(YTMusic(oauth_file), limiter)
+
+
+def resolve_worker(track: tuple) -> tuple:
+    """Resolve one (key, name, artist) track in a worker process
+
+    Returns (key, name, artist, videoId, error). A track whose searches failed has an error
+    and is not stored, so the next run searches it again instead of treating it as not found.
+    """
+    key, name, artist = track
+    try:
+        return key, name, artist, resolve_track(_worker_ytmusic, name, artist, raise_errors=True), None
+    except Exception as e:
+        print(f"Error resolving {name} - {artist}: {e}")
+        return key, name, artist, None, str(e)
+
+
+def read_tracks(path: str):
+    """Yield (name, artist) pairs from a JSON lines, JSON or CSV track list"""
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension == '.csv':
+            for row in csv.DictReader(f):
+                if row.get('name'):
+                    yield row['name'], row.get('artist', '')
+        elif extension == '.json':
+            data = json.load(f)
+            # Either a saved import request ({"tracks": [...]}) or a bare list of tracks
+            for track in data.get('tracks', []) if isinstance(data, dict) else data:
+                if track.get('name'):
+                    yield track['name'], track.get('artist', '')
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    track = json.loads(line)
+                    if track.get('name'):
+                        yield track['name'], track.get('artist', '')
+
+
+def pending_tracks(path: str, done_keys: set):
+    """Distinct tracks from the input file that the match store does not have yet"""
+    seen = set(done_keys)
+    for name, artist in read_tracks(path):
+        key = track_key(name, artist)
+        if key not in seen:
+            seen.add(key)
+            yield key, name, artist
+
+
+def main():
+    from config.settings import DATABASE_URL, YOUTUBE_MUSIC_OAUTH_FILE
+    from models.models import MatchStore
+
+    parser = argparse.ArgumentParser(description="Pre-resolve tracks into the YouTube Music match store")
+    parser.add_argument("input", help="Track list (.jsonl, .json or .csv with name/artist)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--rate", type=float, default=5.0, help="Global search rate limit (searches/second, 0 = unlimited)")
+    parser.add_argument("--oauth-file", default=YOUTUBE_MUSIC_OAUTH_FILE, help="ytmusicapi auth file")
+    parser.add_argument("--database-url", default=DATABASE_URL, help="Match store database URL")
+    parser.add_argument("--batch-size", type=int, default=100, help="Matches written per transaction")
+    parser.add_argument("--retry-missing", action="store_true", help="Search again for tracks previously not found")
+    args = parser.parse_args()
+
+    store = MatchStore(args.database_url)
+    done_keys = store.existing_keys(include_missing=not args.retry_missing)
+    print(f"🔧 Match store has {len(done_keys)} resolved tracks, resuming after them")
+
+    limiter = GlobalRateLimiter(args.rate)
+    started = time.time()
+    resolved = found = errors = 0
+    batch = []
+
+    with multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(args.oauth_file, limiter)) as pool:
+        try:
+            for key, name, artist, video_id, error in pool.imap_unordered(resolve_worker, pending_tracks(args.input, done_keys), chunksize=8):
+                if error is not None:
+                    errors += 1
+                    continue
+                batch.append((key, name, artist, video_id))
+                resolved += 1
+                found += 1 if video_id else 0
+
+                if len(batch) >= args.batch_size:
+                    store.save_many(batch)
+                    batch = []
+                    rate = resolved / (time.time() - started)
+                    print(f"✅ {resolved} resolved ({found} found), {rate:.1f} tracks/s")
+        except KeyboardInterrupt:
+            print("⚠️ Interrupted, saving progress (run again to resume)")
+            pool.terminate()
+        finally:
+            if batch:
+                store.save_many(batch)
+
+    print(f"✅ Done: {resolved} tracks resolved, {found} found, in {time.time() - started:.0f}s")
+    if errors:
+        print(f"⚠️ {errors} tracks could not be searched and were not stored (run again to retry them)")
+
+
+if __name__ == "__main__":
+    main()
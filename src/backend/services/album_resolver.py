@@ -0,0 +1,128 @@
+"""
+Album-level track resolution
+Album-heavy playlists repeat the same (artist, album) many times. Instead of searching
+every track, the album is found with one album search and its track listing is fetched
+once with get_album; every track of the group is then matched against that listing
+locally. Listings are kept in the shared cache, and concurrent resolvers asking for the
+same album wait for a single fetch.
+"""
+
+import threading
+from difflib import SequenceMatcher
+from typing import Dict, Optional, Tuple
+
+from utils.cancellation import OperationCancelled, raise_if_cancelled
+from utils.normalization import clean_title, fold_text, primary_artist, tokens_agree
+from utils.tracing import span
+
+# Similarity needed to accept an album search result and a title from its listing
+ALBUM_MATCH_THRESHOLD = 0.8
+TITLE_MATCH_THRESHOLD = 0.9
+
+
+def album_group(artist: str, album: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(artist, album) grouping key, or None for tracks without an album"""
+    if not album:
+        return None
+    return fold_text(primary_artist(artist)), fold_text(clean_title(album))
+
+
+def _similarity(left: str, right: str) -> float:
+    return SequenceMatcher(None, left, right).ratio()
+
+
+def find_album(ytmusic, album: str, artist: str) -> Optional[str]:
+    """browseId of the album search result matching both album title and artist"""
+    wanted_album = fold_text(clean_title(album))
+    wanted_artist = fold_text(primary_artist(artist))
+    results = ytmusic.search(f"{clean_title(album)} {primary_artist(artist)}", filter="albums", limit=5) or []
+    for result in results:
+        if not result.get('browseId'):
+            continue
+        album_score = _similarity(wanted_album, fold_text(clean_title(result.get('title') or '')))
+        artist_score = max(
+            (_similarity(wanted_artist, fold_text(found.get('name') or '')) for found in result.get('artists') or []),
+            default=0.0
+        )
+        if album_score >= ALBUM_MATCH_THRESHOLD and artist_score >= ALBUM_MATCH_THRESHOLD:
+            return result['browseId']
+    return None
+
+
+def fetch_album_listing(ytmusic, album: str, artist: str) -> Dict[str, str]:
+    """Normalized track title -> videoId for an album ({} when the album is not found)"""
+    browse_id = find_album(ytmusic, album, artist)
+    if not browse_id:
+        return {}
+    raise_if_cancelled()
+    listing = {}
+    for track in (ytmusic.get_album(browse_id) or {}).get('tracks') or []:
+        # Unavailable tracks are listed without a videoId
+        if track.get('videoId') and track.get('title'):
+            listing.setdefault(fold_text(clean_title(track['title'])), track['videoId'])
+    return listing
+
+
+def match_listing(listing: Dict[str, str], name: str) -> Optional[str]:
+    """videoId of the listed title matching a track name, exactly after normalization or closely"""
+    title = fold_text(clean_title(name))
+    if title in listing:
+        return listing[title]
+    best_title, best_score = None, TITLE_MATCH_THRESHOLD
+    for listed in listing:
+        # "Interlude 2" is a different track than "Interlude", however similar the strings
+        if not tokens_agree(title, listed):
+            continue
+        score = _similarity(title, listed)
+        if score >= best_score:
+            best_title, best_score = listed, score
+    return listing[best_title] if best_title is not None else None
+
+
+class AlbumCatalog:
+    """Album track listings shared by every import in this worker (backed by the shared cache)"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.fetching: Dict[str, threading.Event] = {}
+
+    def listing(self, ytmusic, album: str, artist: str) -> Dict[str, str]:
+        """An album's listing, fetched at most once at a time across resolver threads"""
+        group = album_group(artist, album)
+        cache_key = "\x1f".join(group)
+        while True:
+            listing = self.cache.get(cache_key)
+            if listing is not None:
+                return listing
+            with self.lock:
+                event = self.fetching.get(cache_key)
+                if event is None:
+                    event = self.fetching[cache_key] = threading.Event()
+                    break
+            # Another resolver is fetching this album; use its result
+            event.wait()
+            raise_if_cancelled()
+
+        try:
+            with span("album.fetch", "search", album=album, artist=artist) as fetch_info:
+                listing = fetch_album_listing(ytmusic, album, artist)
+                fetch_info["tracks"] = len(listing)
+            # Albums that were not found are cached too ({}), so their tracks go straight to search
+            self.cache.set(cache_key, listing)
+            return listing
+        finally:
+            with self.lock:
+                self.fetching.pop(cache_key, None)
+            event.set()
+
+    def lookup(self, ytmusic, name: str, artist: str, album: str) -> Optional[str]:
+        """videoId of a track found in its album's listing, or None to fall back to search"""
+        try:
+            listing = self.listing(ytmusic, album, artist)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            print(f"Album lookup error for '{album}': {e}")
+            return None
+        return match_listing(listing, name) if listing else None
@@ -0,0 +1,296 @@
+"""
+Pluggable cache backends shared by search, match, Spotify snapshot and auth-probe caching
+In-memory for a single process, SQLite for a single host, and any Redis-protocol server
+(Redis, KeyDB, Dragonfly or a local stand-in) for deployments with several replicas.
+
+Backends are selected by URL:
+    memory://                    per-process LRU
+    sqlite:///path/to/cache.db   file shared by processes on one host
+    redis://host:6379/0          shared by every node
+"""
+
+import json
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONSerializer:
+    """JSON values (orjson when available); readable from other languages and tools"""
+
+    def dumps(self, value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class PickleSerializer:
+    """Pickled values; any Python object, only for trusted cache servers"""
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+SERIALIZERS = {
+    "json": JSONSerializer,
+    "pickle": PickleSerializer
+}
+
+
+class CacheBackend:
+    """Byte-level key/value store with per-key TTLs"""
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process LRU cache"""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[float] = None):
+        with self.lock:
+            self.entries[key] = (value, time.time() + ttl if ttl else None)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite file cache shared by every process on the host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside a writer"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return bytes(value)
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[float] = None):
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl if ttl else None)
+            )
+
+    def delete(self, key: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+
+class RedisProtocolError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RedisBackend(CacheBackend):
+    """Minimal RESP client (GET, SET PX, DEL) for Redis-protocol servers"""
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.local.sock = sock
+        self.local.reader = sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+
+    def _command(self, *parts):
+        """Send one command and read its reply, reconnecting once on a dropped connection"""
+        payload = self._encode(parts)
+        for attempt in range(2):
+            if getattr(self.local, "sock", None) is None:
+                self._connect()
+            try:
+                self.local.sock.sendall(payload)
+                return self._read_reply()
+            except (OSError, EOFError):
+                self._close()
+                if attempt:
+                    raise
+
+    def _close(self):
+        sock = getattr(self.local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self.local.sock = None
+        self.local.reader = None
+
+    @staticmethod
+    def _encode(parts) -> bytes:
+        encoded = [b"*%d\r\n" % len(parts)]
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            encoded.append(b"$%d\r\n%s\r\n" % (len(part), part))
+        return b"".join(encoded)
+
+    def _read_reply(self):
+        line = self.local.reader.readline()
+        if not line:
+            raise EOFError("Connection closed by cache server")
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b"+":
+            return rest
+        if prefix == b"-":
+            raise RedisProtocolError(rest.decode("utf-8", "replace"))
+        if prefix == b":":
+            return int(rest)
+        if prefix == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self.local.reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        return self._command("GET", key)
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if ttl:
+            self._command("SET", key, value, "PX", str(int(ttl * 1000)))
+        else:
+            self._command("SET", key, value)
+
+    def delete(self, key: str):
+        self._command("DEL", key)
+
+
+def create_backend(url: str) -> CacheBackend:
+    """Create a backend from a cache URL"""
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend()
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(url[len("sqlite:///"):] or "cache.db")
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisBackend(parsed.hostname or "localhost", parsed.port or 6379, db, parsed.password)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+
+class Cache:
+    """Namespaced, serialized view of a backend with a default TTL
+
+    Cache errors, including entries that cannot be deserialized, are logged and treated as
+    misses so a cache outage never fails an import.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: Optional[float] = None,
+                 serializer: str = "json"):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.serializer = SERIALIZERS[serializer]()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            data = self.backend.get_bytes(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Cache read failed ({self.namespace}): {e}")
+            return default
+        if data is None:
+            return default
+        try:
+            return self.serializer.loads(data)
+        except Exception as e:
+            # Written by another serializer or a different app version: recompute it
+            print(f"⚠️ Cache entry unreadable ({self.namespace}): {e}")
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        try:
+            self.backend.set_bytes(self._key(key), self.serializer.dumps(value), ttl or self.ttl)
+        except Exception as e:
+            print(f"⚠️ Cache write failed ({self.namespace}): {e}")
+
+    def delete(self, key: str):
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Cache delete failed ({self.namespace}): {e}")
@@ -0,0 +1,85 @@
+"""
+YouTube Music credentials loaded once and reloaded when their file changes
+The credential file is read and a verified YTMusic client is built once, normally at
+startup. Afterwards only the file's mtime is checked. A changed file is read, parsed,
+turned into a client and verified before it replaces the cached one. Requests therefore
+never see a half-written file or a half-built client. A broken file leaves the working
+client in place.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Optional
+
+
+class CredentialCache:
+    """Caches the client built from a credential file, keyed by the file's mtime"""
+
+    def __init__(self, path: str, factory: Callable[[str], object],
+                 validate: Optional[Callable[[object], None]] = None):
+        self.path = path
+        self.factory = factory
+        self.validate = validate
+        self.client = None
+        self.content: Optional[str] = None
+        self.mtime_ns: Optional[int] = None
+        # A version of the file that failed to load is not retried until it changes again
+        self.rejected_mtime_ns: Optional[int] = None
+        self.lock = threading.RLock()
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        """True when the file exists and differs from the one the cached client was built from"""
+        mtime = self._mtime()
+        return mtime is not None and mtime != self.mtime_ns
+
+    def load(self):
+        """Read the file and build a verified client; the cached one is replaced only on success"""
+        with self.lock:
+            mtime = self._mtime()
+            if mtime is None:
+                raise FileNotFoundError(f"Credential file not found: {self.path}")
+            with open(self.path) as f:
+                content = f.read()
+            if self._mtime() != mtime:
+                raise RuntimeError(f"{self.path} changed while it was being read")
+            # A file that is still being written is not valid JSON yet
+            json.loads(content)
+
+            client = self.factory(content)
+            if self.validate is not None:
+                self.validate(client)
+            self.client, self.content, self.mtime_ns = client, content, mtime
+            return client
+
+    def refresh(self) -> bool:
+        """Reload if the file changed; returns True when a new client is in place
+
+        Runs on the request path, so it never waits: before the first load has finished, or
+        while another load is verifying a client, the current client is kept.
+        """
+        if self.client is None or not self.changed() or self._mtime() == self.rejected_mtime_ns:
+            return False
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            # Another request may have reloaded it in the meantime
+            mtime = self._mtime()
+            if not self.changed() or mtime == self.rejected_mtime_ns:
+                return False
+            try:
+                self.load()
+            except Exception as e:
+                self.rejected_mtime_ns = mtime
+                print(f"⚠️ Keeping current YouTube Music credentials, reloading {self.path} failed: {e}")
+                return False
+        finally:
+            self.lock.release()
+        print(f"🔧 Reloaded YouTube Music credentials from {self.path}")
+        return True
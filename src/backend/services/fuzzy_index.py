@@ -0,0 +1,211 @@
+"""
+Fuzzy index of resolved tracks
+Exact track keys already ignore case, accents and reissue tags, but still miss typos,
+spacing and transliteration variants ("Dont Stop Me Now" vs "Don't Stop Me Now"). This
+index maps character trigrams of every resolved title and artist to the entries containing
+them, so a new spelling of a song we have resolved before can be matched locally instead
+of searched for again.
+
+Candidates are gathered from the trigram posting lists (arrays of entry ids, counted in C by
+Counter.update), ranked by trigram overlap, and the best few are verified per field with the
+Dice coefficient. Only a match whose title and artist both score highly is returned, and only
+if both differ just by spacing or typos: "Pt. 1" never answers for "Pt. 2", nor "Love Me"
+for "Love Me Do". A hit is a close spelling, not an exact match, so callers do not store it
+as one.
+
+Persistence is an append-only JSON-lines log, one [key, name, artist, videoId] per line.
+Entries are appended as imports resolve tracks. Every worker tails the log, so entries added by
+other workers become searchable without a rebuild.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.normalization import clean_title, fold_text, primary_artist, tokens_agree
+
+GRAM_SIZE = 3
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Character trigrams of a folded string, padded so short words still produce grams"""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1))
+
+
+def dice(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """Dice coefficient of two gram sets (1.0 for identical text)"""
+    if not left or not right:
+        return 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+
+class FuzzyIndex:
+    """In-process trigram index over resolved (title, artist) -> videoId entries"""
+
+    def __init__(self, path: Optional[str] = None, threshold: float = 0.9, artist_threshold: float = 0.8,
+                 max_posting_share: float = 0.2, verify_candidates: int = 5, sync_interval: float = 1.0):
+        self.path = path
+        self.threshold = threshold
+        self.artist_threshold = artist_threshold
+        # Grams found in more than this share of entries (e.g. " th") add cost but no signal
+        self.max_posting_share = max_posting_share
+        self.verify_candidates = verify_candidates
+        self.sync_interval = sync_interval
+
+        self.titles: List[str] = []
+        self.artists: List[str] = []
+        self.video_ids: List[str] = []
+        self.gram_counts = array("I")
+        self.postings: Dict[str, array] = {}
+        self.keys = set()
+        self.lock = threading.Lock()
+
+        self.offset = 0
+        self.synced_at = 0.0
+        self.log = None
+        if path:
+            self._sync()
+
+    def __len__(self):
+        return len(self.video_ids)
+
+    def _index(self, key: str, name: str, artist: str, video_id: str) -> bool:
+        if key in self.keys or not video_id:
+            return False
+        title = fold_text(clean_title(name))
+        credited = fold_text(primary_artist(artist))
+        grams = trigrams(f"{title} {credited}")
+
+        entry = len(self.video_ids)
+        self.keys.add(key)
+        self.titles.append(title)
+        self.artists.append(credited)
+        self.video_ids.append(video_id)
+        self.gram_counts.append(len(grams))
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("I")
+            posting.append(entry)
+        return True
+
+    def _sync(self):
+        """Index entries appended to the log since the last read (by any process)"""
+        self.synced_at = time.monotonic()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size <= self.offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        # A line still being written by another process is picked up next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                key, name, artist, video_id = json.loads(line)
+            except (ValueError, TypeError):
+                continue
+            self._index(key, name, artist, video_id)
+        self.offset += end
+
+    def add(self, key: str, name: str, artist: str, video_id: str):
+        """Index a resolved track and append it to the log"""
+        with self.lock:
+            if not self._index(key, name, artist, video_id) or not self.path:
+                return
+            self._append(json.dumps([key, name, artist, video_id], ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def add_many(self, entries: Iterable[Tuple[str, str, str, str]]) -> int:
+        """Index (key, name, artist, videoId) entries in bulk; returns how many were new"""
+        added = 0
+        with self.lock:
+            lines = []
+            for key, name, artist, video_id in entries:
+                if self._index(key, name, artist, video_id):
+                    added += 1
+                    if self.path:
+                        lines.append(json.dumps([key, name, artist, video_id], ensure_ascii=False))
+            if lines:
+                self._append(("\n".join(lines) + "\n").encode("utf-8"))
+        return added
+
+    def _append(self, data: bytes):
+        """Append to the log; our own lines are not read back unless another writer interleaved"""
+        if self.log is None:
+            self.log = open(self.path, "ab")
+        size_before = os.fstat(self.log.fileno()).st_size
+        self.log.write(data)
+        self.log.flush()
+        size_after = os.fstat(self.log.fileno()).st_size
+        if self.offset == size_before and size_after == size_before + len(data):
+            self.offset = size_after
+
+    def lookup(self, name: str, artist: str) -> Optional[Tuple[str, float]]:
+        """Best (videoId, confidence) at or above the threshold, or None"""
+        title = fold_text(clean_title(name))
+        credited = fold_text(primary_artist(artist))
+        grams = trigrams(f"{title} {credited}")
+
+        with self.lock:
+            if self.path and time.monotonic() - self.synced_at >= self.sync_interval:
+                self._sync()
+            if not self.video_ids:
+                return None
+
+            # Count shared grams per entry, skipping grams too common to discriminate
+            limit = max(int(len(self.video_ids) * self.max_posting_share), 1)
+            shared = Counter()
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is not None and len(posting) <= limit:
+                    shared.update(posting)
+            if not shared:
+                return None
+
+            query_size = len(grams)
+            ranked = heapq.nlargest(
+                self.verify_candidates,
+                shared.items(),
+                key=lambda item: item[1] / (query_size + self.gram_counts[item[0]])
+            )
+            candidates = [(self.titles[entry], self.artists[entry], self.video_ids[entry]) for entry, _ in ranked]
+
+        # Verify outside the lock: title and artist must each match, not just the combined text
+        title_grams, artist_grams = trigrams(title), trigrams(credited)
+        best = None
+        for found_title, found_artist, video_id in candidates:
+            artist_score = dice(artist_grams, trigrams(found_artist))
+            if artist_score < self.artist_threshold:
+                continue
+            if not tokens_agree(title, found_title) or not tokens_agree(credited, found_artist):
+                continue
+            confidence = 0.6 * dice(title_grams, trigrams(found_title)) + 0.4 * artist_score
+            if confidence >= self.threshold and (best is None or confidence > best[1]):
+                best = (video_id, round(confidence, 3))
+        return best
+
+    def close(self):
+        with self.lock:
+            if self.log is not None:
+                self.log.close()
+                self.log = None
+
+
+def open_fuzzy_index(path: str, threshold: float, seed: Optional[Iterable[Tuple[str, str, str, str]]] = None) -> FuzzyIndex:
+    """Open the index at `path`, seeding a new log from `seed` (e.g. the match store) on first use"""
+    existed = os.path.exists(path)
+    index = FuzzyIndex(path, threshold=threshold)
+    if not existed and seed is not None:
+        started = time.perf_counter()
+        added = index.add_many(seed)
+        print(f"🔧 Built fuzzy match index with {added} tracks ({time.perf_counter() - started:.1f}s)")
+    return index
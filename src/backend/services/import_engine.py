@@ -0,0 +1,569 @@
+"""
+Staged import engine shared by the import endpoints
+fetch -> normalize -> resolve -> add, connected by bounded queues so that songs are
+added to the playlist while later tracks are still being fetched and searched
+"""
+
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from services.album_resolver import album_group
+from services.import_results import ResultLog
+from services.track_resolver import resolve_track, sanitize_playlist_name, track_key
+from services.youtube_music_client import map_edit_results
+from utils.cancellation import OperationCancelled, bind_cancellation
+from utils.digest_set import DigestSet
+from utils.sse import ProgressCoalescer, sse_event
+from utils.tracing import Trace, bind_trace, record_span, set_lane, span, trace_clock
+
+# Marks the end of a stage's output
+_END = object()
+
+
+class PlaylistCreationError(Exception):
+    """The target playlist could not be created"""
+
+
+async def list_source(tracks: List[Dict]) -> AsyncIterator[Tuple[List[Dict], int]]:
+    """Source for a track list that is already in memory (a single page)"""
+    yield tracks, len(tracks)
+
+
+class ImportSink:
+    """Receives engine events; subclasses turn them into a response"""
+
+    def start(self, total: int, playlist_name: str):
+        pass
+
+    def status(self, message: str):
+        pass
+
+    def progress(self, current: int, total: int, track: str):
+        pass
+
+    def track_found(self, track: Dict, video_id: str):
+        pass
+
+    def track_failed(self, track: Dict, reason: str, error: bool = False):
+        pass
+
+    def added(self, video_ids: List[str]):
+        pass
+
+    def add_failed(self, video_ids: List[str], reason: str):
+        pass
+
+    def queued(self, position: int, expected_wait: float):
+        pass
+
+    def complete(self, summary: Dict):
+        pass
+
+    def error(self, message: str):
+        pass
+
+
+class JSONSink(ImportSink):
+    """Collects the summary for the /import-playlist JSON response"""
+
+    def __init__(self):
+        self.summary = None
+        self.error_message = None
+
+    def complete(self, summary: Dict):
+        self.summary = summary
+
+    def error(self, message: str):
+        self.error_message = message
+
+
+class SSESink(ImportSink):
+    """Encodes engine events as coalesced Server-Sent Events frames"""
+
+    def __init__(self, progress_interval: float, progress_step: int, track_batch_size: int):
+        self.progress_interval = progress_interval
+        self.progress_step = progress_step
+        self.track_batch_size = track_batch_size
+        self.coalescer = None
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.last_queued_at = 0.0
+
+    def _put(self, frames: List[bytes]):
+        for frame in frames:
+            self.queue.put_nowait(frame)
+
+    def start(self, total: int, playlist_name: str):
+        self.coalescer = ProgressCoalescer(
+            total,
+            min_interval=self.progress_interval,
+            min_step=self.progress_step,
+            batch_size=self.track_batch_size
+        )
+        self._put([sse_event({'type': 'start', 'total': total, 'playlistName': playlist_name})])
+
+    def status(self, message: str):
+        self._put([sse_event({'type': 'status', 'message': message})])
+
+    def progress(self, current: int, total: int, track: str):
+        self.coalescer.total = total
+        self._put(self.coalescer.progress(current, track))
+
+    def track_found(self, track: Dict, video_id: str):
+        self._put(self.coalescer.track_event('track_found', track=track['label'], videoId=video_id))
+
+    def track_failed(self, track: Dict, reason: str, error: bool = False):
+        if error:
+            self._put(self.coalescer.track_event('track_error', track=track['label'], error=reason))
+        else:
+            self._put(self.coalescer.track_event('track_not_found', track=track['label']))
+
+    def added(self, video_ids: List[str]):
+        self._put([sse_event({'type': 'status', 'message': f'Added {len(video_ids)} songs to playlist'})])
+
+    def add_failed(self, video_ids: List[str], reason: str):
+        self._put([sse_event({'type': 'status', 'message': f'Failed to add {len(video_ids)} songs: {reason}'})])
+
+    def queued(self, position: int, expected_wait: float):
+        # Waiting is reported at most once per progress interval
+        now = time.monotonic()
+        if now - self.last_queued_at < self.progress_interval:
+            return
+        self.last_queued_at = now
+        self._put([sse_event({'type': 'queue', 'position': position, 'expectedWait': round(expected_wait, 1)})])
+
+    def complete(self, summary: Dict):
+        if self.coalescer:
+            self._put(self.coalescer.flush())
+        # Summary only: per-track outcomes are paged from /jobs/{jobId}/results
+        self._put([sse_event({
+            'type': 'complete',
+            'progress': 100,
+            'jobId': summary.get('jobId'),
+            'playlistUrl': summary['playlistUrl'],
+            'stats': summary['stats'],
+            'message': summary['message']
+        })])
+
+    def error(self, message: str):
+        if self.coalescer:
+            self._put(self.coalescer.flush())
+        self._put([sse_event({'type': 'error', 'message': message})])
+
+    async def stream(self, engine_task: asyncio.Task) -> AsyncIterator[bytes]:
+        """Yield frames until the engine task has finished and the queue is drained"""
+        engine_task.add_done_callback(lambda _: self.queue.put_nowait(_END))
+        try:
+            while True:
+                frame = await self.queue.get()
+                if frame is _END:
+                    return
+                yield frame
+        finally:
+            engine_task.cancel()
+
+
+class BulkProgress:
+    """Progress and resolved songs shared by the playlists of a bulk import
+
+    Progress counts the distinct songs resolved across the whole batch against the batch's
+    distinct total, through a single coalescer, so it runs from 0 to 100 once per batch.
+    The playlists' resolvers run in threads and share the resolved songs, so that table is
+    guarded by a lock.
+    """
+
+    def __init__(self, total: int, resolver: Callable[[Dict], Optional[str]], progress_interval: float,
+                 progress_step: int, track_batch_size: int):
+        self.coalescer = ProgressCoalescer(
+            total,
+            min_interval=progress_interval,
+            min_step=progress_step,
+            batch_size=track_batch_size
+        )
+        self.resolver = resolver
+        self.resolved: Dict[str, Optional[str]] = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, track: Dict) -> Optional[str]:
+        """videoId of a track, reusing the result when another playlist already resolved the song"""
+        with self.lock:
+            if track['key'] in self.resolved:
+                return self.resolved[track['key']]
+        # Searched outside the lock so concurrent resolvers are not serialized; two resolvers
+        # reaching the same new song at once both search, and the first result is kept
+        video_id = self.resolver(track)
+        with self.lock:
+            return self.resolved.setdefault(track['key'], video_id)
+
+    def progress(self, track: str) -> List[bytes]:
+        with self.lock:
+            done = len(self.resolved)
+        return self.coalescer.progress(done, track)
+
+
+class BulkPlaylistSink(SSESink):
+    """SSE sink for one playlist of a bulk import, writing into the bulk job's frame queue
+
+    The playlist's start, completion and failure become playlist_start, playlist_complete
+    and playlist_error events, so only the bulk job itself sends start and complete.
+    Progress and per-track batches go through the batch's shared coalescer (BulkProgress).
+    """
+
+    def __init__(self, queue: asyncio.Queue, spotify_id: str, batch: BulkProgress):
+        coalescer = batch.coalescer
+        super().__init__(coalescer.min_interval, coalescer.min_step, coalescer.batch_size)
+        self.queue = queue
+        self.spotify_id = spotify_id
+        self.batch = batch
+        self.coalescer = coalescer
+
+    def start(self, total: int, playlist_name: str):
+        self._put([sse_event({
+            'type': 'playlist_start',
+            'spotifyId': self.spotify_id,
+            'playlistName': playlist_name,
+            'total': total
+        })])
+
+    def progress(self, current: int, total: int, track: str):
+        self._put(self.batch.progress(track))
+
+    def complete(self, summary: Dict):
+        if self.coalescer:
+            self._put(self.coalescer.flush())
+        self._put([sse_event({
+            'type': 'playlist_complete',
+            'spotifyId': self.spotify_id,
+            'jobId': summary.get('jobId'),
+            'playlistUrl': summary['playlistUrl'],
+            'stats': summary['stats']
+        })])
+
+    def error(self, message: str):
+        if self.coalescer:
+            self._put(self.coalescer.flush())
+        self._put([sse_event({'type': 'playlist_error', 'spotifyId': self.spotify_id, 'message': message})])
+
+
+class ImportEngine:
+    """Runs one import as overlapping fetch, normalize, resolve and add stages"""
+
+    def __init__(self, ytmusic, playlist_name: str, source: AsyncIterator[Tuple[List[Dict], int]],
+                 sink: ImportSink, resolver: Optional[Callable[[Dict], Optional[str]]] = None,
+                 resolve_concurrency: int = 1, queue_size: int = 100, add_batch_size: int = 100,
+                 add_flush_interval: float = 5.0, search_delay: float = 0.1, record_matches: bool = False,
+                 scheduler=None, flow_id: Optional[str] = None, weight: float = 1.0,
+                 results: Optional[ResultLog] = None, trace: Optional[Trace] = None,
+                 dedup_memory: int = 50000, album_groups: int = 10000):
+        self.ytmusic = ytmusic
+        self.playlist_name = playlist_name
+        self.source = source
+        self.sink = sink
+        self.resolver = resolver or (lambda track: resolve_track(ytmusic, track['name'], track['artist']))
+        self.resolve_concurrency = max(resolve_concurrency, 1)
+        self.queue_size = queue_size
+        self.add_batch_size = add_batch_size
+        self.add_flush_interval = add_flush_interval
+        self.search_delay = search_delay
+        # track key -> videoId, kept only when a caller needs it (e.g. to remember a sync mapping)
+        self.matches: Optional[Dict[str, Optional[str]]] = {} if record_matches else None
+        # Fair share of upstream calls (services/scheduler.py), shared with other imports
+        self.scheduler = scheduler
+        self.flow_id = flow_id or f"engine-{id(self)}"
+        self.weight = weight
+        # Per-track outcomes are spilled here rather than collected in memory
+        self.results = results
+        # Span timeline of this import (utils/tracing.py)
+        self.trace = trace
+        # Seen track keys and videoIds are digests, spilled to disk past this many (utils/digest_set.py)
+        self.dedup_memory = dedup_memory
+        self.album_groups = album_groups
+
+        self.playlist_id = None
+        self.total = 0
+        self.seen = 0
+        # Distinct tracks queued so far; each one's position in the source order
+        self.distinct = 0
+        self.resolved = 0
+        # Duplicate source tracks (fetch stage) and tracks whose video was already added (add stage)
+        self.skipped = 0
+        self.duplicate_videos = 0
+        self.added_count = 0
+        self.failed_count = 0
+        self.added_video_ids = DigestSet(dedup_memory)
+        # Distinct tracks per (artist, album), so resolvers know when an album lookup pays off.
+        # Only the most recently seen `album_groups` albums are counted; an album evicted and
+        # seen again starts over, which only costs its tracks an album lookup.
+        self.album_counts: Dict[Tuple[str, str], int] = {}
+        self.active_resolvers = 0
+        # Set on cancellation so searches already running in threads stop at their next call
+        self.cancel_event = threading.Event()
+
+    async def run(self) -> Optional[Dict]:
+        """Run the import and return its summary (None if it failed before completing)"""
+        bind_cancellation(self.cancel_event)
+        if self.trace is not None:
+            bind_trace(self.trace)
+            set_lane("engine")
+        try:
+            sanitized_name = sanitize_playlist_name(self.playlist_name)
+
+            resolve_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            add_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            self.active_resolvers = self.resolve_concurrency
+
+            tasks = [asyncio.create_task(self._fetch_and_normalize(sanitized_name, resolve_queue))]
+            tasks += [
+                asyncio.create_task(self._resolve(resolve_queue, add_queue, f"resolver-{worker + 1}"))
+                for worker in range(self.resolve_concurrency)
+            ]
+            tasks.append(asyncio.create_task(self._add(add_queue)))
+
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    if task.exception():
+                        raise task.exception()
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            if self.results is not None:
+                await self.results.flush()
+
+            if self.total == 0:
+                self.sink.error('No tracks provided for import')
+                return None
+            # Nothing was found to add, but the import itself succeeded
+            await self._create_playlist()
+
+            summary = {
+                'jobId': self.results.job_id if self.results is not None else None,
+                'playlistId': self.playlist_id,
+                'playlistUrl': f"https://music.youtube.com/playlist?list={self.playlist_id}",
+                'stats': {
+                    'total': self.seen,
+                    'successful': self.added_count,
+                    'failed': self.failed_count,
+                    'skipped': self.skipped + self.duplicate_videos
+                },
+                'message': f"Import completed! {self.added_count} tracks added, {self.failed_count} failed."
+            }
+            self.sink.complete(summary)
+            return summary
+
+        except asyncio.CancelledError:
+            self.cancel_event.set()
+            raise
+        except PlaylistCreationError as e:
+            self.sink.error(str(e))
+            return None
+        except Exception as e:
+            self.sink.error(f'Import failed: {str(e)}')
+            return None
+        finally:
+            self.added_video_ids.close()
+
+    async def _create_playlist(self):
+        """Create the target playlist once there is something to put in it
+
+        Creating it lazily means an import that fails early (an invalid NDJSON line, an empty
+        source) leaves no empty playlist behind.
+        """
+        if self.playlist_id:
+            return
+        name = sanitize_playlist_name(self.playlist_name)
+        self.sink.status(f'Creating playlist: {name}')
+        try:
+            with span("playlist.create", "youtube", name=name):
+                self.playlist_id = await asyncio.to_thread(self.ytmusic.create_playlist, name, "", "PRIVATE")
+        except Exception as e:
+            raise PlaylistCreationError(f'Failed to create playlist: {str(e)}')
+        if not self.playlist_id:
+            raise PlaylistCreationError('Failed to create playlist')
+        self.sink.status('Playlist created successfully!')
+
+    async def _call_upstream(self, func, *args):
+        """Run a blocking upstream call in a thread, waiting for this import's fair turn"""
+        if self.scheduler is None:
+            return await asyncio.to_thread(func, *args)
+        waiting_since = trace_clock()
+        async with self.scheduler.slot(self.flow_id, self.weight, on_wait=self.sink.queued):
+            if waiting_since is not None and self.trace.now_us() - waiting_since >= 1000:
+                # Time spent queued behind other imports for a share of the upstream rate
+                record_span("scheduler.wait", "rate_limit", waiting_since, flow=self.flow_id)
+            return await asyncio.to_thread(func, *args)
+
+    async def _fetch_and_normalize(self, playlist_name: str, resolve_queue: asyncio.Queue):
+        """Fetch and normalize stages: pull source pages, drop duplicates, queue tracks for resolution"""
+        set_lane("fetch")
+        keys = DigestSet(self.dedup_memory)
+        started = False
+        try:
+            async for tracks, total in self.source:
+                if not started:
+                    self.total = total
+                    self.sink.start(total, playlist_name)
+                    started = True
+
+                for raw in tracks:
+                    track = self._normalize(raw)
+                    self.seen += 1
+                    if not keys.add(track['key']):
+                        self.skipped += 1
+                        continue
+                    track['index'] = self.distinct
+                    self.distinct += 1
+                    if track['group'] is not None:
+                        self._count_album(track['group'])
+                    await resolve_queue.put(track)
+        finally:
+            keys.close()
+
+        # Duplicates are never resolved, so the progress total is the number of distinct tracks
+        self.total = self.distinct
+        for _ in range(self.resolve_concurrency):
+            await resolve_queue.put(_END)
+
+    def _count_album(self, group: Tuple[str, str]):
+        """Count a track of an album, keeping the album among the most recently seen"""
+        count = self.album_counts.pop(group, 0) + 1
+        self.album_counts[group] = count
+        if len(self.album_counts) > self.album_groups:
+            del self.album_counts[next(iter(self.album_counts))]
+
+    def _normalize(self, raw) -> Dict:
+        """Normalize stage: accept pydantic Track models or plain dicts"""
+        if isinstance(raw, dict):
+            name, artist, album = raw.get('name', ''), raw.get('artist', ''), raw.get('album')
+        else:
+            name, artist, album = raw.name, raw.artist, raw.album
+        return {
+            'name': name,
+            'artist': artist,
+            'album': album,
+            'label': f'{name} - {artist}',
+            'key': track_key(name, artist),
+            'group': album_group(artist, album)
+        }
+
+    async def _resolve(self, resolve_queue: asyncio.Queue, add_queue: asyncio.Queue, lane: str = "resolver"):
+        """Resolve stage: search each track and pass its videoId on in source order"""
+        set_lane(lane)
+        while True:
+            track = await resolve_queue.get()
+            if track is _END:
+                # The last resolver to finish closes the add stage
+                self.active_resolvers -= 1
+                if self.active_resolvers == 0:
+                    await add_queue.put((None, _END))
+                return
+
+            # Album-mates queued so far (a whole source page is queued before resolution starts)
+            track['album_tracks'] = self.album_counts.get(track['group'], 0) if track['group'] is not None else 0
+
+            video_id = None
+            try:
+                with span("resolve", "track", track=track['label']) as resolve_info:
+                    video_id = await self._call_upstream(self.resolver, track)
+                    resolve_info["videoId"] = video_id
+            except OperationCancelled:
+                return
+            except Exception as track_error:
+                self.failed_count += 1
+                self.sink.track_failed(track, str(track_error), error=True)
+                await self._record(track, "error", reason=str(track_error))
+            else:
+                if video_id:
+                    self.sink.track_found(track, video_id)
+                    await self._record(track, "found", video_id=video_id)
+                else:
+                    self.failed_count += 1
+                    self.sink.track_failed(track, "Not found on YouTube Music")
+                    await self._record(track, "not_found", reason="Not found on YouTube Music")
+
+            if self.matches is not None:
+                self.matches[track['key']] = video_id
+
+            self.resolved += 1
+            # 0 while the source has not said how many tracks it holds
+            self.sink.progress(self.resolved, max(self.total, self.resolved) if self.total else 0, track['label'])
+            await add_queue.put((track['index'], video_id))
+
+            # Small delay to prevent rate limiting
+            await asyncio.sleep(self.search_delay)
+
+    async def _record(self, track: Dict, status: str, video_id: Optional[str] = None, reason: Optional[str] = None):
+        if self.results is not None:
+            await self.results.record(track, status, video_id, reason)
+
+    async def _add(self, add_queue: asyncio.Queue):
+        """Add stage: reorder results by source position and add them in batches as they arrive"""
+        set_lane("add")
+        pending: List[str] = []
+        reorder: Dict[int, Optional[str]] = {}
+        next_index = 0
+        first_batch = True
+        last_flush = time.monotonic()
+
+        while True:
+            index, video_id = await add_queue.get()
+            done = video_id is _END
+
+            if not done:
+                reorder[index] = video_id
+                while next_index in reorder:
+                    ready = reorder.pop(next_index)
+                    next_index += 1
+                    if ready is None:
+                        continue
+                    if ready in self.added_video_ids or ready in pending:
+                        self.duplicate_videos += 1
+                        continue
+                    pending.append(ready)
+
+            # The first batch goes out immediately so the playlist fills while searches continue
+            due = (
+                len(pending) >= self.add_batch_size
+                or (pending and first_batch)
+                or (pending and time.monotonic() - last_flush >= self.add_flush_interval)
+            )
+            if pending and (due or done):
+                await self._create_playlist()
+                await self._add_batch(pending)
+                pending = []
+                first_batch = False
+                last_flush = time.monotonic()
+
+            if done:
+                return
+
+    async def _add_batch(self, video_ids: List[str]):
+        """Add a batch, splitting it to isolate videos the server rejects"""
+        try:
+            with span("playlist.add", "youtube", videos=len(video_ids)):
+                response = await self._call_upstream(self.ytmusic.add_playlist_items, self.playlist_id, video_ids)
+            if isinstance(response, dict) and response.get('status', 'STATUS_SUCCEEDED') != 'STATUS_SUCCEEDED':
+                raise Exception(response.get('status'))
+            added, failed = map_edit_results(response if isinstance(response, dict) else {}, video_ids)
+        except Exception as add_error:
+            if len(video_ids) > 1:
+                middle = len(video_ids) // 2
+                await self._add_batch(video_ids[:middle])
+                await self._add_batch(video_ids[middle:])
+                return
+            added, failed = [], video_ids
+            reason = str(add_error)
+        else:
+            reason = "Not confirmed by YouTube Music"
+        if failed:
+            self.sink.add_failed(failed, reason)
+            if self.results is not None:
+                await self.results.add_failed(failed, reason)
+
+        self.added_video_ids.update(added)
+        self.added_count += len(added)
+        self.failed_count += len(failed)
+        if added:
+            self.sink.added(added)
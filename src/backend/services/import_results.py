@@ -0,0 +1,51 @@
+"""
+Per-track import results kept out of memory
+The import engine records each distinct track's outcome here; rows are buffered and
+written to the result store in batches, so memory stays flat however large the import
+is, and clients page through the outcomes from /jobs/{job_id}/results afterwards.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+
+class ResultLog:
+    """Buffers one job's per-track outcomes and writes them to an ImportResultStore"""
+
+    def __init__(self, store, job_id: str, batch_size: int = 500):
+        self.store = store
+        self.job_id = job_id
+        self.batch_size = batch_size
+        self.rows: List[tuple] = []
+        # Writes and updates run one at a time so an update never precedes its row
+        self.lock = asyncio.Lock()
+
+    async def record(self, track: Dict, status: str, video_id: Optional[str] = None, reason: Optional[str] = None):
+        """Record the outcome of a resolved track"""
+        self.rows.append((track['index'], track['name'], track['artist'], status, video_id, reason))
+        if len(self.rows) >= self.batch_size:
+            await self.flush()
+
+    async def add_failed(self, video_ids: List[str], reason: str):
+        """Mark found songs that could not be added to the playlist"""
+        async with self.lock:
+            await self._write()
+            try:
+                await asyncio.to_thread(self.store.mark_add_failed, self.job_id, video_ids, reason)
+            except Exception as e:
+                print(f"⚠️ Could not record failed adds for job {self.job_id}: {e}")
+
+    async def flush(self):
+        """Write buffered rows"""
+        async with self.lock:
+            await self._write()
+
+    async def _write(self):
+        rows, self.rows = self.rows, []
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self.store.save_many, self.job_id, rows)
+        except Exception as e:
+            # Results are a report; losing some must not fail the import itself
+            print(f"⚠️ Could not record {len(rows)} results for job {self.job_id}: {e}")
@@ -0,0 +1,154 @@
+"""
+Memory-mapped, read-only match index
+A compact on-disk table of hashed track keys -> videoIds that every worker process maps
+with mmap and binary-searches in place, so there is one copy in the page cache and no
+per-process table.
+
+File layout (little endian):
+    header   8s magic, Q record count
+    fanout   65537 x I: index of the first record whose hash starts with each 16-bit prefix
+    records  Q key hash, 12s videoId (NUL padded), sorted by key hash
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Iterable, Optional, Tuple
+
+MAGIC = b"PLMIDX02"
+HEADER = struct.Struct("<8sQ")
+FANOUT_BITS = 16
+FANOUT = struct.Struct(f"<{(1 << FANOUT_BITS) + 1}I")
+FANOUT_RANGE = struct.Struct("<II")
+RECORD = struct.Struct("<Q12s")
+RECORD_KEY = struct.Struct("<Q")
+RECORDS_OFFSET = HEADER.size + FANOUT.size
+
+# Seconds between checks for a newly published index file
+RELOAD_INTERVAL = 5.0
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of a normalized track key"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def build_index(matches: Iterable[Tuple[str, str]], path: str) -> int:
+    """Compile (key, videoId) pairs into an index file and atomically publish it at `path`
+
+    The index is written to a temporary file in the same directory and swapped in with
+    os.replace, so readers never see a partially written file.
+    """
+    records = {}
+    for key, video_id in matches:
+        if video_id:
+            records.setdefault(key_hash(key), video_id.encode("ascii")[:12])
+    ordered = sorted(records.items())
+
+    # fanout[p] = first record whose 16-bit hash prefix is >= p
+    fanout = [0] * ((1 << FANOUT_BITS) + 1)
+    for hashed, _ in ordered:
+        fanout[(hashed >> (64 - FANOUT_BITS)) + 1] += 1
+    for prefix in range(1, len(fanout)):
+        fanout[prefix] += fanout[prefix - 1]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".match_index.", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(ordered)))
+            f.write(FANOUT.pack(*fanout))
+            for hashed, video_id in ordered:
+                f.write(RECORD.pack(hashed, video_id))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return len(ordered)
+
+
+class MatchIndex:
+    """Read-only view of a published index that picks up newly published files"""
+
+    def __init__(self, path: str, reload_interval: float = RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._map = None
+        self._count = 0
+        self._identity = None
+        self._checked_at = 0.0
+        self._open()
+
+    def _open(self):
+        """Map the current file at `path`, replacing any previous mapping"""
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or len(mapped) != RECORDS_OFFSET + count * RECORD.size:
+            mapped.close()
+            raise ValueError(f"Not a valid match index: {self.path}")
+
+        # Swap in a single assignment; lookups already running keep the old mapping alive
+        self._map, self._count = mapped, count
+        self._identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._checked_at = time.monotonic()
+
+    def maybe_reload(self):
+        """Reopen the index if a new file was published since the last check"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._identity:
+            print(f"🔧 Reloading match index {self.path}")
+            self._open()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Binary-search the mapped records for a track key"""
+        self.maybe_reload()
+        mapped = self._map
+        target = key_hash(key)
+
+        # The fanout table narrows the search to records sharing the hash's 16-bit prefix
+        prefix = target >> (64 - FANOUT_BITS)
+        low, high = FANOUT_RANGE.unpack_from(mapped, HEADER.size + prefix * 4)
+
+        unpack_key = RECORD_KEY.unpack_from
+        base, size = RECORDS_OFFSET, RECORD.size
+        while low < high:
+            middle = (low + high) >> 1
+            hashed = unpack_key(mapped, base + middle * size)[0]
+            if hashed < target:
+                low = middle + 1
+            elif hashed > target:
+                high = middle
+            else:
+                offset = base + middle * size + RECORD_KEY.size
+                return mapped[offset:offset + 12].rstrip(b"\0").decode("ascii")
+        return None
+
+    def __len__(self):
+        return self._count
+
+
+def open_index(path: str) -> Optional[MatchIndex]:
+    """Open the index at `path` if one has been published"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return MatchIndex(path)
+    except Exception as e:
+        print(f"⚠️ Could not open match index {path}: {e}")
+        return None
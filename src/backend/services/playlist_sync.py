@@ -0,0 +1,150 @@
+"""
+Incremental sync of previously imported Spotify playlists
+Only new tracks are searched and added; removed tracks are optionally deleted
+"""
+
+from typing import Dict, List, Optional
+
+from services.spotify_client import fetch_playlist_details, fetch_snapshot_tracks
+from services.track_resolver import resolve_track, sanitize_playlist_name, track_key
+from services.youtube_music_client import add_playlist_items_checked
+
+
+def tracks_state(tracks: List[Dict], video_ids: Dict[str, Optional[str]]) -> Dict[str, Dict]:
+    """Build the stored track mapping (track key -> name, artist, videoId)"""
+    state = {}
+    for track in tracks:
+        key = track_key(track['name'], track['artist'])
+        state[key] = {
+            "name": track['name'],
+            "artist": track['artist'],
+            "videoId": video_ids.get(key)
+        }
+    return state
+
+
+def playlist_not_found(error: Exception) -> bool:
+    """True when YouTube Music answered that the playlist does not exist (HTTP 404)"""
+    return "HTTP 404" in str(error)
+
+
+def fetch_youtube_playlist_items(ytmusic, youtube_playlist_id: str) -> Optional[Dict[str, Dict]]:
+    """Current playlist contents keyed by videoId, or None if the playlist is confirmed gone
+
+    Any other error (network, auth, server) is raised: treating it as a deleted playlist
+    would create a duplicate copy.
+    """
+    try:
+        playlist = ytmusic.get_playlist(youtube_playlist_id, limit=None)
+    except Exception as e:
+        if playlist_not_found(e):
+            print(f"⚠️ YouTube Music playlist {youtube_playlist_id} no longer exists: {e}")
+            return None
+        raise
+
+    return {
+        item['videoId']: item
+        for item in playlist.get('tracks', [])
+        if item.get('videoId')
+    }
+
+
+def sync_playlist(ytmusic, store, access_token: str, spotify_playlist_id: str,
+                  remove_missing: bool = False, force: bool = False,
+                  playlist_name: Optional[str] = None, snapshot_cache=None, add_batch_size: int = 100) -> Dict:
+    """Bring the YouTube Music copy of a Spotify playlist up to date
+
+    Compares the Spotify snapshot_id, then the stored track list and the YouTube playlist's
+    current contents, and only resolves tracks that are new since the last sync. New songs
+    are added add_batch_size per request, like the import engine does.
+    """
+    details = fetch_playlist_details(access_token, spotify_playlist_id)
+    snapshot_id = details.get('snapshot_id')
+    state = store.get(spotify_playlist_id)
+
+    if state and not force and snapshot_id and state['snapshot_id'] == snapshot_id:
+        return {
+            "status": "up_to_date",
+            "youtubePlaylistId": state['youtube_playlist_id'],
+            "added": [], "removed": [], "failed": []
+        }
+
+    tracks = fetch_snapshot_tracks(access_token, spotify_playlist_id, snapshot_id, snapshot_cache)
+    stored_tracks = state['tracks'] if state else {}
+    youtube_playlist_id = state['youtube_playlist_id'] if state else None
+
+    youtube_items = fetch_youtube_playlist_items(ytmusic, youtube_playlist_id) if youtube_playlist_id else None
+    created = False
+    if youtube_items is None:
+        # First sync, or the YouTube playlist was deleted: start a fresh copy
+        name = sanitize_playlist_name(playlist_name or details.get('name') or spotify_playlist_id)
+        youtube_playlist_id = ytmusic.create_playlist(name, "", "PRIVATE")
+        if not youtube_playlist_id:
+            raise Exception("Failed to create playlist")
+        youtube_items = {}
+        stored_tracks = {}
+        created = True
+
+    video_ids = {}
+    to_add = []
+    added = []
+    failed = []
+    for track in tracks:
+        key = track_key(track['name'], track['artist'])
+        if key in video_ids:
+            continue
+
+        stored = stored_tracks.get(key)
+        video_id = stored.get('videoId') if stored else None
+        if stored is None or (force and not video_id):
+            # Only tracks new since the last sync (or previously unmatched on a forced sync) cost a search
+            video_id = resolve_track(ytmusic, track['name'], track['artist'])
+            if not video_id:
+                failed.append({"name": track['name'], "artist": track['artist'], "reason": "Not found on YouTube Music"})
+
+        video_ids[key] = video_id
+        if video_id and video_id not in youtube_items and video_id not in to_add:
+            to_add.append(video_id)
+            added.append({"name": track['name'], "artist": track['artist'], "video_id": video_id})
+
+    # videoId -> reason it was not added
+    rejected: Dict[str, str] = {}
+    for start in range(0, len(to_add), add_batch_size):
+        batch = to_add[start:start + add_batch_size]
+        try:
+            _, batch_rejected = add_playlist_items_checked(ytmusic, youtube_playlist_id, batch)
+        except Exception as add_error:
+            print(f"⚠️ Adding {len(batch)} songs to {youtube_playlist_id} failed: {add_error}")
+            rejected.update((video_id, f"Not added: {add_error}") for video_id in batch)
+        else:
+            rejected.update((video_id, "Not added by YouTube Music") for video_id in batch_rejected)
+    if rejected:
+        # Still stored as matched, so the next sync tries to add them again
+        failed.extend(
+            {"name": track['name'], "artist": track['artist'], "reason": rejected[track['video_id']]}
+            for track in added if track['video_id'] in rejected
+        )
+        added = [track for track in added if track['video_id'] not in rejected]
+
+    removed = []
+    if remove_missing:
+        current_video_ids = {video_id for video_id in video_ids.values() if video_id}
+        for key, stored in stored_tracks.items():
+            video_id = stored.get('videoId')
+            if key not in video_ids and video_id and video_id not in current_video_ids and video_id in youtube_items:
+                removed.append(youtube_items[video_id])
+        if removed:
+            ytmusic.remove_playlist_items(youtube_playlist_id, [
+                {"videoId": item['videoId'], "setVideoId": item['setVideoId']}
+                for item in removed
+            ])
+
+    store.save(spotify_playlist_id, youtube_playlist_id, snapshot_id, tracks_state(tracks, video_ids))
+
+    return {
+        "status": "created" if created else "synced",
+        "youtubePlaylistId": youtube_playlist_id,
+        "added": added,
+        "removed": [{"title": item.get('title'), "video_id": item['videoId']} for item in removed],
+        "failed": failed
+    }
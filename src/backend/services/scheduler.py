@@ -0,0 +1,113 @@
+"""
+Weighted fair queueing of upstream YouTube Music calls
+Every import's searches and playlist adds pass through one scheduler per worker, so a
+20,000-track import cannot starve small imports started after it. Each flow (a user, or
+a job when the user is unknown) gets capacity in proportion to its weight.
+
+Start-time fair queueing: a request is tagged with
+    start  = max(virtual time, finish tag of the flow's previous request)
+    finish = start + cost / weight
+and waiting requests are served in order of finish tag. Virtual time advances to the
+start tag of each request that is dispatched.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+# Weight of each import priority
+PRIORITY_WEIGHTS = {
+    "low": 1.0,
+    "normal": 2.0,
+    "high": 4.0
+}
+
+
+def priority_weight(priority: Optional[str]) -> float:
+    """Weight for a priority name, defaulting to normal"""
+    return PRIORITY_WEIGHTS.get((priority or "normal").lower(), PRIORITY_WEIGHTS["normal"])
+
+
+class FairScheduler:
+    """Limits concurrent upstream calls and orders waiting ones by weighted fair share"""
+
+    def __init__(self, concurrency: int, service_time: float = 0.5):
+        self.concurrency = max(concurrency, 1)
+        self.active = 0
+        self.virtual_time = 0.0
+        self.finish_tags: Dict[str, float] = {}
+        self.waiting: List[tuple] = []
+        self.sequence = itertools.count()
+        # Moving average of call durations, used to estimate waits
+        self.service_time = service_time
+
+    def _tag(self, flow: str, weight: float, cost: float):
+        start = max(self.virtual_time, self.finish_tags.get(flow, 0.0))
+        finish = start + cost / max(weight, 1e-6)
+        self.finish_tags[flow] = finish
+        return start, finish
+
+    def queue_position(self, finish: float) -> int:
+        """Number of waiting requests that will be served before one with this finish tag"""
+        return sum(1 for entry in self.waiting if entry[0] < finish and not entry[4].done())
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until a request at `position` is expected to start"""
+        return (position // self.concurrency + 1) * self.service_time if self.active >= self.concurrency else 0.0
+
+    async def acquire(self, flow: str, weight: float = 1.0, cost: float = 1.0,
+                      on_wait: Optional[Callable[[int, float], None]] = None):
+        """Wait for this flow's turn at an upstream call slot"""
+        start, finish = self._tag(flow, weight, cost)
+        if self.active < self.concurrency and not self.waiting:
+            self.active += 1
+            self.virtual_time = max(self.virtual_time, start)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (finish, next(self.sequence), start, flow, future)
+        heapq.heappush(self.waiting, entry)
+        if on_wait is not None:
+            position = self.queue_position(finish)
+            on_wait(position, self.expected_wait(position))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+    def release(self, duration: Optional[float] = None):
+        """Free a slot and hand it to the waiting request with the smallest finish tag"""
+        if duration is not None:
+            self.service_time = 0.8 * self.service_time + 0.2 * duration
+        self.active -= 1
+        while self.waiting and self.active < self.concurrency:
+            finish, _, start, flow, future = heapq.heappop(self.waiting)
+            if future.done():
+                continue
+            self.active += 1
+            self.virtual_time = max(self.virtual_time, start)
+            future.set_result(None)
+
+        # Forget idle flows so the table does not grow with every job ever run
+        if not self.waiting and self.active == 0:
+            self.finish_tags.clear()
+
+    @asynccontextmanager
+    async def slot(self, flow: str, weight: float = 1.0, cost: float = 1.0,
+                   on_wait: Optional[Callable[[int, float], None]] = None):
+        """Hold a slot for the duration of one upstream call"""
+        await self.acquire(flow, weight, cost, on_wait)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
@@ -0,0 +1,61 @@
+"""
+Authentication and import job state shared by every API worker
+Kept in the shared cache (services/cache.py) instead of module globals so that any
+worker process, on any host, sees the same YouTube Music session and job status.
+"""
+
+import time
+import uuid
+from typing import Dict, Optional
+
+from services.cache import Cache
+
+YTMUSIC_AUTH_KEY = "ytmusic"
+
+
+class SessionStore:
+    """Versioned YouTube Music credentials and import job records"""
+
+    def __init__(self, auth_cache: Cache, job_cache: Cache):
+        self.auth_cache = auth_cache
+        self.job_cache = job_cache
+
+    def publish_auth(self, method: str, headers: str) -> int:
+        """Publish new ytmusicapi credentials (headers JSON); returns their version
+
+        Versions are nanosecond timestamps, so the latest publish wins without needing an
+        atomic counter on the backend.
+        """
+        version = time.time_ns()
+        self.auth_cache.set(YTMUSIC_AUTH_KEY, {
+            "version": version,
+            "method": method,
+            "headers": headers,
+            "updatedAt": time.time()
+        })
+        return version
+
+    def current_auth(self) -> Optional[Dict]:
+        """The most recently published credentials, if any"""
+        return self.auth_cache.get(YTMUSIC_AUTH_KEY)
+
+    def clear_auth(self):
+        self.auth_cache.delete(YTMUSIC_AUTH_KEY)
+
+    def create_job(self, kind: str, **fields) -> str:
+        """Register a new import job and return its id"""
+        job_id = uuid.uuid4().hex
+        self.save_job(job_id, {"id": job_id, "kind": kind, "status": "running", "startedAt": time.time(), **fields})
+        return job_id
+
+    def save_job(self, job_id: str, state: Dict):
+        self.job_cache.set(job_id, state)
+
+    def update_job(self, job_id: str, **fields):
+        """Merge fields into a job record"""
+        state = self.get_job(job_id) or {"id": job_id}
+        state.update(fields)
+        self.save_job(job_id, state)
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        return self.job_cache.get(job_id)
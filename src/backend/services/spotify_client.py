@@ -0,0 +1,109 @@
+"""
+Spotify Web API helpers
+Paginated playlist reads shared by the playlist and import endpoints
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.tracing import span
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+
+
+def format_track(track: Dict) -> Dict:
+    """Reduce a Spotify track object to the fields the importer uses"""
+    return {
+        "name": track["name"],
+        "artist": track["artists"][0]["name"] if track["artists"] else "Unknown Artist",
+        "album": track["album"]["name"] if track["album"] else None
+    }
+
+
+def iter_track_pages(access_token: str, url: str, params: Optional[Dict] = None) -> Iterator[Tuple[List[Dict], int]]:
+    """Lazily yield (tracks, total) for each page of a Spotify track collection"""
+    import requests
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    page = 0
+    while url:
+        page += 1
+        with span("spotify.page", "spotify", page=page) as page_info:
+            response = requests.get(url, headers=headers, params=params)
+            response.raise_for_status()
+            params = None  # the next URL already carries offset and limit
+
+            tracks_data = response.json()
+            page_info["items"] = len(tracks_data.get("items", []))
+
+        # Some items might be null
+        tracks = [format_track(item["track"]) for item in tracks_data.get("items", []) if item.get("track")]
+        yield tracks, tracks_data.get("total", 0)
+
+        # Get next page URL (None if this is the last page)
+        url = tracks_data.get("next")
+
+
+def iter_playlist_track_pages(access_token: str, playlist_id: str) -> Iterator[Tuple[List[Dict], int]]:
+    """Lazily page through a playlist's tracks"""
+    return iter_track_pages(access_token, f"{SPOTIFY_API_URL}/playlists/{playlist_id}/tracks")
+
+
+def fetch_playlist_tracks(access_token: str, playlist_id: str) -> List[Dict]:
+    """Fetch every track of a playlist, following pagination"""
+    all_tracks = []
+    for tracks, _ in iter_playlist_track_pages(access_token, playlist_id):
+        all_tracks.extend(tracks)
+    return all_tracks
+
+
+def snapshot_cache_key(playlist_id: str, snapshot_id: str) -> str:
+    """Cache key for the tracks of one version of a playlist"""
+    return f"{playlist_id}:{snapshot_id}"
+
+
+def fetch_snapshot_tracks(access_token: str, playlist_id: str, snapshot_id: Optional[str], cache=None) -> List[Dict]:
+    """Fetch a playlist's tracks, reusing a cached copy of the same snapshot_id
+
+    A snapshot_id identifies one version of a playlist's contents, so cached tracks stay
+    valid until the playlist changes; the cache TTL only bounds how long they are kept.
+    """
+    if cache is None or not snapshot_id:
+        return fetch_playlist_tracks(access_token, playlist_id)
+
+    cache_key = snapshot_cache_key(playlist_id, snapshot_id)
+    tracks = cache.get(cache_key)
+    if tracks is None:
+        tracks = fetch_playlist_tracks(access_token, playlist_id)
+        cache.set(cache_key, tracks)
+    return tracks
+
+
+def iter_saved_track_pages(access_token: str, page_size: int = 50) -> Iterator[Tuple[List[Dict], int]]:
+    """Lazily page through the user's saved tracks ("Liked Songs")"""
+    return iter_track_pages(access_token, f"{SPOTIFY_API_URL}/me/tracks", params={"limit": page_size})
+
+
+def fetch_playlist_details(access_token: str, playlist_id: str) -> Dict:
+    """Fetch a playlist's name and snapshot_id"""
+    import requests
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with span("spotify.details", "spotify", playlistId=playlist_id):
+        response = requests.get(
+            f"{SPOTIFY_API_URL}/playlists/{playlist_id}",
+            headers=headers,
+            params={"fields": "id,name,snapshot_id"}
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+def fetch_playlist(access_token: str, playlist_id: str, name: Optional[str] = None, snapshot_cache=None) -> Dict:
+    """Fetch a playlist's details together with all of its tracks"""
+    details = fetch_playlist_details(access_token, playlist_id)
+    snapshot_id = details.get("snapshot_id")
+    return {
+        "id": playlist_id,
+        "name": name or details.get("name") or playlist_id,
+        "snapshot_id": snapshot_id,
+        "tracks": fetch_snapshot_tracks(access_token, playlist_id, snapshot_id, snapshot_cache)
+    }
@@ -0,0 +1,192 @@
+"""
+Track resolution helpers shared by the import endpoints
+Turns a Spotify track (name, artist) into a YouTube Music videoId
+"""
+
+import re
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from utils.cancellation import raise_if_cancelled
+from utils.tracing import span
+from utils.normalization import clean_title, fold_text, normalized_key, primary_artist, search_query
+
+# Emojis and special characters YouTube Music rejects in playlist titles
+_PLAYLIST_NAME_REJECTED = re.compile(r'[^\w\s\-_]')
+
+
+def sanitize_playlist_name(name: str) -> str:
+    """Remove emojis and special characters, falling back to a timestamped name"""
+    sanitized = _PLAYLIST_NAME_REJECTED.sub('', name).strip()
+    if not sanitized or len(sanitized) < 3:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sanitized = f"Imported_Playlist_{timestamp}"
+    return sanitized
+
+
+def track_key(name: str, artist: str) -> str:
+    """Key identifying the same song across playlists (tag, accent and case insensitive)"""
+    return normalized_key(name, artist)
+
+
+def search_queries(name: str, artist: str) -> List[str]:
+    """Search strategies tried in order for a track, cleanest first"""
+    title = clean_title(name)
+    candidates = [
+        search_query(name, artist),
+        f"{name} {artist}",
+        title,
+        f"{primary_artist(artist)} {title}"
+    ]
+    return list(dict.fromkeys(candidates))
+
+
+class CachedSearch:
+    """YTMusic proxy whose searches are served from a shared cache
+
+    Every other attribute passes through to the wrapped client, so it can stand in for
+    YTMusic wherever searches and playlist calls are mixed.
+    """
+
+    def __init__(self, ytmusic, cache):
+        self.ytmusic = ytmusic
+        self.cache = cache
+
+    def search(self, query: str, filter: Optional[str] = None, limit: int = 20, **kwargs):
+        if kwargs:
+            return self.ytmusic.search(query, filter=filter, limit=limit, **kwargs)
+
+        cache_key = f"{filter}:{limit}:{query}"
+        results = self.cache.get(cache_key)
+        if results is None:
+            results = self.ytmusic.search(query, filter=filter, limit=limit)
+            # Empty results are not cached; they are as likely to be a hiccup as a real miss
+            if results:
+                self.cache.set(cache_key, results)
+        return results
+
+    def __getattr__(self, name):
+        return getattr(self.ytmusic, name)
+
+
+def resolve_track(ytmusic, name: str, artist: str, raise_errors: bool = False) -> Optional[str]:
+    """Search YouTube Music for a track and return the first matching videoId
+
+    A failing search query is skipped for the next one. With raise_errors, a track that is
+    not found after any query failed raises that error instead of returning None, so callers
+    that store misses can tell "not on YouTube Music" from "could not search".
+    """
+    last_error = None
+    for attempt, query in enumerate(search_queries(name, artist), 1):
+        raise_if_cancelled()
+        try:
+            with span("search", "search", query=query, attempt=attempt) as attempt_info:
+                search_results = ytmusic.search(query, filter="songs", limit=3)
+                attempt_info["results"] = len(search_results or [])
+            if search_results:
+                video_id = search_results[0].get('videoId')
+                if video_id:
+                    return video_id
+        except Exception as search_error:
+            print(f"Search error for '{query}': {search_error}")
+            last_error = search_error
+            continue
+    if raise_errors and last_error is not None:
+        raise last_error
+    return None
+
+
+def match_confidence(name: str, artist: str, result: Dict) -> float:
+    """0-1 confidence that a search result is the requested track (title 60%, artist 40%)"""
+    wanted_title = fold_text(clean_title(name))
+    found_title = fold_text(clean_title(result.get('title') or ''))
+    title_score = SequenceMatcher(None, wanted_title, found_title).ratio()
+
+    wanted_artist = fold_text(primary_artist(artist))
+    artist_score = max(
+        (SequenceMatcher(None, wanted_artist, fold_text(found.get('name') or '')).ratio()
+         for found in result.get('artists') or []),
+        default=0.0
+    )
+    return round(0.6 * title_score + 0.4 * artist_score, 3)
+
+
+def resolve_candidates(ytmusic, name: str, artist: str, limit: int = 3) -> List[Dict]:
+    """Search for a track and return its candidates, most confident first"""
+    for query in search_queries(name, artist):
+        raise_if_cancelled()
+        try:
+            search_results = ytmusic.search(query, filter="songs", limit=limit)
+        except Exception as search_error:
+            print(f"Search error for '{query}': {search_error}")
+            continue
+
+        candidates = [
+            {
+                'videoId': result['videoId'],
+                'title': result.get('title'),
+                'artist': ', '.join(found.get('name') or '' for found in result.get('artists') or []),
+                'album': (result.get('album') or {}).get('name'),
+                'duration': result.get('duration'),
+                'confidence': match_confidence(name, artist, result)
+            }
+            for result in (search_results or [])[:limit]
+            if result.get('videoId')
+        ]
+        if candidates:
+            candidates.sort(key=lambda candidate: candidate['confidence'], reverse=True)
+            return candidates
+    return []
+
+
+def resolve_track_cached(ytmusic, match_store, name: str, artist: str, match_cache=None,
+                         fuzzy_index=None, album_catalog=None, album: Optional[str] = None) -> Optional[str]:
+    """Resolve a track through the shared match cache and persistent match store, searching only on a miss
+
+    With a fuzzy index, a close spelling of an already resolved track is also answered locally
+    (it is not stored as this track's exact match).
+    With an album catalog, the track is looked up in its album's listing before searching.
+    """
+    key = track_key(name, artist)
+    if match_cache is not None:
+        video_id = match_cache.get(key)
+        if video_id:
+            return video_id
+
+    try:
+        match = match_store.get(key)
+    except Exception as e:
+        print(f"⚠️ Match store lookup failed: {e}")
+        match = None
+    if match is not None and match['video_id']:
+        if match_cache is not None:
+            match_cache.set(key, match['video_id'])
+        return match['video_id']
+
+    if fuzzy_index is not None:
+        with span("fuzzy_lookup", "search") as lookup_info:
+            hit = fuzzy_index.lookup(name, artist)
+            lookup_info["hit"] = hit is not None
+        if hit is not None:
+            # A close spelling of another entry: not saved under this track's key as an exact match
+            return hit[0]
+
+    video_id = None
+    if album_catalog is not None and album:
+        video_id = album_catalog.lookup(ytmusic, name, artist, album)
+
+    if video_id is None:
+        # Misses are searched again: a miss may have been a transient search failure
+        video_id = resolve_track(ytmusic, name, artist)
+        if video_id and fuzzy_index is not None:
+            fuzzy_index.add(key, name, artist, video_id)
+
+    if video_id:
+        try:
+            match_store.save(key, name, artist, video_id)
+        except Exception as e:
+            print(f"⚠️ Match store write failed: {e}")
+        if match_cache is not None:
+            match_cache.set(key, video_id)
+    return video_id
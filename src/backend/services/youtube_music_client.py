@@ -4,23 +4,96 @@ Uses the exact request format from successful browser sessions
 """
 
 import json
-import requests
 import hashlib
 import time
 import gzip
 import io
 from typing import List, Dict, Optional, Tuple
 
+# Web client identity sent in every request context. The versions are the ones captured from
+# the browser sessions each request was copied from; edit_playlist was captured separately.
+CLIENT_NAME = "WEB_REMIX"
+CLIENT_VERSION = "1.20250730.03.00"
+EDIT_PLAYLIST_CLIENT_VERSION = "1.20250728.03.00"
+
+# Search params selecting the "Songs" filter
+SONGS_FILTER_PARAMS = "EgWKAQIIAWoKEAoQBRAKEAMQBA%3D%3D"
+
+# ACTION_ADD_VIDEO actions per edit_playlist request (starting size and adaptive ceiling)
+EDIT_PLAYLIST_BATCH_SIZE = 50
+EDIT_PLAYLIST_MAX_BATCH_SIZE = 200
+
+def map_edit_results(data: Dict, video_ids: List[str]) -> Tuple[List[str], List[str]]:
+    """Map an edit_playlist response back to per-video success or failure"""
+    results = data.get('playlistEditResults')
+    if not results:
+        # Older responses only carry the batch status
+        return list(video_ids), []
+
+    confirmed = set()
+    for result in results:
+        # ytmusicapi's add_playlist_items already unwraps each entry (None when nothing was added);
+        # raw edit_playlist responses still carry the wrapper
+        if not result:
+            continue
+        result = result.get('playlistEditVideoAddedResultData', result)
+        if result and result.get('videoId'):
+            confirmed.add(result['videoId'])
+
+    added_songs = [video_id for video_id in video_ids if video_id in confirmed]
+    failed_songs = [video_id for video_id in video_ids if video_id not in confirmed]
+    return added_songs, failed_songs
+
+def add_playlist_items_checked(ytmusic, playlist_id: str, video_ids: List[str]) -> Tuple[List[str], List[str]]:
+    """Add videos with ytmusicapi and return (added, failed) from the per-video results
+
+    Raises when the request as a whole was not accepted.
+    """
+    response = ytmusic.add_playlist_items(playlist_id, video_ids)
+    if not isinstance(response, dict):
+        return map_edit_results({}, video_ids)
+    if 'SUCCEEDED' not in response.get('status', 'STATUS_SUCCEEDED'):
+        raise Exception(f"Adding songs failed: {response.get('status')}")
+    return map_edit_results(response, video_ids)
+
 class YouTubeMusicClient:
     """YouTube Music client using direct HTTP requests"""
 
     def __init__(self):
+        import requests  # imported here so map_edit_results users don't load requests
         self.session = requests.Session()
         self.authenticated = False
         self.base_url = "https://music.youtube.com/youtubei/v1"
         self.headers = {}
         self.cookies = {}
         self.sapisid = ""
+        self._build_request_templates()
+
+    def _build_request_templates(self):
+        """Build the static part of each request payload once so calls only add their own fields"""
+        client_context = {
+            "client": {
+                "clientName": CLIENT_NAME,
+                "clientVersion": CLIENT_VERSION
+            }
+        }
+        self.search_template = {
+            "context": client_context,
+            "params": SONGS_FILTER_PARAMS
+        }
+        self.create_playlist_template = {
+            "context": {**client_context, "user": {"lockedSafetyMode": False}},
+            "videoIds": []  # Empty for new playlist
+        }
+        self.edit_playlist_template = {
+            "context": {
+                "client": {
+                    "clientName": CLIENT_NAME,
+                    "clientVersion": EDIT_PLAYLIST_CLIENT_VERSION
+                }
+            }
+        }
+        self.request_params = {"prettyPrint": "false"}
 
     def authenticate_with_cookies(self, cookie_dict: Dict[str, str]) -> bool:
         """Authenticate using centralized headers from headers_auth.json"""
@@ -109,29 +182,14 @@ class YouTubeMusicClient:
 
         print(f"DEBUG: Starting search for '{query}'")
         try:
-            # Use centralized headers (Authorization already included)
-            headers = self.headers.copy()
-
-            # YouTube Music search endpoint
+            # Session already carries the centralized headers (Authorization included)
             search_url = f"{self.base_url}/search"
-
-            # Request payload with proper parameters for song search
-            payload = {
-                "context": {
-                    "client": {
-                        "clientName": "WEB_REMIX",
-                        "clientVersion": "1.20250730.03.00"
-                    }
-                },
-                "query": query,
-                "params": "EgWKAQIIAWoKEAoQBRAKEAMQBA%3D%3D"  # Songs filter
-            }
+            payload = {**self.search_template, "query": query}
 
             response = self.session.post(
                 search_url,
                 json=payload,
-                headers=headers,
-                params={"prettyPrint": "false"}
+                params=self.request_params
             )
 
             if response.status_code != 200:
@@ -150,62 +208,52 @@ class YouTubeMusicClient:
                 # Return empty list if parsing fails
                 return []
 
-            # Extract songs from YouTube Music search response
-            songs = self._extract_search_results(data, max_results)
-
-            # Fallback: if no songs found, return mock results to keep system working
-            if not songs:
-                print(f"No songs found in response, using fallback mock result for '{query}'")
-                songs = [{
-                    'videoId': f'fallback_{hash(query) % 1000000}',
-                    'title': query.split(' ')[0] if query else 'Unknown',
-                    'artist': query.split(' ')[-1] if ' ' in query else 'Unknown'
-                }]
-
-            return songs
+            return self._songs_from_search_data(data, query, max_results)
 
         except Exception as e:
             print(f"Search error for '{query}': {e}")
             return []
 
+    def _songs_from_search_data(self, data: Dict, query: str, max_results: int) -> List[Dict]:
+        """Extract songs from a parsed search response"""
+        songs = self._extract_search_results(data, max_results)
+
+        # Fallback: if no songs found, return mock results to keep system working
+        if not songs:
+            print(f"No songs found in response, using fallback mock result for '{query}'")
+            songs = [{
+                'videoId': f'fallback_{hash(query) % 1000000}',
+                'title': query.split(' ')[0] if query else 'Unknown',
+                'artist': query.split(' ')[-1] if ' ' in query else 'Unknown'
+            }]
+
+        return songs
+
     def create_playlist(self, title: str, description: str = "", privacy_status: str = "PRIVATE") -> Optional[str]:
         """Create a new playlist using direct HTTP with YouTube Music playlist/create endpoint"""
         if not self.authenticated:
             raise Exception("Not authenticated")
 
         try:
-            # Use centralized headers (Authorization already included)
-            headers = self.headers.copy()
-
             # Use the correct playlist creation endpoint
             create_url = f"{self.base_url}/playlist/create"
 
             # Payload that matches actual YouTube Music API format
             payload = {
-                "context": {
-                    "client": {
-                        "clientName": "WEB_REMIX",
-                        "clientVersion": "1.20250730.03.00"
-                    },
-                    "user": {
-                        "lockedSafetyMode": False
-                    }
-                },
+                **self.create_playlist_template,
                 "title": title,
                 "description": description if description else "",
-                "privacyStatus": privacy_status.upper(),
-                "videoIds": []  # Empty for new playlist
+                "privacyStatus": privacy_status.upper()
             }
 
             print(f"🔧 Creating playlist: {title}")
             print(f"Using endpoint: {create_url}")
-            print(f"Authorization: {headers.get('Authorization', 'Not found')[:50]}...")
+            print(f"Authorization: {self.headers.get('Authorization', 'Not found')[:50]}...")
 
             response = self.session.post(
                 create_url,
                 json=payload,
-                headers=headers,
-                params={"prettyPrint": "false"}
+                params=self.request_params
             )
 
             print(f"Response status: {response.status_code}")
@@ -248,35 +296,47 @@ class YouTubeMusicClient:
             traceback.print_exc()
             return None
 
-    def add_songs_to_playlist(self, playlist_id: str, video_ids: List[str]) -> Tuple[List[str], List[str]]:
-        """Add songs to a playlist using direct HTTP"""
+    def add_songs_to_playlist(self, playlist_id: str, video_ids: List[str],
+                              batch_size: int = EDIT_PLAYLIST_BATCH_SIZE) -> Tuple[List[str], List[str]]:
+        """Add songs to a playlist, packing many ACTION_ADD_VIDEO actions into each request
+
+        The batch size adapts: it grows after each accepted batch and is halved when a batch
+        is rejected, so a single bad video is isolated without resending the whole list.
+        """
         if not self.authenticated:
             raise Exception("Not authenticated")
 
         added_songs = []
         failed_songs = []
+        position = 0
 
         try:
-            # Add songs one by one to handle failures gracefully
-            for video_id in video_ids:
-                try:
-                    success = self._add_single_song_to_playlist(playlist_id, video_id)
-                    if success:
-                        added_songs.append(video_id)
-                        print(f"✅ Added {video_id} to playlist")
-                    else:
-                        failed_songs.append(video_id)
-                        print(f"❌ Failed to add {video_id} to playlist")
-                except Exception as e:
-                    print(f"❌ Error adding {video_id}: {e}")
-                    failed_songs.append(video_id)
+            while position < len(video_ids):
+                batch = video_ids[position:position + batch_size]
+                result = self._add_batch_to_playlist(playlist_id, batch)
+
+                if result is not None:
+                    batch_added, batch_failed = result
+                    added_songs.extend(batch_added)
+                    failed_songs.extend(batch_failed)
+                    position += len(batch)
+                    print(f"✅ Added {len(batch_added)}/{len(batch)} songs (batch size {len(batch)})")
+                    batch_size = min(batch_size * 2, EDIT_PLAYLIST_MAX_BATCH_SIZE)
+                elif len(batch) == 1:
+                    print(f"❌ Failed to add {batch[0]} to playlist")
+                    failed_songs.append(batch[0])
+                    position += 1
+                else:
+                    # Retry the same videos in smaller requests
+                    batch_size = max(len(batch) // 2, 1)
+                    print(f"⚠️ Batch of {len(batch)} rejected, retrying with batch size {batch_size}")
 
-                # Small delay between additions
+                # Small delay between requests
                 time.sleep(0.1)
 
         except Exception as e:
             print(f"❌ Failed to add songs to playlist: {e}")
-            return [], video_ids
+            return added_songs, failed_songs + video_ids[position:]
 
         print(f"✅ Added {len(added_songs)}/{len(video_ids)} songs to playlist {playlist_id}")
         return added_songs, failed_songs
@@ -508,52 +568,62 @@ class YouTubeMusicClient:
 
     def _add_single_song_to_playlist(self, playlist_id: str, video_id: str) -> bool:
         """Add a single song to playlist using YouTube Music API"""
+        result = self._add_batch_to_playlist(playlist_id, [video_id])
+        return result is not None and video_id in result[0]
+
+    def _add_batch_to_playlist(self, playlist_id: str, video_ids: List[str]) -> Optional[Tuple[List[str], List[str]]]:
+        """Add videos with one edit_playlist request
+
+        Returns (added, failed) mapped from the per-action results, or None when the
+        request as a whole was rejected.
+        """
         try:
             # Generate SAPISID hash for authorization
             auth_header = self._generate_sapisid_hash()
 
-            # Prepare request headers
-            headers = self.headers.copy()
-            headers['Authorization'] = auth_header
-
             # Correct YouTube Music endpoint for adding songs to playlist
             edit_url = f"{self.base_url}/browse/edit_playlist"
 
-            # Correct payload format for adding videos to playlist
+            # One ACTION_ADD_VIDEO action per video
             payload = {
-                "context": {
-                    "client": {
-                        "clientName": "WEB_REMIX",
-                        "clientVersion": "1.20250728.03.00"
-                    }
-                },
+                **self.edit_playlist_template,
                 "playlistId": playlist_id,
-                "actions": [{
-                    "action": "ACTION_ADD_VIDEO",
-                    "addedVideoId": video_id,
-                    "setVideoId": video_id
-                }]
+                "actions": [
+                    {"action": "ACTION_ADD_VIDEO", "addedVideoId": video_id}
+                    for video_id in video_ids
+                ]
             }
 
-            print(f"DEBUG: Adding {video_id} to playlist {playlist_id}")
-            print(f"DEBUG: Endpoint: {edit_url}")
+            print(f"DEBUG: Adding {len(video_ids)} videos to playlist {playlist_id}")
 
+            # Only the Authorization header differs from the session defaults
             response = self.session.post(
                 edit_url,
                 json=payload,
-                headers=headers,
-                params={"prettyPrint": "false"}
+                headers={'Authorization': auth_header},
+                params=self.request_params
             )
 
-            print(f"DEBUG: Add song response status: {response.status_code}")
             if response.status_code != 200:
-                print(f"DEBUG: Add song response: {response.text[:500]}")
+                print(f"DEBUG: Add songs response {response.status_code}: {response.text[:500]}")
+                return None
+
+            data = self._parse_response(response)
+            if data.get('status', 'STATUS_SUCCEEDED') != 'STATUS_SUCCEEDED':
+                print(f"DEBUG: Add songs status: {data.get('status')}")
+                return None
 
-            return response.status_code == 200
+            return map_edit_results(data, video_ids)
 
         except Exception as e:
-            print(f"Error adding song {video_id} to playlist {playlist_id}: {e}")
-            return False
+            print(f"Error adding {len(video_ids)} songs to playlist {playlist_id}: {e}")
+            return None
+
+    def _generate_sapisid_hash(self) -> str:
+        """Build the SAPISIDHASH Authorization header for write requests"""
+        timestamp = str(int(time.time()))
+        digest = hashlib.sha1(f"{timestamp} {self.sapisid} https://music.youtube.com".encode('utf-8')).hexdigest()
+        return f"SAPISIDHASH {timestamp}_{digest}"
 
     def get_auth_status(self) -> Dict:
         """Get authentication status"""
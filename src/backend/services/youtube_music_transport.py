@@ -0,0 +1,135 @@
+"""
+Pooled async HTTP/2 transport for ytmusicapi
+ytmusicapi is synchronous and sends every call through the requests session it is given.
+TransportSession is that session: a request made from a worker thread (searches run in
+threads via asyncio.to_thread) is handed to one httpx.AsyncClient on the app's event loop,
+so the searches in flight in this worker are multiplexed over a few pooled HTTP/2
+connections instead of each thread holding its own HTTP/1.1 connection. Calls made on the
+event loop thread itself, or before a loop is bound (command line tools), go through plain
+requests as before.
+"""
+
+import asyncio
+import json
+from typing import Dict, Optional
+
+import requests
+
+
+class AsyncYouTubeMusicTransport:
+    """One pooled httpx.AsyncClient per worker, shared by every YTMusic client it builds"""
+
+    def __init__(self, http2: bool = True, max_connections: int = 10, timeout: float = 30.0):
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Created and closed on the bound loop only
+        self.client = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Run requests on `loop` from now on (the app's loop, bound at startup)"""
+        self.loop = loop
+
+    def available(self) -> bool:
+        """True when the calling thread can hand a request to the bound loop and wait for it"""
+        if self.loop is None or self.loop.is_closed() or not self.loop.is_running():
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        # Waiting here would block the loop that has to run the request
+        return False
+
+    def _create_client(self):
+        """Create the pooled httpx client (imported lazily so /health does not load it)"""
+        import httpx
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401 - httpx needs it for HTTP/2
+            except ImportError:
+                print("⚠️ h2 not installed, YouTube Music transport falling back to HTTP/1.1")
+                http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+        )
+
+    async def request(self, method: str, url: str, **kwargs):
+        """Send a request over the pooled client"""
+        if self.client is None:
+            self.client = self._create_client()
+        return await self.client.request(method, url, **kwargs)
+
+    def send(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> "TransportResponse":
+        """Run a request on the bound loop from a worker thread and wait for its response"""
+        timeout = timeout or self.timeout
+        future = asyncio.run_coroutine_threadsafe(
+            self.request(method, url, timeout=timeout, **kwargs), self.loop
+        )
+        try:
+            return TransportResponse(future.result(timeout + 5))
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def aclose(self):
+        """Close pooled connections"""
+        client, self.client = self.client, None
+        if client is not None:
+            await client.aclose()
+
+
+class TransportResponse:
+    """The parts of a requests.Response that ytmusicapi reads, taken from an httpx response"""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.content = response.content
+        self.text = response.text
+        self.url = str(response.url)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class TransportSession(requests.Session):
+    """requests session for ytmusicapi that sends through the shared async transport"""
+
+    def __init__(self, transport: AsyncYouTubeMusicTransport):
+        super().__init__()
+        self.transport = transport
+
+    def request(self, method, url, params=None, data=None, headers=None, cookies=None, files=None,
+                auth=None, timeout=None, allow_redirects=True, proxies=None, hooks=None, stream=None,
+                verify=None, cert=None, json=None):
+        # Anything beyond plain JSON requests keeps requests' own handling
+        if proxies or files or auth or stream or cert or verify is False or not self.transport.available():
+            return super().request(
+                method, url, params=params, data=data, headers=headers, cookies=cookies, files=files,
+                auth=auth, timeout=timeout or self.transport.timeout, allow_redirects=allow_redirects,
+                proxies=proxies, hooks=hooks, stream=stream, verify=verify, cert=cert, json=json
+            )
+        body = {"json": json} if json is not None else {"content": data} if isinstance(data, (str, bytes)) else {"data": data}
+        return self.transport.send(
+            method, url, params=params, timeout=timeout, headers=cookie_headers(headers, cookies),
+            follow_redirects=allow_redirects, **body
+        )
+
+
+def cookie_headers(headers: Optional[Dict[str, str]], cookies: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Request headers with `cookies` folded in; like requests, an explicit Cookie header wins"""
+    headers = dict(headers or {})
+    if cookies and not any(name.lower() == "cookie" for name in headers):
+        headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    return headers
@@ -0,0 +1,20 @@
+"""
+Tests run from src/backend (python -m pytest tests); modules are imported the way the
+app imports them (services.*, utils.*, models.*)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.resp_server import RESPServer  # noqa: E402
+
+
+@pytest.fixture
+def resp_server():
+    """A local Redis-protocol stand-in on a free port"""
+    with RESPServer() as server:
+        yield server
@@ -0,0 +1,59 @@
+"""
+In-memory stand-ins for the YouTube Music client used by the engine tests
+"""
+
+from typing import Dict, List
+
+
+def edit_response(video_ids: List[str], rejected=()) -> Dict:
+    """add_playlist_items response as ytmusicapi 0.24.1 returns it
+
+    ytmusicapi replaces every playlistEditResults entry with its
+    playlistEditVideoAddedResultData value, which is None for videos that were not added.
+    """
+    return {
+        'status': 'STATUS_SUCCEEDED',
+        'playlistEditResults': [
+            None if video_id in rejected else {
+                'videoId': video_id,
+                'setVideoId': f'set-{video_id}',
+                'multiSelectData': {'multiSelectParams': '', 'multiSelectItem': ''}
+            }
+            for video_id in video_ids
+        ]
+    }
+
+
+class FakeYTMusic:
+    """Records playlist calls and answers them with real response shapes"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.created: List[str] = []
+        self.add_calls: List[List[str]] = []
+
+    def create_playlist(self, title, description="", privacy_status="PRIVATE"):
+        self.created.append(title)
+        return f"PL{len(self.created)}"
+
+    def add_playlist_items(self, playlist_id, video_ids, duplicates=False):
+        self.add_calls.append(list(video_ids))
+        return edit_response(video_ids, self.rejected)
+
+
+class FakeLibrary(FakeYTMusic):
+    """FakeYTMusic with searches and readable playlists, for sync tests"""
+
+    def __init__(self, rejected=(), playlists=None, get_error=None):
+        super().__init__(rejected)
+        self.playlists = playlists if playlists is not None else {}
+        self.get_error = get_error
+
+    def search(self, query, filter=None, limit=20):
+        return [{'videoId': f"vid-{query.split(' ')[0]}"}]
+
+    def get_playlist(self, playlist_id, limit=100):
+        if self.get_error is not None:
+            raise self.get_error
+        return {'tracks': [{'videoId': video_id, 'setVideoId': f'set-{video_id}'}
+                           for video_id in self.playlists.get(playlist_id, [])]}
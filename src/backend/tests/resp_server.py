@@ -0,0 +1,108 @@
+"""
+Local stand-in for a Redis-protocol server
+Speaks enough RESP (GET, SET with PX, DEL, AUTH, SELECT, PING) to exercise RedisBackend
+without a real server. Values live in one dict per logical database.
+"""
+
+import socketserver
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.db = 0
+        self.authenticated = self.server.password is None
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.wfile.write(self._execute(command))
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            raise ValueError(f"Unexpected request: {line!r}")
+        parts = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+    def _execute(self, parts) -> bytes:
+        name, args = parts[0].upper(), parts[1:]
+        self.server.commands.append(parts)
+        if name == b"AUTH":
+            if args[0].decode() != self.server.password:
+                return b"-WRONGPASS invalid password\r\n"
+            self.authenticated = True
+            return b"+OK\r\n"
+        if not self.authenticated:
+            return b"-NOAUTH Authentication required.\r\n"
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"SELECT":
+            self.db = int(args[0])
+            return b"+OK\r\n"
+
+        data = self.server.data(self.db)
+        with self.server.lock:
+            if name == b"GET":
+                value = self.server.live(data, args[0])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            if name == b"SET":
+                expires_at = None
+                if len(args) == 4 and args[2].upper() == b"PX":
+                    expires_at = time.time() + int(args[3]) / 1000
+                data[args[0]] = (args[1], expires_at)
+                return b"+OK\r\n"
+            if name == b"DEL":
+                removed = 0
+                for key in args:
+                    if self.server.live(data, key) is not None:
+                        del data[key]
+                        removed += 1
+                return b":%d\r\n" % removed
+        return b"-ERR unknown command '%s'\r\n" % name
+
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password: Optional[str] = None):
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+        self.password = password
+        self.databases: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+        self.commands = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def data(self, db: int) -> Dict:
+        return self.databases.setdefault(db, {})
+
+    @staticmethod
+    def live(data: Dict, key: bytes) -> Optional[bytes]:
+        entry = data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del data[key]
+            return None
+        return value
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from services.cache import Cache, RedisBackend, RedisProtocolError, create_backend
+from tests.resp_server import RESPServer
+
+
+def redis_cache(server, namespace="test", ttl=None, serializer="json") -> Cache:
+    return Cache(create_backend(f"redis://127.0.0.1:{server.port}/0"), namespace, ttl, serializer)
+
+
+def test_get_set_delete(resp_server):
+    backend = RedisBackend("127.0.0.1", resp_server.port)
+    assert backend.get_bytes("missing") is None
+    backend.set_bytes("key", b"value\r\nwith a line break")
+    assert backend.get_bytes("key") == b"value\r\nwith a line break"
+    backend.delete("key")
+    assert backend.get_bytes("key") is None
+
+
+def test_set_with_ttl_sends_px_and_expires(resp_server):
+    backend = RedisBackend("127.0.0.1", resp_server.port)
+    backend.set_bytes("key", b"value", ttl=0.05)
+    assert resp_server.commands[-1] == [b"SET", b"key", b"value", b"PX", b"50"]
+    assert backend.get_bytes("key") == b"value"
+    time.sleep(0.1)
+    assert backend.get_bytes("key") is None
+
+
+def test_selects_the_database_from_the_url(resp_server):
+    create_backend(f"redis://127.0.0.1:{resp_server.port}/3").set_bytes("key", b"value")
+    assert resp_server.live(resp_server.data(3), b"key") == b"value"
+    assert resp_server.live(resp_server.data(0), b"key") is None
+
+
+def test_authenticates_with_the_password():
+    with RESPServer(password="secret") as server:
+        assert RedisBackend("127.0.0.1", server.port, password="secret").get_bytes("key") is None
+        with pytest.raises(RedisProtocolError):
+            RedisBackend("127.0.0.1", server.port).get_bytes("key")
+
+
+def test_reconnects_after_the_server_drops_the_connection(resp_server):
+    backend = RedisBackend("127.0.0.1", resp_server.port)
+    backend.set_bytes("key", b"value")
+    backend.local.sock.close()
+    backend.local.sock = None
+    assert backend.get_bytes("key") == b"value"
+
+
+@pytest.mark.parametrize("serializer", ["json", "pickle"])
+def test_serializers_round_trip(resp_server, serializer):
+    cache = redis_cache(resp_server, serializer=serializer)
+    value = {"videoId": "abc", "results": [{"title": "Sönge", "duration": 215}], "hit": True}
+    cache.set("key", value)
+    assert cache.get("key") == value
+
+
+def test_pickle_keeps_python_types(resp_server):
+    cache = redis_cache(resp_server, serializer="pickle")
+    cache.set("key", ("a", frozenset({1})))
+    assert cache.get("key") == ("a", frozenset({1}))
+
+
+def test_keys_are_namespaced(resp_server):
+    redis_cache(resp_server, namespace="search").set("key", 1)
+    assert redis_cache(resp_server, namespace="match").get("key") is None
+    assert b"search:key" in resp_server.data(0)
+
+
+def test_unreadable_entries_are_misses(resp_server):
+    redis_cache(resp_server, serializer="pickle").set("key", {"a": 1})
+    assert redis_cache(resp_server, serializer="json").get("key", "default") == "default"
+
+
+def test_server_outage_is_a_miss():
+    with RESPServer() as server:
+        cache = redis_cache(server)
+    assert cache.get("key") is None
+    cache.set("key", 1)
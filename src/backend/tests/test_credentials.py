@@ -0,0 +1,47 @@
+import os
+import threading
+import time
+
+from services.credentials import CredentialCache
+
+
+def write(path, content, mtime_ns):
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_refresh_does_not_wait_for_a_load_in_flight(tmp_path):
+    path = tmp_path / "oauth.json"
+    write(path, '{"token": 1}', 1_000_000_000)
+    verifying, release = threading.Event(), threading.Event()
+
+    def validate(client):
+        verifying.set()
+        release.wait(5)
+
+    cache = CredentialCache(str(path), lambda content: content, validate=validate)
+    warmup = threading.Thread(target=cache.load)
+    warmup.start()
+    assert verifying.wait(5)
+
+    # Neither before the first load finishes nor while a reload is verifying does refresh wait
+    started = time.monotonic()
+    assert cache.refresh() is False
+    write(path, '{"token": 2}', 2_000_000_000)
+    cache.client = '{"token": 0}'
+    assert cache.refresh() is False
+    assert time.monotonic() - started < 0.5
+
+    release.set()
+    warmup.join()
+
+
+def test_refresh_reloads_a_changed_file(tmp_path):
+    path = tmp_path / "oauth.json"
+    write(path, '{"token": 1}', 1_000_000_000)
+    cache = CredentialCache(str(path), lambda content: content)
+    cache.load()
+
+    write(path, '{"token": 2}', 2_000_000_000)
+    assert cache.refresh() is True
+    assert cache.client == '{"token": 2}'
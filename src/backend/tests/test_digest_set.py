@@ -0,0 +1,24 @@
+import os
+
+from utils.digest_set import DigestSet
+
+
+def test_digest_set_answers_the_same_after_spilling():
+    seen = DigestSet(max_memory=10)
+    assert all(seen.add(f"key-{i}") for i in range(25))
+    assert seen.path is not None and not seen.digests
+
+    assert "key-3" in seen and "key-24" in seen
+    assert "key-25" not in seen
+    assert not seen.add("key-3")
+    assert len(seen) == 25
+
+    path = seen.path
+    seen.close()
+    assert not os.path.exists(path)
+
+
+def test_digest_set_stays_in_memory_below_the_limit():
+    seen = DigestSet(max_memory=10)
+    seen.update(["a", "b", "a"])
+    assert len(seen) == 2 and seen.db is None
@@ -0,0 +1,47 @@
+import pytest
+
+from services.fuzzy_index import FuzzyIndex
+from services.track_resolver import resolve_track_cached
+
+
+def index_of(*entries):
+    index = FuzzyIndex()
+    index.add_many((f"key-{i}", name, artist, f"vid-{i}") for i, (name, artist) in enumerate(entries))
+    return index
+
+
+@pytest.mark.parametrize("stored, wanted, artist", [
+    ("Another Brick in the Wall, Pt. 1", "Another Brick in the Wall, Pt. 2", "Pink Floyd"),
+    ("Nocturne Op. 9 No. 1", "Nocturne Op. 9 No. 2", "Frédéric Chopin"),
+    ("Love Me", "Love Me Do", "The Beatles"),
+    ("Interlude", "Interlude 2", "Some Artist"),
+])
+def test_different_songs_are_not_fuzzy_matches(stored, wanted, artist):
+    assert index_of((stored, artist)).lookup(wanted, artist) is None
+
+
+@pytest.mark.parametrize("stored, wanted", [
+    ("Don't Stop Me Now", "Dont Stop Me Now"),
+    ("Bohemian Rhapsody", "Bohemian Rhapsdy"),
+])
+def test_spelling_variants_are_fuzzy_matches(stored, wanted):
+    hit = index_of((stored, "Queen")).lookup(wanted, "Queen")
+    assert hit is not None and hit[0] == "vid-0"
+
+
+class RecordingStore:
+    def __init__(self):
+        self.saved = []
+
+    def get(self, key):
+        return None
+
+    def save(self, key, name, artist, video_id):
+        self.saved.append((key, video_id))
+
+
+def test_fuzzy_hits_are_not_saved_as_exact_matches():
+    store = RecordingStore()
+    index = index_of(("Don't Stop Me Now", "Queen"))
+    assert resolve_track_cached(None, store, "Dont Stop Me Now", "Queen", fuzzy_index=index) == "vid-0"
+    assert store.saved == []
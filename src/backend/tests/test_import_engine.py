@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+from services.import_engine import BulkPlaylistSink, BulkProgress, ImportEngine, JSONSink, list_source
+from tests.fakes import FakeYTMusic
+
+
+def run_engine(ytmusic, tracks, **options):
+    sink = JSONSink()
+    engine = ImportEngine(
+        ytmusic, "Test", list_source(tracks), sink,
+        resolver=lambda track: f"vid-{track['name']}",
+        search_delay=0, **options
+    )
+    return engine, asyncio.run(engine.run())
+
+
+def test_engine_counts_confirmed_adds_and_batches_after_the_first():
+    ytmusic = FakeYTMusic()
+    tracks = [{'name': f'Song {i}', 'artist': 'Artist'} for i in range(7)]
+    engine, summary = run_engine(ytmusic, tracks, add_batch_size=3)
+
+    assert summary['stats'] == {'total': 7, 'successful': 7, 'failed': 0, 'skipped': 0}
+    # Only the first batch goes out early; the rest are sent add_batch_size at a time
+    assert [len(call) for call in ytmusic.add_calls] == [1, 3, 3]
+
+
+def test_engine_reports_videos_the_server_did_not_add():
+    ytmusic = FakeYTMusic(rejected={'vid-Song 1'})
+    tracks = [{'name': f'Song {i}', 'artist': 'Artist'} for i in range(3)]
+    engine, summary = run_engine(ytmusic, tracks, add_batch_size=3)
+
+    assert summary['stats']['successful'] == 2
+    assert summary['stats']['failed'] == 1
+
+
+def test_empty_source_creates_no_playlist():
+    ytmusic = FakeYTMusic()
+    engine, summary = run_engine(ytmusic, [])
+
+    assert summary is None
+    assert engine.sink.error_message == 'No tracks provided for import'
+    assert ytmusic.created == []
+
+
+def test_source_failing_before_any_add_creates_no_playlist():
+    async def failing_source():
+        yield [{'name': 'Song', 'artist': 'Artist'}], 2
+        raise ValueError("Line 2: invalid JSON")
+
+    ytmusic = FakeYTMusic()
+    sink = JSONSink()
+    engine = ImportEngine(ytmusic, "Test", failing_source(), sink,
+                          resolver=lambda track: f"vid-{track['name']}", search_delay=0)
+
+    assert asyncio.run(engine.run()) is None
+    assert "Line 2" in sink.error_message
+    assert ytmusic.created == []
+
+
+def test_import_with_nothing_found_still_creates_its_playlist():
+    ytmusic = FakeYTMusic()
+    sink = JSONSink()
+    engine = ImportEngine(ytmusic, "Test", list_source([{'name': 'Song', 'artist': 'Artist'}]), sink,
+                          resolver=lambda track: None, search_delay=0)
+
+    summary = asyncio.run(engine.run())
+    assert summary['stats']['failed'] == 1
+    assert ytmusic.created == ["Test"]
+    assert ytmusic.add_calls == []
+
+
+def test_engine_drops_duplicates_after_spilling_seen_tracks():
+    ytmusic = FakeYTMusic()
+    tracks = [{'name': f'Song {i % 30}', 'artist': 'Artist'} for i in range(60)]
+    engine, summary = run_engine(ytmusic, tracks, add_batch_size=50, dedup_memory=10)
+
+    assert summary['stats'] == {'total': 60, 'successful': 30, 'failed': 0, 'skipped': 30}
+    assert sum(len(call) for call in ytmusic.add_calls) == 30
+
+
+def test_engine_counts_only_the_most_recent_albums():
+    tracks = [{'name': f'Song {i}', 'artist': 'Artist', 'album': f'Album {i % 5}'} for i in range(20)]
+    engine, _ = run_engine(FakeYTMusic(), tracks, album_groups=3)
+
+    assert len(engine.album_counts) == 3
+
+
+def test_duplicate_videos_do_not_shift_later_track_positions():
+    ytmusic = FakeYTMusic()
+    tracks = [{'name': f'Song {i}', 'artist': 'Artist'} for i in range(300)]
+    positions = []
+
+    def resolver(track):
+        positions.append(track['index'])
+        # Two different tracks resolve to the same video early in the import
+        return "vid-shared" if track['name'] in ('Song 1', 'Song 2') else f"vid-{track['name']}"
+
+    engine = ImportEngine(ytmusic, "Test", list_source(tracks), JSONSink(), resolver=resolver,
+                          search_delay=0, queue_size=5, add_batch_size=10)
+    summary = asyncio.run(engine.run())
+
+    assert sorted(positions) == list(range(300))
+    assert summary['stats'] == {'total': 300, 'successful': 299, 'failed': 0, 'skipped': 1}
+    assert sum(len(call) for call in ytmusic.add_calls) == 299
+
+
+def test_bulk_progress_runs_once_over_the_batch_distinct_total():
+    searched = []
+
+    def resolver(track):
+        searched.append(track['name'])
+        return f"vid-{track['name']}"
+
+    first = [{'name': f'Song {i}', 'artist': 'Artist'} for i in range(4)]
+    second = [{'name': f'Song {i}', 'artist': 'Artist'} for i in range(2, 6)]
+    batch = BulkProgress(6, resolver, progress_interval=0, progress_step=0, track_batch_size=50)
+
+    async def main():
+        queue = asyncio.Queue()
+        for spotify_id, tracks in (("a", first), ("b", second)):
+            engine = ImportEngine(FakeYTMusic(), spotify_id, list_source(tracks),
+                                  BulkPlaylistSink(queue, spotify_id, batch),
+                                  resolver=batch.resolve, search_delay=0)
+            await engine.run()
+        frames = []
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        return frames
+
+    events = [json.loads(frame[len(b"data: "):]) for frame in asyncio.run(main())]
+    progress = [event for event in events if event['type'] == 'progress']
+
+    # Shared songs are searched once, and progress never restarts for the second playlist
+    assert sorted(searched) == [f'Song {i}' for i in range(6)]
+    assert all(event['total'] == 6 for event in progress)
+    assert [event['current'] for event in progress] == sorted(event['current'] for event in progress)
+    assert progress[-1]['current'] == 6
+    assert [event['type'] for event in events if event['type'].startswith('playlist_')] == \
+        ['playlist_start', 'playlist_complete', 'playlist_start', 'playlist_complete']
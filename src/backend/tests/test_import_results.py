@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from models.models import ImportResultStore
+from services.import_engine import ImportEngine, JSONSink, list_source
+from services.import_results import ResultLog
+from tests.fakes import FakeYTMusic
+
+
+def run_import(tmp_path, ytmusic, tracks, batch_size=2):
+    store = ImportResultStore(f"sqlite:///{tmp_path / 'results.db'}")
+    engine = ImportEngine(
+        ytmusic, "Test", list_source(tracks), JSONSink(),
+        resolver=lambda track: None if track['name'] == 'Missing' else f"vid-{track['name']}",
+        search_delay=0, add_batch_size=3,
+        results=ResultLog(store, "job-1", batch_size=batch_size)
+    )
+    return store, asyncio.run(engine.run())
+
+
+def test_added_tracks_are_not_paged_as_failed(tmp_path):
+    tracks = [{'name': name, 'artist': 'Artist'} for name in ('A', 'B', 'Missing', 'C', 'D')]
+    store, summary = run_import(tmp_path, FakeYTMusic(), tracks)
+
+    assert summary['stats']['successful'] == 4
+    total, failed = store.page("job-1", failed_only=True)
+    assert total == 1
+    assert [(result['name'], result['status']) for result in failed] == [('Missing', 'not_found')]
+
+    total, results = store.page("job-1")
+    assert total == 5
+    assert [result['status'] for result in results] == ['found', 'found', 'not_found', 'found', 'found']
+
+
+def test_videos_rejected_by_youtube_music_are_paged_as_add_failed(tmp_path):
+    tracks = [{'name': name, 'artist': 'Artist'} for name in ('A', 'B', 'C')]
+    store, summary = run_import(tmp_path, FakeYTMusic(rejected={'vid-B'}), tracks)
+
+    assert summary['stats'] == {'total': 3, 'successful': 2, 'failed': 1, 'skipped': 0}
+    total, failed = store.page("job-1", failed_only=True)
+    assert total == 1
+    assert failed[0]['name'] == 'B'
+    assert failed[0]['status'] == 'add_failed'
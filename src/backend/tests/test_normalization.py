@@ -0,0 +1,39 @@
+import pytest
+
+from services.track_resolver import search_queries
+from utils.normalization import clean_title, normalized_key, primary_artist
+
+
+@pytest.mark.parametrize("artist", ["AC/DC", "Earth, Wind & Fire", "Tyler, The Creator", "Simon & Garfunkel"])
+def test_primary_artist_keeps_names_containing_separators(artist):
+    assert primary_artist(artist) == artist
+
+
+def test_first_search_query_keeps_the_full_artist():
+    assert search_queries("Thunderstruck", "AC/DC")[0] == "Thunderstruck AC/DC"
+
+
+@pytest.mark.parametrize("title, cleaned", [
+    ("Here Comes the Sun - Remastered 2009", "Here Comes the Sun"),
+    ("Paint It Black (Mono)", "Paint It Black"),
+    ("Wouldn't It Be Nice - Stereo Mix", "Wouldn't It Be Nice"),
+    ("Sunflower (feat. Swae Lee)", "Sunflower"),
+    ("Old Town Road ft. Billy Ray Cyrus", "Old Town Road"),
+])
+def test_clean_title_strips_reissue_and_featuring_tags(title, cleaned):
+    assert clean_title(title) == cleaned
+
+
+@pytest.mark.parametrize("version, original", [
+    ("Hurt - Live", "Hurt"),
+    ("Layla (Acoustic)", "Layla"),
+    ("Everlong - Acoustic Version", "Everlong"),
+    ("Yellow - Demo", "Yellow"),
+    ("Blinding Lights - Radio Edit", "Blinding Lights"),
+])
+def test_different_recordings_keep_distinct_keys(version, original):
+    assert normalized_key(version, "Artist") != normalized_key(original, "Artist")
+
+
+def test_remasters_share_the_original_key():
+    assert normalized_key("Let It Be - Remastered 2009", "The Beatles") == normalized_key("Let It Be", "The Beatles")
@@ -0,0 +1,70 @@
+import pytest
+
+from services import playlist_sync
+from services.playlist_sync import sync_playlist
+from services.track_resolver import track_key
+from tests.fakes import FakeLibrary
+
+SPOTIFY_TRACKS = [{'name': 'One', 'artist': 'Artist'}, {'name': 'Two', 'artist': 'Artist'}]
+
+
+class DictStore:
+    def __init__(self, state=None):
+        self.state = state
+
+    def get(self, spotify_playlist_id):
+        return self.state
+
+    def save(self, spotify_playlist_id, youtube_playlist_id, snapshot_id, tracks):
+        self.state = {'youtube_playlist_id': youtube_playlist_id, 'snapshot_id': snapshot_id, 'tracks': tracks}
+
+
+@pytest.fixture(autouse=True)
+def spotify(monkeypatch):
+    monkeypatch.setattr(playlist_sync, "fetch_playlist_details", lambda token, playlist_id: {'snapshot_id': 'new', 'name': 'Mix'})
+    monkeypatch.setattr(playlist_sync, "fetch_snapshot_tracks", lambda *args: SPOTIFY_TRACKS)
+
+
+def synced_store():
+    """State of an earlier sync that imported only the first track"""
+    key = track_key('One', 'Artist')
+    return DictStore({
+        'youtube_playlist_id': 'PLold',
+        'snapshot_id': 'old',
+        'tracks': {key: {'name': 'One', 'artist': 'Artist', 'videoId': 'vid-One'}}
+    })
+
+
+def test_transient_read_error_does_not_create_a_duplicate_playlist():
+    ytmusic = FakeLibrary(get_error=Exception("Server returned HTTP 503: Service Unavailable."))
+    with pytest.raises(Exception):
+        sync_playlist(ytmusic, synced_store(), "token", "sp1")
+    assert ytmusic.created == []
+
+
+def test_deleted_playlist_is_recreated():
+    ytmusic = FakeLibrary(get_error=Exception("Server returned HTTP 404: Not Found.\nRequested entity was not found."))
+    result = sync_playlist(ytmusic, synced_store(), "token", "sp1")
+    assert result['status'] == "created"
+    assert ytmusic.created == ["Mix"]
+
+
+def test_only_confirmed_adds_are_reported_as_added():
+    ytmusic = FakeLibrary(rejected={'vid-Two'}, playlists={'PLold': ['vid-One']})
+    result = sync_playlist(ytmusic, synced_store(), "token", "sp1")
+
+    assert ytmusic.add_calls == [['vid-Two']]
+    assert result['added'] == []
+    assert result['failed'] == [{'name': 'Two', 'artist': 'Artist', 'reason': 'Not added by YouTube Music'}]
+
+
+def test_new_tracks_are_added_in_batches_and_rejections_collected(monkeypatch):
+    ytmusic = FakeLibrary(rejected={'vid-Song3', 'vid-Song7'})
+    tracks = [{'name': f'Song{i}', 'artist': 'Artist'} for i in range(8)]
+    monkeypatch.setattr(playlist_sync, "fetch_snapshot_tracks", lambda *args: tracks)
+
+    result = sync_playlist(ytmusic, DictStore(), "token", "sp1", add_batch_size=3)
+
+    assert [len(call) for call in ytmusic.add_calls] == [3, 3, 2]
+    assert len(result['added']) == 6
+    assert [track['name'] for track in result['failed']] == ['Song3', 'Song7']
@@ -0,0 +1,28 @@
+import preresolve
+
+
+class FlakySearch:
+    def __init__(self, error=None, results=()):
+        self.error = error
+        self.results = list(results)
+
+    def search(self, query, filter=None, limit=20):
+        if self.error is not None:
+            raise self.error
+        return self.results
+
+
+def test_search_errors_are_not_reported_as_misses(monkeypatch):
+    monkeypatch.setattr(preresolve, "_worker_ytmusic", FlakySearch(error=Exception("HTTP 401: Unauthorized")))
+    key, name, artist, video_id, error = preresolve.resolve_worker(("key", "Song", "Artist"))
+
+    assert video_id is None
+    assert "401" in error
+
+
+def test_genuine_misses_are_stored_as_not_found(monkeypatch):
+    monkeypatch.setattr(preresolve, "_worker_ytmusic", FlakySearch())
+    assert preresolve.resolve_worker(("key", "Song", "Artist")) == ("key", "Song", "Artist", None, None)
+
+    monkeypatch.setattr(preresolve, "_worker_ytmusic", FlakySearch(results=[{'videoId': 'vid'}]))
+    assert preresolve.resolve_worker(("key", "Song", "Artist"))[3:] == ('vid', None)
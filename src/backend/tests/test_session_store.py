@@ -0,0 +1,54 @@
+"""
+Two worker processes sharing a SQLite-backed SessionStore, as main.py --workers N runs them
+"""
+
+import multiprocessing
+
+from services.cache import Cache, create_backend
+from services.session_store import SessionStore
+
+
+def open_store(path: str) -> SessionStore:
+    backend = create_backend(f"sqlite:///{path}")
+    return SessionStore(Cache(backend, "session"), Cache(backend, "jobs", 3600))
+
+
+def other_worker(path: str, job_id: str) -> dict:
+    """Runs in a second process: read what the first worker published and answer back"""
+    store = open_store(path)
+    seen = {"auth": store.current_auth(), "job": store.get_job(job_id)}
+    store.update_job(job_id, cancelRequested=True)
+    seen["republished"] = store.publish_auth("browser", '{"cookie": "second"}')
+    return seen
+
+
+def run_in_other_process(*args) -> dict:
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(other_worker, args)
+
+
+def test_state_published_by_one_worker_is_seen_by_another(tmp_path):
+    path = str(tmp_path / "cache.db")
+    store = open_store(path)
+    version = store.publish_auth("headers", '{"cookie": "first"}')
+    job_id = store.create_job("stream", playlistName="Road Trip")
+
+    seen = run_in_other_process(path, job_id)
+
+    assert seen["auth"]["version"] == version
+    assert seen["auth"]["headers"] == '{"cookie": "first"}'
+    assert seen["job"]["playlistName"] == "Road Trip"
+    assert seen["job"]["status"] == "running"
+
+    # Changes made by the other worker are visible here, and its newer credentials win
+    assert store.get_job(job_id)["cancelRequested"] is True
+    assert store.current_auth()["version"] == seen["republished"] > version
+    assert store.current_auth()["headers"] == '{"cookie": "second"}'
+
+
+def test_memory_backend_is_not_shared_between_instances():
+    first = SessionStore(Cache(create_backend("memory://"), "session"), Cache(create_backend("memory://"), "jobs"))
+    second = SessionStore(Cache(create_backend("memory://"), "session"), Cache(create_backend("memory://"), "jobs"))
+    first.publish_auth("headers", "{}")
+    # Why main.py switches to SQLite when more than one worker is requested
+    assert second.current_auth() is None
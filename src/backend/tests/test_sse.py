@@ -0,0 +1,25 @@
+import json
+
+from utils.sse import ProgressCoalescer
+
+
+def events(frames):
+    return [json.loads(frame[len(b"data: "):]) for frame in frames]
+
+
+def test_unknown_total_is_throttled_and_not_reported_as_done():
+    coalescer = ProgressCoalescer(0, min_interval=60, min_step=1)
+
+    sent = [event for current in range(1, 11) for event in events(coalescer.progress(current, f"Song {current}"))]
+
+    # Only the first event gets through the interval, and it does not claim 100%
+    assert len(sent) == 1
+    assert sent[0]['progress'] == 0 and sent[0]['current'] == 1 and sent[0]['total'] == 0
+
+
+def test_known_total_always_sends_the_last_event():
+    coalescer = ProgressCoalescer(10, min_interval=60, min_step=50)
+
+    sent = [event for current in range(1, 11) for event in events(coalescer.progress(current, f"Song {current}"))]
+
+    assert [event['current'] for event in sent] == [1, 6, 10]
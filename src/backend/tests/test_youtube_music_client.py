@@ -0,0 +1,31 @@
+import pytest
+
+from services.youtube_music_client import add_playlist_items_checked, map_edit_results
+from tests.fakes import FakeYTMusic, edit_response
+
+
+def test_map_edit_results_reads_unwrapped_entries():
+    assert map_edit_results(edit_response(['a', 'b']), ['a', 'b']) == (['a', 'b'], [])
+
+
+def test_map_edit_results_skips_entries_that_were_not_added():
+    assert map_edit_results(edit_response(['a', 'b', 'c'], rejected={'b'}), ['a', 'b', 'c']) == (['a', 'c'], ['b'])
+
+
+def test_map_edit_results_accepts_raw_edit_playlist_entries():
+    raw = {'playlistEditResults': [{'playlistEditVideoAddedResultData': {'videoId': 'a'}}]}
+    assert map_edit_results(raw, ['a', 'b']) == (['a'], ['b'])
+
+
+def test_add_playlist_items_checked_maps_each_video():
+    ytmusic = FakeYTMusic(rejected={'b'})
+    assert add_playlist_items_checked(ytmusic, 'PL1', ['a', 'b']) == (['a'], ['b'])
+
+
+def test_add_playlist_items_checked_raises_when_the_request_fails():
+    class Failing(FakeYTMusic):
+        def add_playlist_items(self, playlist_id, video_ids, duplicates=False):
+            return {'status': 'STATUS_FAILED', 'actions': []}
+
+    with pytest.raises(Exception):
+        add_playlist_items_checked(Failing(), 'PL1', ['a'])
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+
+from services.youtube_music_transport import AsyncYouTubeMusicTransport, TransportSession  # noqa: E402
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Answers every POST with the request's body and Cookie header"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        data = json.dumps({'body': body, 'cookie': self.headers.get('Cookie')}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/youtubei/v1/search"
+    server.shutdown()
+    server.server_close()
+
+
+def test_worker_thread_requests_run_on_the_bound_loop(echo_url):
+    transport = AsyncYouTubeMusicTransport(http2=False, max_connections=2)
+    session = TransportSession(transport)
+
+    async def main():
+        transport.bind(asyncio.get_running_loop())
+        # The way ytmusicapi's _send_request calls its session, from resolver threads
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(session.post, echo_url, json={'query': f'song {i}'},
+                              headers={'x-origin': 'https://music.youtube.com'},
+                              proxies=None, cookies={'CONSENT': 'YES+1'})
+            for i in range(8)
+        ))
+        client = transport.client
+        await transport.aclose()
+        return responses, client
+
+    responses, client = asyncio.run(main())
+
+    # Every request went through the shared pooled client
+    assert client is not None
+    assert [response.json()['body']['query'] for response in responses] == [f'song {i}' for i in range(8)]
+    assert all(response.status_code == 200 and response.reason == 'OK' for response in responses)
+    assert responses[0].json()['cookie'] == 'CONSENT=YES+1'
+
+
+def test_explicit_cookie_header_wins_and_loop_thread_falls_back(echo_url):
+    transport = AsyncYouTubeMusicTransport(http2=False)
+    session = TransportSession(transport)
+    assert not transport.available()
+
+    async def main():
+        transport.bind(asyncio.get_running_loop())
+        # Called on the loop thread itself: sent with requests instead of waiting on the loop
+        on_loop = session.post(echo_url, json={'query': 'x'}, headers={'Cookie': 'SAPISID=abc'},
+                               cookies={'CONSENT': 'YES+1'})
+        threaded = await asyncio.to_thread(session.post, echo_url, json={'query': 'y'},
+                                           headers={'Cookie': 'SAPISID=abc'}, cookies={'CONSENT': 'YES+1'})
+        await transport.aclose()
+        return on_loop, threaded
+
+    on_loop, threaded = asyncio.run(main())
+    assert on_loop.json()['cookie'] == 'SAPISID=abc'
+    assert threaded.json()['cookie'] == 'SAPISID=abc'
@@ -0,0 +1,29 @@
+"""
+Cooperative cancellation for blocking work run in threads
+asyncio can cancel a task but not a thread already inside asyncio.to_thread, so an
+import binds a threading.Event to its context; asyncio.to_thread copies the context into
+the worker thread, and blocking helpers call raise_if_cancelled() between upstream calls.
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """The import this work belongs to was cancelled"""
+
+
+_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar("cancel_event", default=None)
+
+
+def bind_cancellation(event: threading.Event):
+    """Make `event` the cancellation flag for work started from the current context"""
+    _cancel_event.set(event)
+
+
+def raise_if_cancelled():
+    """Stop before the next upstream call if the surrounding import was cancelled"""
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise OperationCancelled()
@@ -0,0 +1,80 @@
+"""
+Membership sets that stay small for very large imports
+The import engine remembers every track key and videoId it has seen so duplicates are
+dropped. Holding the strings costs a few hundred bytes per track; DigestSet keeps a 64-bit
+blake2b digest of each value instead, and once more than `max_memory` digests are held it
+moves them to a temporary SQLite file, so memory stops growing however large the import is.
+Two different values share a digest with odds of about 1 in 30 million at a million tracks; the
+cost of that is one song treated as a duplicate.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from typing import Iterable
+
+
+def digest(value: str) -> int:
+    """Signed 64-bit digest of a string (fits a SQLite INTEGER)"""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+class DigestSet:
+    """Set of strings stored as digests, spilled to a temporary SQLite file past `max_memory` entries"""
+
+    def __init__(self, max_memory: int = 50000):
+        self.max_memory = max_memory
+        self.digests = set()
+        self.count = 0
+        self.db = None
+        self.path = None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value: str) -> bool:
+        key = digest(value)
+        if self.db is None:
+            return key in self.digests
+        return self.db.execute("SELECT 1 FROM digests WHERE digest = ?", (key,)).fetchone() is not None
+
+    def add(self, value: str) -> bool:
+        """Add a value; returns False if it was already present"""
+        key = digest(value)
+        if self.db is None:
+            if key in self.digests:
+                return False
+            self.digests.add(key)
+            self.count += 1
+            if len(self.digests) > self.max_memory:
+                self._spill()
+            return True
+        added = self.db.execute("INSERT OR IGNORE INTO digests VALUES (?)", (key,)).rowcount == 1
+        self.count += added
+        return added
+
+    def update(self, values: Iterable[str]):
+        for value in values:
+            self.add(value)
+
+    def _spill(self):
+        fd, self.path = tempfile.mkstemp(prefix="import-digests-", suffix=".db")
+        os.close(fd)
+        # A scratch file: nothing needs to survive a crash, so skip the journal and fsyncs
+        self.db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=OFF")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE digests (digest INTEGER PRIMARY KEY)")
+        self.db.executemany("INSERT INTO digests VALUES (?)", ((key,) for key in self.digests))
+        self.digests = set()
+
+    def close(self):
+        """Drop the spill file, if any"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,93 @@
+"""
+Incremental NDJSON track uploads
+Parses a request body of one JSON track per line as it arrives, validating each line into
+a compact slotted record and handing pages straight to the import engine.
+"""
+
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _DECODE_ERRORS = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    _loads = json.loads
+    _DECODE_ERRORS = (ValueError,)
+
+# Longest accepted line; a track is a few hundred bytes, so anything larger is malformed
+MAX_LINE_BYTES = 64 * 1024
+
+
+class TrackRecord:
+    """Uploaded track; slotted so 20k of them cost a fraction of dicts or pydantic models"""
+
+    __slots__ = ("name", "artist", "album")
+
+    def __init__(self, name: str, artist: str, album: Optional[str] = None):
+        self.name = name
+        self.artist = artist
+        self.album = album
+
+
+def parse_track_line(line: bytes, line_number: int) -> TrackRecord:
+    """Validate one NDJSON line with the same rules as the `Track` request model"""
+    try:
+        data = _loads(line)
+    except _DECODE_ERRORS as e:
+        raise ValueError(f"Line {line_number}: invalid JSON ({e})")
+    if not isinstance(data, dict):
+        raise ValueError(f"Line {line_number}: expected a JSON object")
+
+    name, artist, album = data.get("name"), data.get("artist"), data.get("album")
+    if not isinstance(name, str):
+        raise ValueError(f"Line {line_number}: 'name' must be a string")
+    if not isinstance(artist, str):
+        raise ValueError(f"Line {line_number}: 'artist' must be a string")
+    if album is not None and not isinstance(album, str):
+        raise ValueError(f"Line {line_number}: 'album' must be a string")
+    return TrackRecord(name, artist, album)
+
+
+async def ndjson_track_pages(chunks: AsyncIterator[bytes], total: int = 0,
+                             page_size: int = 100) -> AsyncIterator[Tuple[List[TrackRecord], int]]:
+    """Import engine source reading tracks from a streamed NDJSON body
+
+    Pages are yielded whenever they fill up or a chunk has been consumed, so resolution starts
+    with the first chunk. The engine's bounded queues stop this generator from reading further
+    while resolution is behind, which in turn stops the server reading the request body.
+    `total` is the client's announced track count, used only for progress reporting.
+    """
+    buffer = bytearray()
+    page: List[TrackRecord] = []
+    line_number = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            line_number += 1
+            if line:
+                page.append(parse_track_line(line, line_number))
+                if len(page) >= page_size:
+                    yield page, total
+                    page = []
+        del buffer[:start]
+
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line {line_number + 1}: longer than {MAX_LINE_BYTES} bytes")
+        if page:
+            yield page, total
+            page = []
+
+    # Last line without a trailing newline
+    line = bytes(buffer).strip()
+    if line:
+        page.append(parse_track_line(line, line_number + 1))
+    if page:
+        yield page, total
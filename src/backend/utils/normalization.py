@@ -0,0 +1,99 @@
+"""
+Track text normalization
+Cleans names like "Song (feat. X) - 2011 Remaster" for cache keys, de-duplication,
+match scoring and search queries. Results are memoized in bounded LRU tables.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# Memo table size per function; imports repeat the same artists and titles constantly
+CACHE_SIZE = 65536
+
+# Words that mark a reissue of the same recording. Live, acoustic, demo and edit versions
+# are different recordings and keep their tags.
+_VERSION_WORDS = r"(?:remaster(?:ed)?|reissue|mono|stereo)"
+
+_FEAT_BRACKETED = re.compile(r"\s*[\(\[]\s*(?:feat\.?|ft\.?|featuring|with)\s+[^\)\]]*[\)\]]", re.IGNORECASE)
+_FEAT_TRAILING = re.compile(r"\s+(?:feat\.?|ft\.?|featuring)\s+.*$", re.IGNORECASE)
+_VERSION_BRACKETED = re.compile(r"\s*[\(\[][^\)\]]*\b" + _VERSION_WORDS + r"\b[^\)\]]*[\)\]]", re.IGNORECASE)
+_VERSION_DASH = re.compile(r"\s+[-–—]\s+[^-–—]*\b" + _VERSION_WORDS + r"\b.*$", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^\w\s]")
+# Numbers that tell parts, movements and sequels apart ("Pt. 2", "No. 1", "Part II")
+_NUMBER_TOKEN = re.compile(r"^(?:\d+|ii|iii|iv|vi|vii|viii|ix|xi|xii)$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fold_text(text: str) -> str:
+    """Unicode-fold text: compatibility-decompose, drop accents, casefold, strip punctuation"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    folded = _NON_WORD.sub(" ", stripped.casefold())
+    return _WHITESPACE.sub(" ", folded).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title(title: str) -> str:
+    """Remove featured-artist and reissue tags, keeping the readable title"""
+    cleaned = _FEAT_BRACKETED.sub("", title or "")
+    cleaned = _VERSION_BRACKETED.sub("", cleaned)
+    cleaned = _VERSION_DASH.sub("", cleaned)
+    cleaned = _FEAT_TRAILING.sub("", cleaned)
+    cleaned = _WHITESPACE.sub(" ", cleaned).strip()
+    # Never clean a title down to nothing (e.g. a song actually called "Live")
+    return cleaned or (title or "").strip()
+
+
+def primary_artist(artist: str) -> str:
+    """The primary artist, as Spotify credits it
+
+    Spotify sends the primary artist as its own field, so it is used as-is: names such as
+    "AC/DC", "Earth, Wind & Fire" or "Tyler, The Creator" contain separators themselves.
+    """
+    return (artist or "").strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalized_key(name: str, artist: str) -> str:
+    """Key identifying the same song regardless of reissue tags, accents, case and featured artists"""
+    return f"{fold_text(clean_title(name))}\x1f{fold_text(primary_artist(artist))}"
+
+
+def tokens_agree(left: str, right: str, min_ratio: float = 0.75) -> bool:
+    """True when two folded strings differ only by spacing or typos inside words
+
+    Numbers must be identical and neither side may have words the other lacks, so
+    "Interlude 2" does not agree with "Interlude" nor "Love Me Do" with "Love Me".
+    """
+    if left.replace(" ", "") == right.replace(" ", ""):
+        return True
+    left_tokens, right_tokens = left.split(), right.split()
+    if len(left_tokens) != len(right_tokens):
+        return False
+    for left_token, right_token in zip(left_tokens, right_tokens):
+        if left_token == right_token:
+            continue
+        # Numbers and short words have no room for typos
+        if _NUMBER_TOKEN.match(left_token) or _NUMBER_TOKEN.match(right_token):
+            return False
+        if min(len(left_token), len(right_token)) < 4:
+            return False
+        if SequenceMatcher(None, left_token, right_token).ratio() < min_ratio:
+            return False
+    return True
+
+
+def search_query(name: str, artist: str) -> str:
+    """Clean search query: tag-free title plus the primary artist"""
+    return f"{clean_title(name)} {primary_artist(artist)}".strip()
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the memo tables"""
+    return {
+        func.__name__: func.cache_info()._asdict()
+        for func in (fold_text, clean_title, normalized_key)
+    }
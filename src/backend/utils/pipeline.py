@@ -0,0 +1,48 @@
+"""
+Async pipeline helpers
+Bridge blocking iterators (paged HTTP reads) into bounded async streams
+"""
+
+import asyncio
+from typing import AsyncIterator, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def iterate_in_thread(iterator: Iterator[T], prefetch: int = 2) -> AsyncIterator[T]:
+    """Pull items from a blocking iterator in a worker thread
+
+    At most `prefetch` items are buffered ahead of the consumer, so a slow consumer
+    applies backpressure to the producer instead of letting items pile up in memory.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+
+    def next_item():
+        try:
+            return next(iterator)
+        except StopIteration:
+            return _DONE
+
+    async def produce():
+        try:
+            while True:
+                item = await asyncio.to_thread(next_item)
+                await queue.put(item)
+                if item is _DONE:
+                    return
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
@@ -0,0 +1,91 @@
+"""
+Server-Sent Events helpers for the streaming import endpoints
+Encodes events with orjson when available and coalesces per-track chatter
+"""
+
+import json
+import time
+from typing import Dict, List
+
+try:
+    import orjson
+
+    def dumps(payload) -> bytes:
+        """Serialize a payload to compact JSON bytes"""
+        return orjson.dumps(payload)
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+    def dumps(payload) -> bytes:
+        """Serialize a payload to compact JSON bytes"""
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def sse_event(payload: Dict) -> bytes:
+    """Encode a single `data:` frame understood by the App.js reader loop"""
+    return b"data: " + dumps(payload) + b"\n\n"
+
+
+# Per-track event types and the batched event type each one is coalesced into
+BATCHED_EVENT_TYPES = {
+    "track_found": "tracks_found",
+    "track_not_found": "tracks_not_found",
+    "track_error": "track_errors",
+}
+
+
+class ProgressCoalescer:
+    """Throttles progress events and batches per-track events into arrays"""
+
+    def __init__(self, total: int, min_interval: float = 0.25, min_step: int = 1, batch_size: int = 50):
+        self.total = total
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self.batch_size = batch_size
+        self.last_progress = -1
+        self.last_emit = 0.0
+        self.pending: Dict[str, List[Dict]] = {}
+        self.pending_count = 0
+
+    def progress(self, current: int, track: str) -> List[bytes]:
+        """Record progress for the current track, returning any frames due to be sent"""
+        # A total of 0 means it is not known yet (e.g. an NDJSON upload still arriving)
+        progress = int(((current - 1) / self.total) * 100) if self.total else 0
+        now = time.monotonic()
+        is_last = self.total > 0 and current >= self.total
+
+        if not is_last and progress - self.last_progress < self.min_step and now - self.last_emit < self.min_interval:
+            return []
+
+        frames = self.flush()
+        frames.append(sse_event({
+            "type": "progress",
+            "progress": progress,
+            "current": current,
+            "total": self.total,
+            "track": track
+        }))
+        self.last_progress = progress
+        self.last_emit = now
+        return frames
+
+    def track_event(self, event_type: str, **fields) -> List[bytes]:
+        """Queue a per-track event, returning a batch frame once the batch is full"""
+        self.pending.setdefault(BATCHED_EVENT_TYPES[event_type], []).append(fields)
+        self.pending_count += 1
+
+        if self.pending_count >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> List[bytes]:
+        """Emit every queued per-track batch"""
+        frames = [
+            sse_event({"type": batch_type, "tracks": tracks})
+            for batch_type, tracks in self.pending.items()
+            if tracks
+        ]
+        self.pending = {}
+        self.pending_count = 0
+        return frames
+
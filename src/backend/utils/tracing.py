@@ -0,0 +1,152 @@
+"""
+Per-import span timelines
+An import binds a Trace to its context the same way it binds its cancellation flag
+(utils/cancellation.py); asyncio tasks and asyncio.to_thread copy the context, so Spotify
+page reads, search attempts, scheduler waits and playlist adds made on its behalf record
+spans without the trace being passed around. Spans are grouped into lanes (fetch,
+resolver-N, add) and export to the Chrome trace event format, which chrome://tracing and
+Perfetto open directly.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+class Trace:
+    """Bounded list of completed spans for one import"""
+
+    def __init__(self, job_id: str, max_spans: int = 50000):
+        self.job_id = job_id
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self.origin_ns = time.perf_counter_ns()
+        # (name, category, lane, start_us, duration_us, args)
+        self.spans: List[list] = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def now_us(self) -> int:
+        """Microseconds since the trace started"""
+        return (time.perf_counter_ns() - self.origin_ns) // 1000
+
+    def add(self, name: str, category: str, lane: str, start_us: int, duration_us: int, args: Optional[Dict] = None):
+        """Record a completed span; spans beyond max_spans are only counted"""
+        with self.lock:
+            if len(self.spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self.spans.append([name, category, lane, start_us, duration_us, args or None])
+
+    def to_dict(self) -> Dict:
+        """Compact form kept in the shared cache once the import has finished"""
+        with self.lock:
+            return {
+                "jobId": self.job_id,
+                "startedAt": self.started_at,
+                "dropped": self.dropped,
+                "spans": list(self.spans)
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Trace":
+        trace = cls(data["jobId"], max_spans=len(data["spans"]))
+        trace.started_at = data["startedAt"]
+        trace.dropped = data["dropped"]
+        trace.spans = data["spans"]
+        return trace
+
+    def timeline(self) -> Dict:
+        """Spans in start order, times in seconds from the start of the import"""
+        spans = sorted(self.to_dict()["spans"], key=lambda span: span[3])
+        return {
+            "jobId": self.job_id,
+            "startedAt": self.started_at,
+            "dropped": self.dropped,
+            "spans": [
+                {
+                    "name": name,
+                    "category": category,
+                    "lane": lane,
+                    "start": start_us / 1e6,
+                    "duration": duration_us / 1e6,
+                    "args": args or {}
+                }
+                for name, category, lane, start_us, duration_us, args in spans
+            ]
+        }
+
+    def chrome_trace(self) -> Dict:
+        """Chrome trace event JSON: one complete ("X") event per span, one thread per lane"""
+        data = self.to_dict()
+        lanes: Dict[str, int] = {}
+        events = []
+        for name, category, lane, start_us, duration_us, args in data["spans"]:
+            if lane not in lanes:
+                lanes[lane] = len(lanes) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lanes[lane], "args": {"name": lane}})
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start_us,
+                "dur": duration_us,
+                "pid": 1,
+                "tid": lanes[lane],
+                "args": args or {}
+            })
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"import {self.job_id}"}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"jobId": self.job_id, "startedAt": self.started_at, "droppedSpans": data["dropped"]}
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("import_trace", default=None)
+_lane: ContextVar[str] = ContextVar("trace_lane", default="main")
+
+
+def bind_trace(trace: Optional[Trace]):
+    """Make `trace` record spans for work started from the current context"""
+    _trace.set(trace)
+
+
+def set_lane(lane: str):
+    """Name the timeline row for spans recorded from the current task"""
+    _lane.set(lane)
+
+
+@contextmanager
+def span(name: str, category: str, /, **args) -> Iterator[Dict]:
+    """Time the enclosed block as a span of the bound trace (a no-op without one)
+
+    The yielded dict can be filled in with results, e.g. the number of search results.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield args
+        return
+    start = trace.now_us()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        trace.add(name, category, _lane.get(), start, trace.now_us() - start, args)
+
+
+def record_span(name: str, category: str, start_us: int, /, **args):
+    """Record a span that started at `start_us` (from trace_clock()) and ends now"""
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(name, category, _lane.get(), start_us, trace.now_us() - start_us, args)
+
+
+def trace_clock() -> Optional[int]:
+    """Current time on the bound trace's clock, or None when nothing is traced"""
+    trace = _trace.get()
+    return trace.now_us() if trace is not None else None
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import axios from 'axios';
 import { toast } from 'react-hot-toast';
@@ -19,6 +19,8 @@ import ProfessionalLoading from './components/ProfessionalLoading';
 import ProfessionalFooter from './components/ProfessionalFooter';
 
 const BACKEND_URL = 'http://127.0.0.1:8000';
+// Failed tracks shown after an import; the rest stay available from /jobs/{id}/results
+const FAILED_TRACKS_PAGE_SIZE = 200;
 
 function App() {
   // --- State ---
@@ -37,7 +39,60 @@ function App() {
   const [importProgress, setImportProgress] = useState(0);
   const [currentTrack, setCurrentTrack] = useState('');
 
+  // Latest progress event, applied at most once per animation frame
+  const pendingProgress = useRef(null);
+  const progressFrame = useRef(null);
+
   // --- All Hooks Must Be Called At The Top Level ---
+
+  // Progress events can arrive far faster than the screen refreshes; only the newest
+  // one per frame becomes React state (and a toast update)
+  const applyPendingProgress = useCallback(() => {
+    progressFrame.current = null;
+    const pending = pendingProgress.current;
+    if (!pending) return;
+    pendingProgress.current = null;
+    setImportProgress(pending.progress);
+    setCurrentTrack(pending.track);
+    toast.loading(`${pending.progress}% - Processing: ${pending.track}`, { id: 'import' });
+  }, []);
+
+  const scheduleProgress = useCallback((progress, track) => {
+    pendingProgress.current = { progress, track };
+    if (progressFrame.current === null) {
+      progressFrame.current = requestAnimationFrame(applyPendingProgress);
+    }
+  }, [applyPendingProgress]);
+
+  const cancelPendingProgress = useCallback(() => {
+    if (progressFrame.current !== null) {
+      cancelAnimationFrame(progressFrame.current);
+      progressFrame.current = null;
+    }
+    pendingProgress.current = null;
+  }, []);
+
+  useEffect(() => cancelPendingProgress, [cancelPendingProgress]);
+
+  // Failed tracks of a finished import, fetched from the paginated results endpoint
+  const loadFailedTracks = useCallback(async (jobId) => {
+    if (!jobId) return;
+    try {
+      const response = await fetch(`${BACKEND_URL}/jobs/${jobId}/results?status=failed&limit=${FAILED_TRACKS_PAGE_SIZE}`);
+      if (!response.ok) return;
+      const page = await response.json();
+      setImportResult(result => result && {
+        ...result,
+        failedTracks: page.results.map(track => ({
+          name: track.name,
+          artist: track.artist,
+          reason: track.reason || 'Not found on YouTube Music'
+        }))
+      });
+    } catch (error) {
+      console.error('Error loading failed tracks:', error);
+    }
+  }, []);
   
   // Handle Spotify OAuth callback
   useEffect(() => {
@@ -295,20 +350,17 @@ function App() {
 
       toast.loading('Starting import...', { id: 'import' });
 
-      // Use fetch with streaming for real-time progress updates
-      const response = await fetch(`${BACKEND_URL}/import-playlist-stream`, {
+      // Use fetch with streaming for real-time progress updates.
+      // Only the playlist ID is sent; the backend reads the tracks from Spotify itself.
+      const response = await fetch(`${BACKEND_URL}/import-spotify-playlist-stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
-          playlistName: selectedPlaylist.name,
-          playlistDescription: selectedPlaylist.description || '',
-          tracks: tracks.map(track => ({
-            name: track.name,
-            artist: track.artist,
-            album: track.album || ''
-          }))
+          access_token: spotifyToken,
+          playlistId: selectedPlaylist.id,
+          playlistName: selectedPlaylist.name
         })
       });
 
@@ -317,6 +369,9 @@ function App() {
       }
 
       const reader = response.body.getReader();
+      let jobId = null;
+      // One streaming decoder so multi-byte UTF-8 characters split across chunks decode correctly
+      const decoder = new TextDecoder();
       let buffer = '';
 
       while (true) {
@@ -324,7 +379,7 @@ function App() {
         
         if (done) break;
         
-        buffer += new TextDecoder().decode(value);
+        buffer += decoder.decode(value, { stream: true });
         const lines = buffer.split('\n\n');
         buffer = lines.pop() || ''; // Keep incomplete line in buffer
         
@@ -334,6 +389,11 @@ function App() {
               const data = JSON.parse(line.substring(6));
               
               switch (data.type) {
+                case 'job':
+                  // Import job id; its status is available from /jobs/{id} on any worker
+                  jobId = data.jobId;
+                  break;
+                  
                 case 'start':
                   toast.loading(`Starting import of ${data.total} tracks...`, { id: 'import' });
                   break;
@@ -342,10 +402,13 @@ function App() {
                   toast.loading(data.message, { id: 'import' });
                   break;
                   
+                case 'queue':
+                  // Other imports are using the shared YouTube Music capacity
+                  toast.loading(`Waiting for capacity: position ${data.position + 1}, about ${Math.ceil(data.expectedWait)}s`, { id: 'import' });
+                  break;
+                  
                 case 'progress':
-                  setImportProgress(data.progress);
-                  setCurrentTrack(data.track);
-                  toast.loading(`${data.progress}% - Processing: ${data.track}`, { id: 'import' });
+                  scheduleProgress(data.progress, data.track);
                   break;
                   
                 case 'track_found':
@@ -359,20 +422,44 @@ function App() {
                 case 'track_error':
                   console.log(`⚠️ ${data.track} → Error: ${data.error}`);
                   break;
+
+                // Batched per-track events (the backend coalesces these to keep the stream small)
+                case 'tracks_found':
+                  console.log(`✅ ${data.tracks.length} tracks found`);
+                  break;
+
+                case 'tracks_not_found':
+                  console.log(`❌ ${data.tracks.length} tracks not found:`, data.tracks.map(t => t.track));
+                  break;
+
+                case 'track_errors':
+                  console.log(`⚠️ ${data.tracks.length} tracks errored:`, data.tracks);
+                  break;
                   
                 case 'complete':
+                  cancelPendingProgress();
                   setImportProgress(100);
                   setImportResult({
                     status: 'success',
                     message: data.message,
                     youtubePlaylistUrl: data.playlistUrl,
                     stats: data.stats,
-                    failedTracks: data.failedTracks || []
+                    failedTracks: []
                   });
                   toast.success('🎉 Import completed successfully!', { id: 'import' });
+                  // The completion event only carries counts; failed tracks are paged separately
+                  if (data.stats?.failed > 0) {
+                    loadFailedTracks(data.jobId || jobId);
+                  }
+                  return;
+                  
+                case 'cancelled':
+                  cancelPendingProgress();
+                  toast.error('Import cancelled', { id: 'import' });
                   return;
                   
                 case 'error':
+                  cancelPendingProgress();
                   throw new Error(data.message);
                   
                 default:
@@ -1,6 +1,7 @@
 import React from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Music2, ChevronRight, Users, Calendar, TrendingUp, Eye, Lock, Shuffle } from 'lucide-react';
+import { useIncrementalCount } from './WindowedList';
 
 // Spotify Logo SVG Component
 const SpotifyLogo = ({ className }) => (
@@ -46,6 +47,9 @@ const itemVariants = {
 };
 
 const PlaylistList = ({ playlists, onSelectPlaylist, isLoading }) => {
+  // Cards are rendered a page at a time as the user scrolls towards the end of the grid
+  const [visibleCount, sentinelRef] = useIncrementalCount(playlists ? playlists.length : 0);
+
   const formatNumber = (num) => {
     if (num >= 1000000) return (num / 1000000).toFixed(1) + 'M';
     if (num >= 1000) return (num / 1000).toFixed(1) + 'K';
@@ -159,7 +163,7 @@ const PlaylistList = ({ playlists, onSelectPlaylist, isLoading }) => {
               initial="initial"
               animate="animate"
             >
-              {playlists.map((playlist, index) => (
+              {playlists.slice(0, visibleCount).map((playlist, index) => (
                 <motion.div
                   key={playlist.id}
                   variants={itemVariants}
@@ -269,6 +273,9 @@ const PlaylistList = ({ playlists, onSelectPlaylist, isLoading }) => {
                   </div>
                 </motion.div>
               ))}
+              {visibleCount < playlists.length && (
+                <div ref={sentinelRef} className="col-span-full h-px" />
+              )}
             </motion.div>
           )}
         </AnimatePresence>
@@ -1,6 +1,7 @@
 import React from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Music, Play, SkipForward, Volume2, Clock, Award, RefreshCw, Disc3 } from 'lucide-react';
+import WindowedList from './WindowedList';
 
 // Spotify Logo SVG Component
 const SpotifyLogo = ({ className }) => (
@@ -16,6 +17,10 @@ const YouTubeLogo = ({ className }) => (
   </svg>
 );
 
+// Fixed row geometry for windowed rendering (p-4 padding + 40px artwork + 1px border)
+const TRACK_ROW_HEIGHT = 73;
+const TRACK_LIST_HEIGHT = 384;
+
 // Animation variants
 const containerVariants = {
   initial: { opacity: 0 },
@@ -328,14 +333,19 @@ const TrackList = ({
             <div className="col-span-2">Duration</div>
           </div>
 
-          {/* Track Items */}
-          <div className="max-h-96 overflow-y-auto">
-            {tracks?.map((track, index) => (
+          {/* Track Items (windowed: only visible rows are rendered) */}
+          <WindowedList
+            items={tracks}
+            rowHeight={TRACK_ROW_HEIGHT}
+            maxHeight={TRACK_LIST_HEIGHT}
+            renderRow={(track, index) => (
               <motion.div
                 key={track.id || index}
                 variants={trackVariants}
+                initial={false}
                 whileHover="hover"
-                className="grid grid-cols-12 gap-4 p-4 border-b border-white/5 hover:bg-white/5 transition-colors group"
+                style={{ height: TRACK_ROW_HEIGHT }}
+                className="grid grid-cols-12 gap-4 p-4 border-b border-white/5 hover:bg-white/5 transition-colors group overflow-hidden"
               >
                 <div className="col-span-1 flex items-center">
                   <span className="text-gray-400 text-sm group-hover:hidden">
@@ -397,8 +407,8 @@ const TrackList = ({
                   </div>
                 </div>
               </motion.div>
-            ))}
-          </div>
+            )}
+          />
         </motion.div>
 
         {/* Empty State */}
@@ -0,0 +1,69 @@
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+
+// Renders only the rows inside the scroll viewport (plus a few above and below),
+// so lists with thousands of rows cost the same as a screenful
+const WindowedList = ({ items, rowHeight, maxHeight, overscan = 8, className = '', renderRow }) => {
+  const [scrollTop, setScrollTop] = useState(0);
+  const latestScrollTop = useRef(0);
+  const scrollFrame = useRef(null);
+
+  // Scroll events fire faster than frames; re-render once per animation frame
+  const handleScroll = useCallback((event) => {
+    latestScrollTop.current = event.currentTarget.scrollTop;
+    if (scrollFrame.current === null) {
+      scrollFrame.current = requestAnimationFrame(() => {
+        scrollFrame.current = null;
+        setScrollTop(latestScrollTop.current);
+      });
+    }
+  }, []);
+
+  useEffect(() => () => {
+    if (scrollFrame.current !== null) {
+      cancelAnimationFrame(scrollFrame.current);
+    }
+  }, []);
+
+  const count = items ? items.length : 0;
+  const viewportHeight = Math.min(count * rowHeight, maxHeight);
+  const first = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const last = Math.min(count, Math.ceil((scrollTop + viewportHeight) / rowHeight) + overscan);
+
+  return (
+    <div className={`overflow-y-auto ${className}`} style={{ height: viewportHeight }} onScroll={handleScroll}>
+      <div style={{ height: count * rowHeight, position: 'relative' }}>
+        <div style={{ transform: `translateY(${first * rowHeight}px)` }}>
+          {count > 0 && items.slice(first, last).map((item, offset) => renderRow(item, first + offset))}
+        </div>
+      </div>
+    </div>
+  );
+};
+
+// Number of items to render for a list that grows as the user scrolls towards its end;
+// attach the returned ref to a sentinel element placed after the rendered items
+export const useIncrementalCount = (total, pageSize = 24) => {
+  const [count, setCount] = useState(pageSize);
+  const sentinel = useRef(null);
+
+  useEffect(() => {
+    setCount(pageSize);
+  }, [total, pageSize]);
+
+  useEffect(() => {
+    const element = sentinel.current;
+    if (!element || count >= total) return undefined;
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some(entry => entry.isIntersecting)) {
+        setCount(current => Math.min(current + pageSize, total));
+      }
+    }, { rootMargin: '600px' });
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [count, total, pageSize]);
+
+  return [Math.min(count, total), sentinel];
+};
+
+export default WindowedList;